@@ -0,0 +1,85 @@
+"""Persistente, content-addressed cache voor AI extractie resultaten (sqlite).
+
+Zonder Streamlit afhankelijkheden, zodat de cache los te testen is; app.py maakt AI_CACHE aan met de
+waarden uit st.secrets.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from cache_db import connect_cache_db
+
+
+class AiResultCache:
+    """Persistente cache (sqlite) voor AI extractie, content-addressed: de sleutel is een hash van de
+    opgeschoonde tekst, het model en de prompt, niet van de URL. Dezelfde tekst via meerdere fallback
+    methoden of bij een nieuwe test kost zo maar één API call. Alleen geparste JSON resultaten worden
+    bewaard, met het tokenverbruik van de oorspronkelijke call; TTL en LRU-eviction zoals HttpCache.
+    prompt_version zit in de sleutel, zodat een gewijzigde prompt oude resultaten niet hergebruikt.
+    """
+
+    EVICT_EVERY = 20
+
+    def __init__(self, path, ttl=30 * 24 * 3600, max_bytes=50 * 1024 * 1024, prompt_version=1):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.prompt_version = prompt_version
+        self._lock = threading.Lock()
+        self._conn = None
+        self._stores = 0
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect_cache_db(self.path, """CREATE TABLE IF NOT EXISTS ai_cache (
+                cache_key TEXT PRIMARY KEY, model TEXT, result TEXT, prompt_tokens INTEGER,
+                completion_tokens INTEGER, created_at REAL, last_access REAL, size INTEGER)""")
+        return self._conn
+
+    def key(self, text, model, system_prompt):
+        cleaned = ' '.join(text.split())
+        payload = json.dumps([self.prompt_version, model, system_prompt, cleaned], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, cache_key):
+        """Geef {"result", "prompt_tokens", "completion_tokens"} of None (ook als de entry verlopen is)"""
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute("SELECT result, prompt_tokens, completion_tokens, created_at FROM ai_cache WHERE cache_key = ?",
+                                 (cache_key,)).fetchone()
+                if not row or time.time() - row[3] >= self.ttl:
+                    return None
+                db.execute("UPDATE ai_cache SET last_access = ? WHERE cache_key = ?", (time.time(), cache_key))
+                db.commit()
+        except sqlite3.Error:
+            return None
+        return {"result": json.loads(row[0]), "prompt_tokens": row[1], "completion_tokens": row[2]}
+
+    def store(self, cache_key, model, result, prompt_tokens, completion_tokens):
+        body = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO ai_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (cache_key, model, body, prompt_tokens, completion_tokens, now, now, len(body)))
+                db.commit()
+                self._stores += 1
+                if self._stores % self.EVICT_EVERY == 0:
+                    self._evict(db)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, db):
+        """Verlopen entries weg, daarna de minst recent gebruikte tot de cache onder de limiet zit"""
+        db.execute("DELETE FROM ai_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM ai_cache").fetchone()[0]
+        for cache_key, size in db.execute("SELECT cache_key, size FROM ai_cache ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM ai_cache WHERE cache_key = ?", (cache_key,))
+            total -= size
+        db.commit()
@@ -0,0 +1,160 @@
+"""Async client voor de chat completions API (OpenAI of compatibel).
+
+Rate limits komen uit de x-ratelimit-* headers van de responses, 429 en 5xx worden met backoff
+opnieuw geprobeerd en meerdere contents worden tegelijk geanalyseerd, identieke content één keer.
+Los van app.py zodat dit zonder Streamlit tegen een lokale testserver kan draaien.
+"""
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from domain_scheduler import DomainScheduler, parse_retry_after
+from run_stats import bump_run_stat
+
+RATE_LIMIT_RESET_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+RATE_LIMIT_RESET_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_rate_limit_reset(value):
+    """x-ratelimit-reset-* header ("20ms", "1s", "6m0s" of kale seconden) naar seconden"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = RATE_LIMIT_RESET_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * RATE_LIMIT_RESET_UNITS[unit] for amount, unit in parts)
+
+
+class AiRateLimiter:
+    """Begrenst gelijktijdige AI calls en houdt het requests- en tokenbudget per minuut bij.
+
+    Het budget komt uit de x-ratelimit-remaining-* en x-ratelimit-reset-* headers van de laatste
+    response. Elke call reserveert vooraf zijn geschatte tokens; is het budget op, dan wacht de
+    call tot de reset. De headers weten nog niets van calls die op dat moment onderweg zijn, dus
+    update() trekt die reserveringen van de remaining waarden af. Een 429 blokkeert alle calls tot
+    Retry-After (of de backoff) verstreken is.
+    """
+
+    def __init__(self, concurrency=4):
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.budgets = {'requests': None, 'tokens': None}  # {"remaining": n, "reset_at": monotonic}
+        self.in_flight = {'requests': 0, 'tokens': 0}
+        self.blocked_until = 0.0
+
+    @staticmethod
+    def estimate_tokens(text, max_tokens=1000):
+        """Ruwe schatting (~4 tekens per token); max_tokens telt bij OpenAI mee voor de TPM limiet"""
+        return len(text) // 4 + max_tokens
+
+    def _wait_time(self, tokens):
+        now = time.monotonic()
+        wait = self.blocked_until - now
+        for kind, needed in (('requests', 1), ('tokens', tokens)):
+            budget = self.budgets[kind]
+            if budget is None:
+                continue
+            if now >= budget["reset_at"]:
+                self.budgets[kind] = None  # Venster voorbij: budget weer vol
+            elif budget["remaining"] < needed:
+                wait = max(wait, budget["reset_at"] - now)
+        return wait
+
+    def _reserve(self, reservation):
+        for kind, needed in reservation.items():
+            self.in_flight[kind] += needed
+            if self.budgets[kind] is not None:
+                self.budgets[kind]["remaining"] -= needed
+
+    def _release(self, reservation):
+        """De call is afgerond: niet meer onderweg (het verbruik blijft van het budget af tot de volgende headers)"""
+        for kind, needed in reservation.items():
+            self.in_flight[kind] -= needed
+        reservation.clear()
+
+    @asynccontextmanager
+    async def slot(self, tokens):
+        """Wacht op een vrije plek én genoeg budget, en reserveer het; geeft de reservering terug voor update()"""
+        async with self._semaphore:
+            while (wait := self._wait_time(tokens)) > 0:
+                bump_run_stat('ai_rate_limit_waits')
+                await asyncio.sleep(wait)
+            reservation = {'requests': 1, 'tokens': tokens}
+            self._reserve(reservation)
+            try:
+                yield reservation
+            finally:
+                self._release(reservation)
+
+    def update(self, headers, reservation=None):
+        """Budget bijwerken uit de rate limit headers van een response.
+
+        De eigen reservering van deze call zit al in de headers en wordt vrijgegeven; de
+        reserveringen van calls die nog onderweg zijn worden van remaining afgetrokken.
+        """
+        if reservation:
+            self._release(reservation)
+        now = time.monotonic()
+        for kind in ('requests', 'tokens'):
+            try:
+                remaining = int(float(headers.get(f'x-ratelimit-remaining-{kind}')))
+            except (TypeError, ValueError):
+                continue
+            reset = parse_rate_limit_reset(headers.get(f'x-ratelimit-reset-{kind}'))
+            self.budgets[kind] = {"remaining": remaining - self.in_flight[kind],
+                                  "reset_at": now + (reset if reset is not None else 60.0)}
+
+    def pause(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+async def chat_completion(session, api_base, api_key, payload, limiter, tokens, max_attempts=4, timeout=60):
+    """POST naar {api_base}/chat/completions met rate limiting en retries; geeft (response json, None) of (None, fout)"""
+    headers = {"Authorization": f"Bearer {api_key}"}
+    error = "AI extraction failed"
+    for attempt in range(1, max_attempts + 1):
+        delay = None
+        try:
+            async with limiter.slot(tokens) as reservation:
+                async with session.post(f"{api_base.rstrip('/')}/chat/completions", json=payload, headers=headers,
+                                        timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    limiter.update(response.headers, reservation)
+                    if response.status == 200:
+                        return await response.json(content_type=None), None
+                    error = f"AI extraction failed: HTTP {response.status}: {(await response.text())[:200]}"
+                    if response.status == 429:
+                        # Rate limited: alle calls wachten, niet alleen deze
+                        delay = parse_retry_after(response.headers.get('Retry-After')) or DomainScheduler.backoff_delay(attempt)
+                        limiter.pause(delay)
+                    elif response.status not in RETRY_STATUSES:
+                        break  # 400/401/404: opnieuw proberen helpt niet
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = f"AI extraction failed: {str(e) or type(e).__name__}"
+        except ValueError as e:
+            error = f"AI extraction failed: unexpected response ({str(e)})"
+            break
+        if attempt < max_attempts:
+            bump_run_stat('ai_retries')
+            await asyncio.sleep(delay if delay is not None else DomainScheduler.backoff_delay(attempt))
+    return None, error
+
+
+async def extract_unique(contents, extract):
+    """extract(content) voor een lijst (methode, content) paren tegelijk; identieke content wordt één keer
+    geanalyseerd. Resultaten als (methode, kopie van het resultaat) in invoervolgorde."""
+    in_flight = {}
+
+    async def run(content):
+        if content not in in_flight:
+            in_flight[content] = asyncio.ensure_future(extract(content))
+        return dict(await asyncio.shield(in_flight[content]))
+
+    results = await asyncio.gather(*(run(content) for _, content in contents))
+    return [(method, result) for (method, _), result in zip(contents, results)]
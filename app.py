@@ -15,7 +15,7 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 import json
 from typing import List, Dict
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import asyncio
 import aiohttp
 from PIL import Image
@@ -29,6 +29,27 @@ import openai
 import hashlib
 from datetime import datetime
 import json
+import threading
+import sqlite3
+import zlib
+from contextlib import asynccontextmanager, contextmanager
+import queue
+from contact_extraction import deobfuscate_emails, extract_contact_data, structured_data_complete
+from page_parsing import extract_main_content, page_text, parse_page
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from page_flight import PageFlight
+from parse_worker import ParseWorkerCrashed, ParseWorkerPool, ParseWorkerTimeout
+from run_stats import RUN_STATS, bump_run_stat, reset_run_stats
+from domain_scheduler import DomainScheduler, parse_retry_after
+from ai_cache import AiResultCache
+from ai_client import AiRateLimiter, chat_completion, extract_unique
+from cache_db import connect_cache_db
+from fallback_stats import FallbackStats
+from html_stream import StreamingHtmlDecoder, is_binary_url, is_html_content_type
+from http_cache import HttpCache
+from website_resolver import WebsiteResolver, host_does_not_exist
+from link_scoring import (affinity_tokens, location_slug_tokens, match_location_page, normalize_url, same_site,
+                          score_contact_link)
 
 # Page configuration must be the first Streamlit command
 st.set_page_config(page_title="Locatiemanager Finder", layout="wide")
@@ -141,7 +162,8 @@ st.markdown("""
 
 # Initialize session state
 for key in ["session", "user", "login_error", "signup_error", "signup_success", "manual_rows", 
-           "selected_team", "user_role", "search_history", "notes", "teams", "scraping_in_progress", "resultaten"]:
+           "selected_team", "user_role", "search_history", "notes", "teams", "scraping_in_progress", "resultaten",
+           "run_summary"]:
     if key not in st.session_state:
         st.session_state[key] = None if key != "signup_success" else False
 
@@ -189,12 +211,12 @@ if not st.session_state.session:
     if action == "Inloggen":
         st.title("Login")
         with st.form("login_form"):  
-            email = st.text_input("E-mail")
+            login_email = st.text_input("E-mail")
             password = st.text_input("Wachtwoord", type="password")
             submit = st.form_submit_button("Inloggen")
         if submit:
             try:
-                res = supabase.auth.sign_in_with_password({"email": email, "password": password})
+                res = supabase.auth.sign_in_with_password({"email": login_email, "password": password})
                 if res.user and res.session:
                     if res.user.email_confirmed_at or res.user.confirmed_at:
                         st.session_state.session = res.session
@@ -217,14 +239,14 @@ if not st.session_state.session:
     else:  # Registreren
         st.title("Nieuw account aanmaken")
         with st.form("signup_form"):  
-            email = st.text_input("E-mail (gebruikersnaam)")
+            login_email = st.text_input("E-mail (gebruikersnaam)")
             password = st.text_input("Wachtwoord", type="password")
             submit = st.form_submit_button("Account aanmaken")
         if submit:
             try:
                 # Gebruik de Streamlit app URL als redirect_to
                 res = supabase.auth.sign_up({
-                    "email": email,
+                    "email": login_email,
                     "password": password,
                     "options": {
                         "email_redirect_to": "https://kdvcontactscraper-bexaokddvtospg8sthcwp5.streamlit.app/"
@@ -463,25 +485,243 @@ with st.sidebar:
 # SerpAPI-key uit secrets
 SERPAPI_KEY = st.secrets.get("SERPAPI_KEY")
 
+# Bulk scraping: aantal locaties tegelijk en maximaal aantal tegelijk per website (host)
+BULK_CONCURRENCY = int(st.secrets.get("BULK_CONCURRENCY", 8))
+BULK_PER_HOST_LIMIT = int(st.secrets.get("BULK_PER_HOST_LIMIT", 2))
+
+# Gedeelde connection pool: één aiohttp sessie per run met keep-alive en DNS cache
+HTTP_POOL_LIMIT = int(st.secrets.get("HTTP_POOL_LIMIT", 100))
+HTTP_POOL_LIMIT_PER_HOST = int(st.secrets.get("HTTP_POOL_LIMIT_PER_HOST", 4))
+HTTP_DNS_CACHE_TTL = int(st.secrets.get("HTTP_DNS_CACHE_TTL", 300))
+HTTP_KEEPALIVE_TIMEOUT = 30
+
+# Politeness per domein: token bucket, Retry-After en backoff met jitter
+DOMAIN_RATE_PER_SECOND = float(st.secrets.get("DOMAIN_RATE_PER_SECOND", 2.0))
+DOMAIN_BURST = int(st.secrets.get("DOMAIN_BURST", 4))
+RUN_RETRY_BUDGET = int(st.secrets.get("RUN_RETRY_BUDGET", 300))
+
+# Crawl budget per website in scrape_deep
+CRAWL_PAGE_BUDGET = int(st.secrets.get("CRAWL_PAGE_BUDGET", 8))
+CRAWL_DEADLINE_SECONDS = float(st.secrets.get("CRAWL_DEADLINE_SECONDS", 45))
+CRAWL_LINKS_PER_PAGE = 3
+
+# Completion policy: de crawl stopt zodra elk doelveld een waarde heeft met minimaal de gevraagde
+# betrouwbaarheid ('normal' = gevonden in de tekst, 'high' = structured data van de site zelf)
+CONFIDENCE_LEVELS = {"normal": 1, "high": 2}
+DEFAULT_COMPLETION_TARGETS = {"emails": "normal", "telefoons": "normal", "adressen": "normal", "managers": "normal"}
+
+def completion_met(field_confidence, targets):
+    """Zijn alle doelvelden gevonden met minimaal hun doel-betrouwbaarheid? Zonder doelvelden nooit."""
+    return bool(targets) and all(
+        field_confidence.get(field, 0) >= CONFIDENCE_LEVELS[level] for field, level in targets.items()
+    )
+
+# Hosts die echt onbereikbaar zijn (DNS/connectie fout) worden zo lang overgeslagen
+UNREACHABLE_HOST_TTL = int(st.secrets.get("UNREACHABLE_HOST_TTL", 600))
+
+# Warme Playwright browser pool (één Chromium, herbruikbare pagina's)
+PLAYWRIGHT_POOL_SIZE = int(st.secrets.get("PLAYWRIGHT_POOL_SIZE", 3))
+PLAYWRIGHT_PAGE_TIMEOUT = float(st.secrets.get("PLAYWRIGHT_PAGE_TIMEOUT", 20))
+PLAYWRIGHT_MAX_USES = int(st.secrets.get("PLAYWRIGHT_MAX_USES", 50))
+CRAWLER_RENDER_JS = str(st.secrets.get("CRAWLER_RENDER_JS", "false")).lower() == "true"
+
+# Pool van herbruikbare headless Selenium drivers
+SELENIUM_POOL_SIZE = int(st.secrets.get("SELENIUM_POOL_SIZE", 2))
+SELENIUM_MAX_USES = int(st.secrets.get("SELENIUM_MAX_USES", 30))
+SELENIUM_PAGE_TIMEOUT = int(st.secrets.get("SELENIUM_PAGE_TIMEOUT", 20))
+
+# Parse stage: aantal processen voor parsen en extractie (0 = in de event loop zelf)
+PARSE_POOL_SIZE = int(st.secrets.get("PARSE_POOL_SIZE", os.cpu_count() or 2))
+PARSE_TIMEOUT = float(st.secrets.get("PARSE_TIMEOUT", 30))  # seconden per pagina, daarna wordt de worker gestopt
+
+# Persistente caches op schijf (HTTP cache, ...)
+SCRAPE_CACHE_DIR = st.secrets.get("SCRAPE_CACHE_DIR", ".scraper_cache")
+HTTP_CACHE_FRESH_SECONDS = int(st.secrets.get("HTTP_CACHE_FRESH_SECONDS", 24 * 3600))
+HTTP_CACHE_MAX_MB = int(st.secrets.get("HTTP_CACHE_MAX_MB", 500))
+
+# AI extractie cache: resultaten per hash van tekst, model en promptversie
+AI_CACHE_TTL = int(st.secrets.get("AI_CACHE_TTL", 30 * 24 * 3600))
+AI_CACHE_MAX_MB = int(st.secrets.get("AI_CACHE_MAX_MB", 50))
+AI_PROMPT_VERSION = 1  # ophogen bij wijzigingen in de user prompt of de verwerking van het antwoord
+# USD per 1K tokens (input, output), voor de bespaarde kosten in de samenvatting
+AI_MODEL_PRICES = {"gpt-3.5-turbo": (0.0005, 0.0015), "gpt-4": (0.03, 0.06), "gpt-4-turbo": (0.01, 0.03)}
+
+# AI extractie stage: gelijktijdige calls binnen de rate limits uit de response headers
+OPENAI_API_BASE = st.secrets.get("OPENAI_API_BASE", "https://api.openai.com/v1")  # lokaal te vervangen voor tests
+AI_CONCURRENCY = int(st.secrets.get("AI_CONCURRENCY", 4))
+AI_MAX_ATTEMPTS = int(st.secrets.get("AI_MAX_ATTEMPTS", 4))
+AI_REQUEST_TIMEOUT = float(st.secrets.get("AI_REQUEST_TIMEOUT", 60))
+AI_MAX_TOKENS = 1000
+
+# Streaming fetch: maximaal aantal bytes per pagina en welke content types we lezen
+FETCH_MAX_BYTES = int(st.secrets.get("FETCH_MAX_BYTES", 2 * 1024 * 1024))
+FETCH_CHUNK_SIZE = 64 * 1024
+
+def open_cache_db(filename, schema):
+    """Open (en maak zo nodig) een sqlite cache in SCRAPE_CACHE_DIR, te delen tussen threads"""
+    return connect_cache_db(os.path.join(SCRAPE_CACHE_DIR, filename), schema)
+
+# Website resolutie (SerpAPI): async, begrensd en persistent gecached
+SERPAPI_URL = st.secrets.get("SERPAPI_URL", "https://serpapi.com/search")  # lokaal te vervangen voor tests
+SERPAPI_CONCURRENCY = int(st.secrets.get("SERPAPI_CONCURRENCY", 5))
+SERPAPI_QUOTA_PER_RUN = int(st.secrets.get("SERPAPI_QUOTA_PER_RUN", 1000))
+RESOLVER_HIT_TTL = int(st.secrets.get("RESOLVER_HIT_TTL", 90 * 24 * 3600))
+RESOLVER_MISS_TTL = int(st.secrets.get("RESOLVER_MISS_TTL", 7 * 24 * 3600))
+RESOLVER_BAD_TTL = int(st.secrets.get("RESOLVER_BAD_TTL", 90 * 24 * 3600))
+RESOLVER_BAD_AFTER_RUNS = int(st.secrets.get("RESOLVER_BAD_AFTER_RUNS", 2))  # runs op rij onbereikbaar voordat een site 'bad' is
+
+# Keten modus: één sitemap index per domein in plaats van een crawl per locatie
+CHAIN_MODE = str(st.secrets.get("CHAIN_MODE", "true")).lower() == "true"
+CHAIN_INDEX_TTL = int(st.secrets.get("CHAIN_INDEX_TTL", 7 * 24 * 3600))
+CHAIN_MIN_ROWS = int(st.secrets.get("CHAIN_MIN_ROWS", 3))  # rijen op hetzelfde domein voordat de index gebouwd wordt
+CHAIN_MIN_LOCATION_PAGES = 3
+CHAIN_SITEMAP_MAX_FILES = 10
+CHAIN_SITEMAP_MAX_BYTES = 10 * 1024 * 1024
+CHAIN_PAGE_DEPTH = int(st.secrets.get("CHAIN_PAGE_DEPTH", 0))
+
 # Function to lookup website URL
-@st.cache_data
-def zoek_website_bij_naam(locatienaam, plaats):
-    query = f"{locatienaam} {plaats} kinderopvang"
-    params = {"q": query, "api_key": SERPAPI_KEY, "engine": "google"}
-    try:
-        resp = requests.get("https://serpapi.com/search", params=params, timeout=10)
-        data = resp.json()
-        for item in data.get("organic_results", []):
-            link = item.get("link")
-            if link:
-                return link
-    except Exception:
-        return None
-    return None
+WEBSITE_RESOLVER = WebsiteResolver(os.path.join(SCRAPE_CACHE_DIR, "resolver.sqlite"), SERPAPI_KEY, SERPAPI_URL,
+                                   SERPAPI_CONCURRENCY, SERPAPI_QUOTA_PER_RUN, RESOLVER_HIT_TTL, RESOLVER_MISS_TTL,
+                                   RESOLVER_BAD_TTL, RESOLVER_BAD_AFTER_RUNS, session_factory=lambda: create_scrape_session())
+
+async def zoek_website_bij_naam(locatienaam, plaats, session=None):
+    return await WEBSITE_RESOLVER.resolve(locatienaam, plaats, session)
+
+# Gedeelde HTTP sessie
+def create_scrape_session():
+    """Maak één aiohttp sessie met keep-alive, DNS cache en begrensde pool voor een hele run"""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_connection_create_end(session, ctx, params):
+        bump_run_stat('connections_new')
+
+    async def on_connection_reuseconn(session, ctx, params):
+        bump_run_stat('connections_reused')
+
+    async def on_dns_cache_hit(session, ctx, params):
+        bump_run_stat('dns_cache_hits')
+
+    async def on_dns_cache_miss(session, ctx, params):
+        bump_run_stat('dns_cache_misses')
+
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+    trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+
+    connector = aiohttp.TCPConnector(
+        ssl=False,
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        use_dns_cache=True,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=aiohttp.CookieJar(),
+        timeout=aiohttp.ClientTimeout(total=30),
+        trace_configs=[trace_config]
+    )
+
+@asynccontextmanager
+async def use_scrape_session(session=None):
+    """Gebruik de meegegeven sessie, of maak een eigen sessie voor losse aanroepen"""
+    if session is not None:
+        yield session
+        return
+    async with create_scrape_session() as own_session:
+        yield own_session
+
+# Per-domein scheduler (politeness)
+DOMAIN_SCHEDULER = DomainScheduler(DOMAIN_RATE_PER_SECOND, DOMAIN_BURST, RUN_RETRY_BUDGET)
+
+# Negatieve cache voor onbereikbare hosts (host -> verloopt op, time.monotonic)
+UNREACHABLE_HOSTS = {}
+
+def mark_host_unreachable(url):
+    UNREACHABLE_HOSTS[(urlparse(url).hostname or '').lower()] = time.monotonic() + UNREACHABLE_HOST_TTL
+    bump_run_stat('hosts_marked_unreachable')
+
+def is_host_unreachable(url):
+    host = (urlparse(url).hostname or '').lower()
+    expires = UNREACHABLE_HOSTS.get(host)
+    if expires is None:
+        return False
+    if expires < time.monotonic():
+        UNREACHABLE_HOSTS.pop(host, None)
+        return False
+    return True
+
+# Annuleren van fallback methoden in de race: run_timed_fallback zet per worker thread een threading.Event
+class FallbackCancelled(BaseException):
+    """De race is al beslist. BaseException (zoals asyncio.CancelledError), zodat de `except Exception`
+    blokken in de fallbacks hem niet opvangen en de methode echt stopt."""
+
+_FALLBACK_CANCEL = threading.local()
+
+def check_fallback_cancelled():
+    """Gooi FallbackCancelled als de race van deze worker thread afgelopen is; aanroepen vóór elk request"""
+    cancel = getattr(_FALLBACK_CANCEL, 'event', None)
+    if cancel is not None and cancel.is_set():
+        raise FallbackCancelled()
+
+def polite_get(url, **kwargs):
+    """requests.get via de domein scheduler, zodat ook sync fallbacks de limieten respecteren"""
+    if is_host_unreachable(url):
+        bump_run_stat('unreachable_host_skips')
+        raise requests.exceptions.ConnectionError(f"Host is onbereikbaar (negatieve cache): {url}")
+    check_fallback_cancelled()
+    DOMAIN_SCHEDULER.acquire_sync(url)
+    check_fallback_cancelled()  # de scheduler kan lang wachten
+    response = requests.get(url, **kwargs)
+    if response.status_code in (429, 503):
+        DOMAIN_SCHEDULER.penalize(url, parse_retry_after(response.headers.get('Retry-After')))
+    return response
+
+# Persistente HTTP cache met conditionele revalidatie (sqlite I/O via asyncio.to_thread)
+HTTP_CACHE = HttpCache(os.path.join(SCRAPE_CACHE_DIR, "http_cache.sqlite"), HTTP_CACHE_FRESH_SECONDS,
+                       HTTP_CACHE_MAX_MB * 1024 * 1024)
 
 # Enhanced async scraping functions
-async def fetch_page(session, url, attempt=1, max_attempts=3):
-    """Enhanced page fetching with multiple user agents and anti-bot measures"""
+# Streaming ophalen met byte budget
+async def read_html_response(response, max_bytes=FETCH_MAX_BYTES):
+    """Lees een aiohttp response in chunks tot het byte budget of de </body>; geeft (html, truncated)"""
+    decoder = StreamingHtmlDecoder(response.charset, max_bytes)
+    async for chunk in response.content.iter_chunked(FETCH_CHUNK_SIZE):
+        if not decoder.feed(chunk):
+            break
+    return decoder.finish(), decoder.truncated
+
+def read_requests_html(resp, max_bytes=FETCH_MAX_BYTES):
+    """Zelfde als read_html_response, voor een requests response met stream=True"""
+    charset = requests.utils.get_encoding_from_headers(resp.headers) if 'charset' in resp.headers.get('Content-Type', '').lower() else None
+    decoder = StreamingHtmlDecoder(charset, max_bytes)
+    try:
+        for chunk in resp.iter_content(FETCH_CHUNK_SIZE):
+            if not decoder.feed(chunk):
+                break
+    finally:
+        resp.close()
+    return decoder.finish()
+
+async def fetch_page(session, url, max_attempts=3):
+    """Enhanced page fetching with multiple user agents and anti-bot measures.
+
+    Alle pogingen lopen via de DOMAIN_SCHEDULER: token bucket per domein, Retry-After bij
+    429/503 en backoff met jitter, begrensd door het retry budget van de run. Bereikbaarheid
+    wordt met deze GET zelf bepaald; hosts die niet te verbinden zijn gaan in de negatieve cache.
+    """
+    # Verse pagina uit de HTTP cache: geen request nodig
+    cached = await asyncio.to_thread(HTTP_CACHE.get, url)
+    if cached and HTTP_CACHE.is_fresh(cached):
+        bump_run_stat('http_cache_hits')
+        HTTP_CACHE.mark_used(url)
+        return HTTP_CACHE.text(cached)
+    
+    if is_host_unreachable(url):
+        bump_run_stat('unreachable_host_skips')
+        return "FETCH_ERROR: host unreachable (negative cache)"
     
     user_agents = [
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -490,232 +730,218 @@ async def fetch_page(session, url, attempt=1, max_attempts=3):
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15'
     ]
     
-    headers = {
-        'User-Agent': user_agents[(attempt - 1) % len(user_agents)],
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'Accept-Language': 'nl-NL,nl;q=0.9,en;q=0.8',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Sec-Fetch-Dest': 'document',
-        'Sec-Fetch-Mode': 'navigate',
-        'Sec-Fetch-Site': 'none',
-        'Sec-Fetch-User': '?1',
-        'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-        'sec-ch-ua-mobile': '?0',
-        'sec-ch-ua-platform': '"Windows"'
-    }
-    
-    try:
-        # Add delay between attempts to avoid being flagged as bot
-        if attempt > 1:
-            await asyncio.sleep(2 * attempt)
-            
-        timeout = aiohttp.ClientTimeout(total=20, connect=10)
-        
-        async with session.get(
-            url, 
-            headers=headers,
-            timeout=timeout,
-            ssl=False,  # Disable SSL verification as fallback
-            allow_redirects=True
-        ) as response:
+    for attempt in range(1, max_attempts + 1):
+        headers = {
+            'User-Agent': user_agents[(attempt - 1) % len(user_agents)],
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+            'Accept-Language': 'nl-NL,nl;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none',
+            'Sec-Fetch-User': '?1',
+            'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+            'sec-ch-ua-mobile': '?0',
+            'sec-ch-ua-platform': '"Windows"'
+        }
+        # Verlopen cache entry: revalideer met If-None-Match / If-Modified-Since
+        headers.update(HTTP_CACHE.conditional_headers(cached))
+        
+        # Wacht op een token voor dit domein (en op een eventuele Retry-After blokkade)
+        await DOMAIN_SCHEDULER.acquire(url)
+        can_retry = attempt < max_attempts
+        
+        try:
+            timeout = aiohttp.ClientTimeout(total=20, connect=10)
             
-            if response.status == 200:
-                content = await response.text()
-                return content
-            elif response.status == 403 and attempt < max_attempts:
-                # Try with different user agent on 403 Forbidden
-                return await fetch_page(session, url, attempt + 1, max_attempts)
-            elif response.status == 429 and attempt < max_attempts:
-                # Rate limited, wait longer and retry
-                await asyncio.sleep(5 * attempt)
-                return await fetch_page(session, url, attempt + 1, max_attempts)
-            else:
-                return f"HTTP_ERROR_{response.status}"
+            async with session.get(
+                url, 
+                headers=headers,
+                timeout=timeout,
+                ssl=False,  # Disable SSL verification as fallback
+                allow_redirects=True
+            ) as response:
                 
-    except asyncio.TimeoutError:
-        if attempt < max_attempts:
-            return await fetch_page(session, url, attempt + 1, max_attempts)
-        return "TIMEOUT_ERROR"
-    except Exception as e:
-        error_msg = str(e)
-        if attempt < max_attempts:
-            # Try again with different approach
-            return await fetch_page(session, url, attempt + 1, max_attempts)
-        return f"FETCH_ERROR: {error_msg}"
-
-def extract_main_content(html):
-    """Extraheert hoofdinhoud van HTML en converteert naar schone tekst"""
-    soup = BeautifulSoup(html, 'html.parser')
-    
-    # Remove unwanted elements
-    unwanted_tags = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'ads', 'advertisement']
-    for tag in unwanted_tags:
-        for element in soup.find_all(tag):
-            element.decompose()
-    
-    # Remove elements by class/id (common patterns for non-content)
-    unwanted_patterns = [
-        'nav', 'navigation', 'menu', 'sidebar', 'footer', 'header', 
-        'advertisement', 'ads', 'social', 'share', 'breadcrumb',
-        'cookie', 'popup', 'modal', 'overlay'
-    ]
-    
-    for pattern in unwanted_patterns:
-        # Find by class
-        for element in soup.find_all(attrs={'class': lambda x: x and any(pattern in str(c).lower() for c in x)}):
-            element.decompose()
-        # Find by id  
-        for element in soup.find_all(attrs={'id': lambda x: x and pattern in str(x).lower()}):
-            element.decompose()
-    
-    # Try to find main content area
-    main_content = None
-    
-    # Priority order for main content selectors
-    content_selectors = [
-        'main', 'article', '[role="main"]',
-        '.main-content', '.content', '.post-content', 
-        '.entry-content', '.page-content', '.article-content',
-        '.container .content', '.wrapper .content'
-    ]
-    
-    for selector in content_selectors:
-        main_content = soup.select_one(selector)
-        if main_content:
-            break
-    
-    # If no specific main content found, use body but filter more aggressively
-    if not main_content:
-        main_content = soup.find('body')
-        if main_content:
-            # Remove more potential noise when using full body
-            noise_selectors = [
-                'nav', 'header', 'footer', 'aside', '.sidebar', 
-                '.widget', '.menu', '.navigation'
-            ]
-            for selector in noise_selectors:
-                for element in main_content.select(selector):
-                    element.decompose()
-    
-    if not main_content:
-        main_content = soup  # Last resort
-    
-    # Convert to structured text
-    return html_to_structured_text(main_content)
+                if response.status == 200:
+                    content_type = response.headers.get('Content-Type', '')
+                    if not is_html_content_type(content_type):
+                        # PDF, afbeelding of andere binary: body niet lezen
+                        bump_run_stat('fetch_skipped_non_html')
+                        return f"FETCH_ERROR: skipped non-HTML content ({content_type.split(';')[0].strip()})"
+                    content, truncated = await read_html_response(response)
+                    bump_run_stat('http_cache_misses')
+                    if truncated:
+                        # Afgekapt op het byte budget: niet als verse (of revalideerbare) pagina cachen
+                        bump_run_stat('http_cache_skipped_truncated')
+                    elif 'no-store' not in response.headers.get('Cache-Control', '').lower():
+                        await asyncio.to_thread(HTTP_CACHE.store, url, content, response.headers.get('ETag'),
+                                                response.headers.get('Last-Modified'))
+                    return content
+                elif response.status == 304 and cached:
+                    # Niet gewijzigd: cache entry is weer vers
+                    bump_run_stat('http_cache_revalidated')
+                    await asyncio.to_thread(HTTP_CACHE.touch, url)
+                    return HTTP_CACHE.text(cached)
+                elif response.status in (429, 503):
+                    # Rate limited: blokkeer het domein (Retry-After of backoff) zodat ook andere
+                    # locaties op dit domein wachten; de volgende acquire wacht de blokkade af
+                    DOMAIN_SCHEDULER.penalize(url, parse_retry_after(response.headers.get('Retry-After')), attempt)
+                    if can_retry and DOMAIN_SCHEDULER.take_retry():
+                        continue
+                    return f"HTTP_ERROR_{response.status}"
+                elif response.status == 403 and can_retry and DOMAIN_SCHEDULER.take_retry():
+                    # Try with different user agent on 403 Forbidden
+                    await asyncio.sleep(DOMAIN_SCHEDULER.backoff_delay(attempt))
+                    continue
+                else:
+                    return f"HTTP_ERROR_{response.status}"
+                    
+        except asyncio.TimeoutError:
+            if can_retry and DOMAIN_SCHEDULER.take_retry():
+                await asyncio.sleep(DOMAIN_SCHEDULER.backoff_delay(attempt))
+                continue
+            return "TIMEOUT_ERROR"
+        except aiohttp.ClientConnectorError as e:
+            # DNS fout of verbinding geweigerd: de host is (nu) niet bereikbaar
+            if can_retry and DOMAIN_SCHEDULER.take_retry():
+                await asyncio.sleep(DOMAIN_SCHEDULER.backoff_delay(attempt))
+                continue
+            mark_host_unreachable(url)
+            return f"FETCH_ERROR: {str(e)}"
+        except Exception as e:
+            error_msg = str(e)
+            if can_retry and DOMAIN_SCHEDULER.take_retry():
+                # Try again with different approach
+                await asyncio.sleep(DOMAIN_SCHEDULER.backoff_delay(attempt))
+                continue
+            return f"FETCH_ERROR: {error_msg}"
+
+# Parse stage in aparte workerprocessen
+@st.cache_resource
+def get_parse_pool():
+    """Workerprocessen voor het CPU-werk per pagina (parsen, tekst- en contactextractie); None als PARSE_POOL_SIZE 0 is.
+
+    BeautifulSoup bouwt de boom in Python en houdt de GIL vast, dus een threadpool zou de event loop
+    nog steeds ophouden. Geen multiprocessing pool: die voert app.py in elke worker opnieuw uit
+    (zie parse_worker). Gecrashte en vastgelopen workers worden door de pool zelf herstart.
+    """
+    if PARSE_POOL_SIZE <= 0:
+        return None
+    return ParseWorkerPool(PARSE_POOL_SIZE, timeout=PARSE_TIMEOUT)
 
-def html_to_structured_text(element):
-    """Converteert HTML element naar gestructureerde tekst"""
-    if not element:
-        return ""
-    
-    text_parts = []
-    
-    def process_element(elem, level=0):
-        if elem.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            # Headers with markdown-style formatting
-            header_level = int(elem.name[1])
-            prefix = '#' * header_level + ' '
-            text_parts.append(f"\n{prefix}{elem.get_text(strip=True)}\n")
-        
-        elif elem.name in ['p', 'div', 'section']:
-            # Paragraphs and divs
-            text = elem.get_text(separator=' ', strip=True)
-            if text and len(text) > 10:  # Ignore very short texts
-                text_parts.append(f"{text}\n")
-        
-        elif elem.name in ['ul', 'ol']:
-            # Lists
-            for li in elem.find_all('li', recursive=False):
-                list_text = li.get_text(separator=' ', strip=True)
-                if list_text:
-                    text_parts.append(f"• {list_text}\n")
-        
-        elif elem.name == 'table':
-            # Tables - extract as structured text
-            for row in elem.find_all('tr'):
-                cells = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
-                if any(cells):  # If row has content
-                    text_parts.append(" | ".join(cells) + "\n")
-        
-        elif elem.name in ['span', 'strong', 'em', 'b', 'i']:
-            # Inline elements - just get text
-            text = elem.get_text(separator=' ', strip=True)
-            if text:
-                text_parts.append(f"{text} ")
-        
-        elif elem.name == 'br':
-            text_parts.append("\n")
-        
-        elif elem.name is None:  # Text node
-            text = str(elem).strip()
-            if text and len(text) > 2:
-                text_parts.append(f"{text} ")
-        
-        else:
-            # For other elements, recurse into children
-            if hasattr(elem, 'children'):
-                for child in elem.children:
-                    if hasattr(child, 'name'):
-                        process_element(child, level + 1)
-    
-    process_element(element)
-    
-    # Join and clean up
-    result = ''.join(text_parts)
-    
-    # Clean up multiple newlines and spaces
-    result = re.sub(r'\n\s*\n\s*\n+', '\n\n', result)  # Max 2 newlines
-    result = re.sub(r' +', ' ', result)  # Multiple spaces to single
-    result = result.strip()
+async def parse_page_async(html, want_links=True):
+    """parse_page in de parse workers, zodat ophalen en parsen van verschillende pagina's overlappen"""
+    bump_run_stat('pages_parsed')
+    pool = get_parse_pool()
+    if pool is not None:
+        try:
+            return await asyncio.wrap_future(pool.submit(html, want_links))
+        except ParseWorkerTimeout:
+            # Worker hing (bijv. een pathologische pagina): gestopt, deze pagina inline
+            bump_run_stat('parse_pool_timeouts')
+        except ParseWorkerCrashed:
+            # Worker gecrasht (bijv. geheugen): deze pagina inline, de pool start een nieuwe worker
+            bump_run_stat('parse_pool_failures')
+    return parse_page(html, want_links)
+
+def parse_page_sync(html, want_links=True):
+    """Zelfde als parse_page_async, voor sync code die in een worker thread draait"""
+    bump_run_stat('pages_parsed')
+    pool = get_parse_pool()
+    if pool is not None:
+        try:
+            return pool.submit(html, want_links).result()
+        except ParseWorkerTimeout:
+            bump_run_stat('parse_pool_timeouts')
+        except ParseWorkerCrashed:
+            bump_run_stat('parse_pool_failures')
+    return parse_page(html, want_links)
+
+# Single-flight per URL: één fetch + parse per pagina per run
+PAGE_FLIGHT = PageFlight()
+
+def record_deobfuscation(deobfuscated):
+    """Tel gedeobfusceerde e-mails per techniek (cfemail, at_dot, entities, javascript)"""
+    for technique in deobfuscated.values():
+        bump_run_stat(f'deobfuscated_{technique}')
+
+def record_prevented_escalation(deobfuscated, data):
+    """Tel een voorkomen escalatie: alleen de gedeobfusceerde e-mails maken het resultaat van deze locatie
+    bruikbaar, zonder deobfuscatie was het 'geen data' geweest en naar de fallbacks/AI gegaan"""
+    if deobfuscated and not data.get('error') and not data.get('telefoons') and not data.get('adressen') \
+            and not set(data.get('emails', [])) - set(deobfuscated):
+        bump_run_stat('deobfuscation_escalations_prevented')
+
+# Pagina's die in deze run al zijn opgehaald (genormaliseerd), over alle locaties heen. Op ketensites
+# levert de algemene contactpagina voor de volgende locatie niets nieuws op.
+SEEN_PAGES = set()
+
+async def scrape_deep(url, max_depth=2, session=None, page_budget=CRAWL_PAGE_BUDGET, deadline_seconds=CRAWL_DEADLINE_SECONDS,
+                      render_js=CRAWLER_RENDER_JS, completion_targets=None, locatienaam=None, plaats=None):
+    """Best-first crawl van een website: per diepte worden de hoogst scorende links tegelijk opgehaald,
+    begrensd door een pagina budget en een deadline. Met render_js worden geblokkeerde pagina's
+    via de warme Playwright pool opgehaald. Links worden gescoord met score_contact_link, met affinity
+    voor locatienaam en plaats als die bekend zijn. De crawl stopt vroegtijdig zodra de completion policy
+    (completion_targets, standaard DEFAULT_COMPLETION_TARGETS) gehaald is, of zodra structured data een
+    locatie (LocalBusiness/ChildCare in de plaats van de rij) met e-mail én telefoon oplevert; dat laatste
+    maakt het resultaat 'high' confidence. Losse mailto:/tel: links tellen als 'normal'."""
+    result = {"emails": set(), "telefoons": set(), "adressen": set(), "managers": set(), "error": "", "debug_info": [],
+              "complete": False, "requests_saved": 0}
+    visited = set()  # genormaliseerde URLs; wordt gevuld bij het inplannen, dus veilig bij gelijktijdig ophalen
+    structured_locations = []  # gemarkeerde locaties (LocalBusiness/ChildCare) over alle pagina's
+    field_confidence = {}  # veld -> hoogste betrouwbaarheid waarmee het gevonden is
+    if completion_targets is None:
+        completion_targets = DEFAULT_COMPLETION_TARGETS
     
-    return result
-
-async def quick_check_url(url):
-    """Quick check if URL is reachable before full scraping"""
-    try:
-        connector = aiohttp.TCPConnector(ssl=False)
-        timeout = aiohttp.ClientTimeout(total=10)
-        
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            async with session.head(url) as response:
-                return response.status in [200, 301, 302, 403]  # 403 might still have content
-    except:
-        return False
-
-async def scrape_deep(url, max_depth=2):
-    result = {"emails": set(), "telefoons": set(), "adressen": set(), "managers": set(), "error": "", "debug_info": []}
-    visited = set()
+    def crawl_complete():
+        return structured_data_complete(structured_locations, plaats) or completion_met(field_confidence, completion_targets)
+    deobfuscated = {}  # email -> techniek, over alle pagina's
     base_url = url
+    affinity = affinity_tokens(locatienaam, plaats)
+    section_path = urlparse(url).path
     
-    # Quick check if URL is reachable first
+    # Skip hosts that already turned out to be unreachable in this run; reachability itself
+    # is determined by the first real GET (no separate HEAD pre-flight)
     result["debug_info"].append(f"Starting scrape of: {url}")
-    if not await quick_check_url(url):
+    if is_host_unreachable(url):
         result["error"] = "Website is not reachable"
-        result["debug_info"].append("-> Pre-check failed: URL is not accessible")
+        result["debug_info"].append("-> Host is in the unreachable cache, skipped")
         return {k: list(v) if isinstance(v, set) else v for k, v in result.items()}
 
-    # Configure session to be more browser-like
-    connector = aiohttp.TCPConnector(ssl=False, limit=10)
-    jar = aiohttp.CookieJar()
-    timeout = aiohttp.ClientTimeout(total=30)
-    
-    async with aiohttp.ClientSession(
-        connector=connector,
-        cookie_jar=jar,
-        timeout=timeout
-    ) as session:
+    # Use the shared run session when given, otherwise a browser-like session of our own
+    async with use_scrape_session(session) as session:
         async def process_page(url, depth):
-            if depth > max_depth or url in visited:
-                return
-            visited.add(url)
-            
+            """Haal één pagina op, extraheer contactgegevens en geef gescoorde vervolglinks terug"""
             result["debug_info"].append(f"Scraping: {url} (depth: {depth})")
             
-            html = await fetch_page(session, url)
-            if not html or isinstance(html, str) and html.startswith(('HTTP_ERROR', 'TIMEOUT_ERROR', 'FETCH_ERROR')):
+            want_links = depth < max_depth
+            
+            async def load_page():
+                """Ophalen (zo nodig renderen) en parsen; gedeeld met andere locaties via PAGE_FLIGHT.
+                Debug regels horen bij het resultaat, zodat ook wachtende locaties ze krijgen."""
+                debug = []
+                html = await fetch_page(session, url)
+                if render_js and html and html.startswith(('HTTP_ERROR_403', 'HTTP_ERROR_429')):
+                    # Geblokkeerd voor gewone requests: één navigatie in de warme browser pool
+                    try:
+                        await DOMAIN_SCHEDULER.acquire(url)
+                        html = await get_playwright_pool().render_async(url)
+                        debug.append(f"Rendered {url} with Playwright pool")
+                    except Exception as e:
+                        debug.append(f"Playwright pool failed for {url}: {str(e)}")
+                if not html or isinstance(html, str) and html.startswith(('HTTP_ERROR', 'TIMEOUT_ERROR', 'FETCH_ERROR')):
+                    return html, None, debug
+                # Parse once in the parse pool; content extraction, contact blocks and link discovery share the tree
+                return None, await parse_page_async(html, want_links), debug
+            
+            # Mislukte fetches worden niet gedeeld: een volgende locatie probeert het opnieuw
+            html, parsed, debug = await PAGE_FLIGHT.run_async('async', url, load_page, want_links,
+                                                              failed=lambda value: value[1] is None)
+            result["debug_info"].extend(debug)
+            if parsed is None:
                 error_msg = html if html else "No content returned"
                 result["debug_info"].append(f"Failed to fetch {url}: {error_msg}")
                 if html and 'HTTP_ERROR_403' in html:
@@ -724,157 +950,130 @@ async def scrape_deep(url, max_depth=2):
                     result["debug_info"].append("-> Request timed out - website may be slow or blocking")
                 elif html and 'FETCH_ERROR' in html:
                     result["debug_info"].append("-> Network or SSL error occurred")
-                return
+                return []
 
-            # Extract main content using advanced content extraction
-            structured_text = extract_main_content(html)
-            result["debug_info"].append(f"Extracted {len(structured_text)} characters of structured text")
+            SEEN_PAGES.add(normalize_url(url))
             
-            # Also get the original soup for fallback
-            soup = BeautifulSoup(html, 'html.parser')
+            result["debug_info"].append(f"Extracted {len(parsed['main_text'])} characters of structured text")
             
-            # Remove script and style elements from soup  
-            for script in soup(["script", "style"]):
-                script.extract()
+            # Emails, phones, addresses and managers from structured text, contact blocks and basic text
+            # (emails include the ones that were only readable after deobfuscation)
+            for key in ('emails', 'telefoons', 'adressen', 'managers'):
+                result[key].update(parsed['contact_data'][key])
+                if parsed['contact_data'][key]:
+                    field_confidence[key] = max(field_confidence.get(key, 0), CONFIDENCE_LEVELS["normal"])
+            if parsed['deobfuscated']:
+                record_deobfuscation(parsed['deobfuscated'])
+                deobfuscated.update(parsed['deobfuscated'])
+                result["debug_info"].append(f"Deobfuscated on {url}: {', '.join(f'{e} ({t})' for e, t in parsed['deobfuscated'].items())}")
             
-            # Get basic text as fallback
-            basic_text = soup.get_text(separator=" ", strip=True)
+            # mailto:/tel: links (often only the generic footer contact): normal confidence
+            structured = parsed['structured_data']
+            for key in ('emails', 'telefoons'):
+                result[key].update(structured['links'][key])
+                if structured['links'][key]:
+                    field_confidence[key] = max(field_confidence.get(key, 0), CONFIDENCE_LEVELS["normal"])
             
-            # Also get text from specific contact-related elements
-            contact_selectors = [
-                'div[class*="contact"]', 'div[class*="Contact"]',
-                'div[class*="team"]', 'div[class*="Team"]',
-                'div[class*="staff"]', 'div[class*="Staff"]',
-                'div[class*="medewerker"]', 'div[class*="Medewerker"]',
-                'div[class*="locatie"]', 'div[class*="Locatie"]',
-                'section[class*="contact"]', 'section[class*="team"]',
-                'footer', '.footer'
-            ]
+            # JSON-LD and microdata are published by the site itself: high confidence
+            if any(structured[key] for key in ('emails', 'telefoons', 'adressen', 'managers')):
+                bump_run_stat('structured_data_pages')
+                for key in ('emails', 'telefoons', 'adressen', 'managers'):
+                    result[key].update(structured[key])
+                    if structured[key]:
+                        field_confidence[key] = CONFIDENCE_LEVELS["high"]
+                structured_locations.extend(structured['locations'])
+                result["debug_info"].append(f"Structured data on {url}: {len(structured['emails'])} emails, {len(structured['telefoons'])} phones, {len(structured['locations'])} locations")
             
-            contact_text = ""
-            for selector in contact_selectors:
-                elements = soup.select(selector)
-                for elem in elements:
-                    contact_text += " " + elem.get_text(separator=" ", strip=True)
-            
-            # Use structured text as primary, with fallbacks
-            full_text = structured_text + " " + contact_text + " " + basic_text
+            result["debug_info"].append(f"Found on {url}: {len(result['emails'])} emails, {len(result['telefoons'])} phones, {len(result['adressen'])} addresses, {len(result['managers'])} managers")
             
-            # Extract emails - verbeterde regex
-            email_patterns = [
-                r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}",
-                r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-                r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-            ]
+            # Find more links for deeper scraping (also once complete, to count the requests we save)
+            contact_links = {}
+            if depth < max_depth:
+                for href, text in parsed['links']:
+                    full_url = urljoin(url, href.strip())
+                    if not full_url.startswith(('http://', 'https://')) or not same_site(full_url, base_url):
+                        continue  # mailto:, tel:, javascript: and other websites
+                    key = normalize_url(full_url)
+                    if key in visited or is_binary_url(full_url):
+                        continue
+                    score = score_contact_link(text, full_url, affinity, section_path, SEEN_PAGES)
+                    if score > 0 and (key not in contact_links or score > contact_links[key][1]):
+                        contact_links[key] = (full_url, score)
             
-            for pattern in email_patterns:
-                emails = re.findall(pattern, full_text)
-                # Filter out common non-email matches
-                for email in emails:
-                    if not any(skip in email.lower() for skip in ['@example', '@domain', '@test', 'noreply', 'no-reply']):
-                        result['emails'].add(email.lower().strip())
+            # Only the most promising links of this page go to the frontier
+            best_links = sorted(contact_links.values(), key=lambda item: item[1], reverse=True)[:CRAWL_LINKS_PER_PAGE]
+            if best_links:
+                result["debug_info"].append(f"Best links on {url}: {', '.join(f'{link} ({score:g})' for link, score in best_links)}")
+            return best_links
+
+        async def crawl():
+            """Crawl per diepte: alle pagina's van één niveau tegelijk, best-first binnen budget en deadline"""
+            deadline = time.monotonic() + deadline_seconds
+            frontier = [url]
+            visited.add(normalize_url(url))
+            pages_fetched = 0
             
-            # Extract phone numbers - betere detectie
-            phone_text = re.sub(r'[^\d\s\+\-\(\)]+', ' ', full_text)  # Clean text for phone detection
-            try:
-                for match in phonenumbers.PhoneNumberMatcher(phone_text, "NL"):
-                    formatted = phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-                    result['telefoons'].add(formatted)
-                    
-                # Also try to find phone numbers with regex as backup
-                phone_patterns = [
-                    r'(?:\+31|0031|0)[\s\-]?6[\s\-]?[\d\s\-]{8}',  # Dutch mobile
-                    r'(?:\+31|0031|0)[\s\-]?[1-9][\d\s\-]{8}',     # Dutch landline
-                    r'\b\d{2,3}[\s\-]?\d{6,7}\b',                  # Simple pattern
-                    r'\b\d{10,11}\b'                               # Just digits
-                ]
+            for depth in range(max_depth + 1):
+                batch = frontier[:max(0, page_budget - pages_fetched)]
+                if not batch:
+                    if frontier:
+                        result["debug_info"].append(f"Page budget of {page_budget} reached, skipping {len(frontier)} links")
+                    break
+                remaining_time = deadline - time.monotonic()
+                if remaining_time <= 0:
+                    result["debug_info"].append(f"Crawl deadline of {deadline_seconds}s reached")
+                    break
+                pages_fetched += len(batch)
                 
-                for pattern in phone_patterns:
-                    phones = re.findall(pattern, full_text)
-                    for phone in phones:
-                        cleaned = re.sub(r'[^\d\+]', '', phone)
-                        if len(cleaned) >= 9:
-                            result['telefoons'].add(phone.strip())
-                            
-            except Exception as e:
-                result["debug_info"].append(f"Phone extraction error: {str(e)}")
-            
-            # Extract addresses - verbeterde patronen
-            address_patterns = [
-                r'\b[A-Z][a-z]+(?:straat|laan|weg|plein|dreef|park|square|boulevard)\s*\d+[a-z]?\b',
-                r'\b\d{4}\s?[A-Z]{2}\s+[A-Z][a-z]+',  # Postcode + plaats
-                r'\b\d{4}\s?[A-Z]{2}\b'  # Alleen postcode
-            ]
-            
-            for pattern in address_patterns:
-                addresses = re.findall(pattern, full_text)
-                result['adressen'].update(addr.strip() for addr in addresses)
-            
-            # Extract managers - uitgebreidere zoektermen
-            manager_keywords = [
-                r'locatiemanager', r'locatie\s*manager',
-                r'manager', r'directeur', r'directrice',
-                r'leidinggevende', r'teamleider', r'teamleidster',
-                r'hoofd\s*vestiging', r'vestigingsmanager',
-                r'pedagogisch\s*medewerker', r'pm\b',
-                r'locatiecoördinator', r'coördinator'
-            ]
-            
-            lines = full_text.split('\n')
-            for line in lines:
-                line = line.strip()
-                if len(line) > 5 and len(line) < 100:  # Reasonable length for a name/title
-                    for keyword in manager_keywords:
-                        if re.search(keyword, line, flags=re.IGNORECASE):
-                            # Try to extract name from the line
-                            # Look for patterns like "Manager: John Doe" or "John Doe - Manager"
-                            name_patterns = [
-                                r'([A-Z][a-z]+\s+[A-Z][a-z]+)',  # First Last
-                                r'([A-Z]\.\s*[A-Z][a-z]+)',      # F. Last
-                                r'([A-Z][a-z]+\s+[A-Z]\.\s*[A-Z][a-z]+)'  # First F. Last
-                            ]
-                            
-                            for name_pattern in name_patterns:
-                                names = re.findall(name_pattern, line)
-                                for name in names:
-                                    if not any(skip in name.lower() for skip in ['lorem', 'ipsum', 'example']):
-                                        result['managers'].add(f"{name.strip()} ({keyword})")
-                            
-                            # If no name found, add the whole line if it's reasonable
-                            if not result['managers']:
-                                result['managers'].add(line[:80] + ("..." if len(line) > 80 else ""))
-                            break
-            
-            result["debug_info"].append(f"Found on {url}: {len(result['emails'])} emails, {len(result['telefoons'])} phones, {len(result['adressen'])} addresses, {len(result['managers'])} managers")
-            
-            # Find more links for deeper scraping
-            if depth < max_depth:
-                contact_links = []
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    text = link.get_text(strip=True).lower()
-                    
-                    # Look for contact/team related links
-                    if any(word in text for word in ['contact', 'team', 'over', 'medewerker', 'locatie']):
-                        if href.startswith('/'):
-                            full_url = urljoin(base_url, href)
-                        elif href.startswith(base_url):
-                            full_url = href
-                        else:
-                            continue
-                            
-                        if full_url not in visited and base_url in full_url:
-                            contact_links.append(full_url)
+                tasks = [asyncio.create_task(process_page(page_url, depth)) for page_url in batch]
+                done, pending = await asyncio.wait(tasks, timeout=remaining_time)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    result["debug_info"].append(f"Crawl deadline reached, cancelled {len(pending)} pages")
                 
-                # Process a few promising links
-                for link in contact_links[:3]:  # Limit to avoid too many requests
-                    await process_page(link, depth + 1)
-
+                # Merge the candidate links of this level, best score first
+                candidates = {}
+                for task in done:
+                    if task.exception():
+                        if depth == 0:
+                            raise task.exception()
+                        result["debug_info"].append(f"Page error: {str(task.exception())}")
+                        continue
+                    for link, score in task.result():
+                        candidates[link] = max(score, candidates.get(link, 0))
+                if pending:
+                    break
+                if crawl_complete():
+                    result['complete'] = True
+                    if depth < max_depth:
+                        # Links that would have been fetched next, within the page budget
+                        saved = min(sum(1 for link in candidates if normalize_url(link) not in visited),
+                                    max(0, page_budget - pages_fetched))
+                        result['requests_saved'] = saved
+                        bump_run_stat('requests_saved', saved)
+                        bump_run_stat('structured_data_early_stops' if structured_data_complete(structured_locations, plaats)
+                                      else 'completion_early_stops')
+                    result["debug_info"].append("Completion targets met, skipping deeper crawl")
+                    break
+                
+                frontier = []
+                for link, score in sorted(candidates.items(), key=lambda item: item[1], reverse=True):
+                    key = normalize_url(link)
+                    if key not in visited:
+                        visited.add(key)
+                        frontier.append(link)
+        
         try:
-            await process_page(url, 0)
+            await crawl()
         except Exception as e:
             result['error'] = str(e)
             result["debug_info"].append(f"Main scraping error: {str(e)}")
+        
+        if not result['error'] and is_host_unreachable(url):
+            result['error'] = "Website is not reachable"
+        result['confidence'] = "high" if structured_data_complete(structured_locations, plaats) else "normal"
+        record_prevented_escalation(deobfuscated, result)
 
     # Convert sets to lists and remove debug_info from final result
     final_result = {k: list(v) if isinstance(v, set) else v for k, v in result.items() if k != "debug_info"}
@@ -886,20 +1085,11 @@ async def scrape_deep(url, max_depth=2):
     return final_result
 
 # Function to backup search if SerpAPI fails
-async def backup_search(locatienaam, plaats):
+async def backup_search(locatienaam, plaats, session=None):
     query = f"{locatienaam} {plaats} kinderopvang"
     search_url = f"https://www.google.com/search?q={query}"
     
-    # Configure session to be more browser-like for Google search
-    connector = aiohttp.TCPConnector(ssl=False, limit=5)
-    jar = aiohttp.CookieJar()
-    timeout = aiohttp.ClientTimeout(total=15)
-    
-    async with aiohttp.ClientSession(
-        connector=connector,
-        cookie_jar=jar,
-        timeout=timeout
-    ) as session:
+    async with use_scrape_session(session) as session:
         try:
             html = await fetch_page(session, search_url)
             if html:
@@ -913,10 +1103,12 @@ async def backup_search(locatienaam, plaats):
     return None
 
 # Enhanced scrape: emails, phones, addresses, managers
-@st.cache_data
-def scrape_contactgegevens(url):
-    result = {"emails": [], "telefoons": [], "adressen": [], "managers": [], "error": ""}
-    
+class PageFetchError(Exception):
+    """Pagina niet op te halen; st.cache_data bewaart geen exceptions, dus fouten worden niet gecached"""
+
+@st.cache_data(ttl=24 * 3600, max_entries=5000)
+def fetch_contactgegevens_page_cached(url):
+    """Haal een pagina op met requests en parse hem (zonder links); PageFetchError bij een fout"""
     # Enhanced headers to mimic real browser
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -936,14 +1128,20 @@ def scrape_contactgegevens(url):
         # Try multiple approaches
         for attempt in range(2):
             try:
+                DOMAIN_SCHEDULER.acquire_sync(url)
                 if attempt == 0:
-                    resp = session.get(url, timeout=15, verify=True)
+                    resp = session.get(url, timeout=15, verify=True, stream=True)
                 else:
                     # Second attempt: disable SSL verification
-                    resp = session.get(url, timeout=15, verify=False)
+                    resp = session.get(url, timeout=15, verify=False, stream=True)
                 
                 if resp.status_code == 200:
                     break
+                # Gestreamde response zonder de body te lezen: verbinding teruggeven aan de pool
+                resp.close()
+                if resp.status_code in (429, 503):
+                    DOMAIN_SCHEDULER.penalize(url, parse_retry_after(resp.headers.get('Retry-After')))
+                    resp.raise_for_status()
                 elif resp.status_code == 403:
                     # Try with different User-Agent
                     session.headers.update({
@@ -961,105 +1159,156 @@ def scrape_contactgegevens(url):
         
         resp.raise_for_status()
         
-        # Extract main content using advanced content extraction
-        structured_text = extract_main_content(resp.text)
-        
-        # Also get basic soup text as fallback
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        
-        # Remove script and style elements from soup
-        for script in soup(["script", "style"]):
-            script.extract()
-        
-        basic_text = soup.get_text(separator=" ", strip=True)
+        content_type = resp.headers.get('Content-Type', '')
+        if not is_html_content_type(content_type):
+            resp.close()
+            bump_run_stat('fetch_skipped_non_html')
+            raise PageFetchError(f"Not an HTML page ({content_type.split(';')[0].strip()})")
+        # Parse and extract (main content, contact blocks and basic text) in the parse pool
+        return parse_page_sync(read_requests_html(resp), want_links=False)
         
-        # Combine structured and basic text
-        text = structured_text + " " + basic_text
-        
-        # Enhanced email extraction
-        email_patterns = [
-            r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}",
-            r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        ]
-        
-        emails = set()
-        for pattern in email_patterns:
-            found = re.findall(pattern, text)
-            for email in found:
-                if not any(skip in email.lower() for skip in ['example', 'test', 'noreply']):
-                    emails.add(email.lower().strip())
-        result['emails'] = list(emails)
-        
-        # Enhanced phone extraction
-        phones = set()
+    except PageFetchError:
+        raise
+    except Exception as e:
+        raise PageFetchError(str(e) or type(e).__name__) from e
+
+def fetch_contactgegevens_page(url):
+    """Geeft (fout, parsed) met parsed None bij een fout; alleen geslaagde pagina's komen 24 uur in de cache"""
+    try:
+        return "", fetch_contactgegevens_page_cached(url)
+    except PageFetchError as e:
+        return str(e), None
+
+def scrape_contactgegevens(url):
+    result = {"emails": [], "telefoons": [], "adressen": [], "managers": [], "error": ""}
+    
+    # Andere locaties in deze run met dezelfde URL delen de fetch en het geparste resultaat
+    error, parsed = PAGE_FLIGHT.run_sync('requests', url, lambda: fetch_contactgegevens_page(url), want_links=False,
+                                         failed=lambda value: value[1] is None)
+    if error:
+        result['error'] = error
+        return result
+    result.update({key: list(values) for key, values in parsed['contact_data'].items()})
+    record_deobfuscation(parsed['deobfuscated'])
+    record_prevented_escalation(parsed['deobfuscated'], result)
+    return result
+
+# Warme Playwright browser pool
+class PlaywrightPool:
+    """Eén langlevende headless Chromium met een begrensde set herbruikbare contexts/pagina's.
+
+    De browser draait in een eigen event loop thread, zodat zowel sync fallbacks (vanuit
+    worker threads) als de async crawler (vanuit een andere loop) hem kunnen gebruiken.
+    Pagina's worden na PLAYWRIGHT_MAX_USES navigaties of na een fout gerecycled.
+    """
+
+    def __init__(self, size=PLAYWRIGHT_POOL_SIZE, page_timeout=PLAYWRIGHT_PAGE_TIMEOUT, max_uses=PLAYWRIGHT_MAX_USES):
+        self.size = max(1, size)
+        self.page_timeout = page_timeout
+        self.max_uses = max(1, max_uses)
+        self._playwright = None
+        self._browser = None
+        self._slots = None
+        self._start_lock = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="playwright-pool", daemon=True)
+        self._thread.start()
+
+    async def _ensure_browser(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            from playwright.async_api import async_playwright
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            bump_run_stat('playwright_browser_starts')
+            # Slots worden lui gevuld met een context + pagina
+            self._slots = asyncio.Queue()
+            for _ in range(self.size):
+                self._slots.put_nowait(None)
+
+    async def _new_slot(self):
+        context = await self._browser.new_context(
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            locale='nl-NL'
+        )
+        page = await context.new_page()
+        page.set_default_timeout(self.page_timeout * 1000)
+        return {"context": context, "page": page, "uses": 0}
+
+    async def _close_slot(self, slot):
         try:
-            for match in phonenumbers.PhoneNumberMatcher(text, "NL"):
-                formatted = phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-                phones.add(formatted)
-                
-            # Backup regex patterns for Dutch phones
-            phone_patterns = [
-                r'(?:\+31|0031|0)[\s\-]?6[\s\-]?[\d\s\-]{8}',  # Dutch mobile
-                r'(?:\+31|0031|0)[\s\-]?[1-9][\d\s\-]{8}',     # Dutch landline
-            ]
-            
-            for pattern in phone_patterns:
-                found_phones = re.findall(pattern, text)
-                for phone in found_phones:
-                    cleaned = re.sub(r'[^\d\+]', '', phone)
-                    if len(cleaned) >= 9:
-                        phones.add(phone.strip())
-                        
+            await slot["context"].close()
         except Exception:
             pass
-            
-        result['telefoons'] = list(phones)
-        
-        # Enhanced address extraction
-        addr_patterns = [
-            r'\b[A-Z][a-z]+(?:straat|laan|weg|plein|dreef|park|boulevard)\s*\d+[a-z]?\b',
-            r'\b\d{4}\s?[A-Z]{2}\s+[A-Z][a-z]+',  # Postcode + plaats
-            r'\b\d{4}\s?[A-Z]{2}\b'  # Alleen postcode
-        ]
-        
-        addresses = set()
-        for pattern in addr_patterns:
-            found = re.findall(pattern, text)
-            addresses.update(addr.strip() for addr in found)
-        result['adressen'] = list(addresses)
-        
-        # Enhanced manager extraction
-        manager_keywords = [
-            r'locatiemanager', r'locatie\s*manager',
-            r'manager', r'directeur', r'directrice',
-            r'leidinggevende', r'teamleider', r'teamleidster'
-        ]
-        
-        managers = set()
-        lines = text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if 10 < len(line) < 80:  # Reasonable length
-                for keyword in manager_keywords:
-                    if re.search(keyword, line, flags=re.IGNORECASE):
-                        managers.add(line)
-                        break
-        result['managers'] = list(managers)
-        
-    except Exception as e:
-        result['error'] = str(e)
-    return result
 
-# Advanced scraping fallback methods
-def selenium_scrape_fallback(url):
-    """Selenium-gebaseerde scraper voor websites die requests blokkeren"""
-    try:
-        # Check if we can import selenium
+    async def _render(self, url):
+        await self._ensure_browser()
+        slots = self._slots
+        slot = await slots.get()
+        try:
+            if slot is None:
+                slot = await self._new_slot()
+            await slot["page"].goto(url, wait_until="domcontentloaded", timeout=self.page_timeout * 1000)
+            html = await slot["page"].content()
+            slot["uses"] += 1
+            bump_run_stat('playwright_navigations')
+            # Schone lei voor de volgende URL; na max_uses een verse context
+            await slot["context"].clear_cookies()
+            if slot["uses"] >= self.max_uses:
+                await self._close_slot(slot)
+                slot = None
+            return html
+        except BaseException:
+            # Ook bij CancelledError (timeout in render()): de pagina kan nog midden in een goto zitten
+            if slot is not None:
+                closing, slot = slot, None
+                await asyncio.shield(self._close_slot(closing))
+            raise
+        finally:
+            slots.put_nowait(slot)
+
+    def render(self, url):
+        """Sync: haal de gerenderde HTML op (voor fallbacks in worker threads)"""
+        future = asyncio.run_coroutine_threadsafe(self._render(url), self._loop)
+        try:
+            return future.result(timeout=self.page_timeout * 2)
+        except Exception:
+            future.cancel()
+            raise
+
+    async def render_async(self, url):
+        """Async: haal de gerenderde HTML op vanuit een andere event loop (de crawler)"""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._render(url), self._loop))
+
+@st.cache_resource
+def get_playwright_pool():
+    """Eén browser pool per proces, over Streamlit reruns heen"""
+    return PlaywrightPool()
+
+# Herbruikbare Selenium driver pool
+class SeleniumDriverPool:
+    """Begrensde pool van vooraf opgestarte headless Chrome drivers.
+
+    Drivers worden hergebruikt tussen URLs (cookies en storage worden gewist), gecontroleerd
+    met een health check voor gebruik en na SELENIUM_MAX_USES pagina's of een fout vervangen.
+    """
+
+    def __init__(self, size=SELENIUM_POOL_SIZE, max_uses=SELENIUM_MAX_USES, page_timeout=SELENIUM_PAGE_TIMEOUT):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.page_timeout = page_timeout
+        # Eén plek per driver; None betekent "nog (opnieuw) op te starten"
+        self._slots = queue.Queue()
+        for _ in range(self.size):
+            self._slots.put(None)
+
+    def _new_slot(self):
         from selenium import webdriver
         from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
         
         # Chrome options voor headless browsing
         chrome_options = Options()
@@ -1070,18 +1319,109 @@ def selenium_scrape_fallback(url):
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         
-        # Start browser
         driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url)
-        
-        # Wait for page load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        driver.set_page_load_timeout(self.page_timeout)
+        bump_run_stat('selenium_driver_starts')
+        return {"driver": driver, "uses": 0}
+
+    @staticmethod
+    def _quit(slot):
+        try:
+            slot["driver"].quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _healthy(slot):
+        try:
+            return slot["driver"].execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        """Wis cookies en storage zodat de volgende URL met een schone browser begint"""
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        except Exception:
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+
+    def warm_up(self):
+        """Start de drivers alvast op de achtergrond"""
+        def warm():
+            for _ in range(self.size):
+                slot = self._slots.get()
+                if slot is None:
+                    try:
+                        slot = self._new_slot()
+                    except Exception:
+                        slot = None
+                self._slots.put(slot)
+        threading.Thread(target=warm, name="selenium-warm-up", daemon=True).start()
+
+    @contextmanager
+    def driver(self, timeout=60):
+        """Leen een gezonde driver uit de pool"""
+        slot = self._slots.get(timeout=timeout)
+        try:
+            if slot is not None and not self._healthy(slot):
+                self._quit(slot)
+                slot = None
+            if slot is None:
+                slot = self._new_slot()
+            else:
+                bump_run_stat('selenium_driver_reuses')
+            yield slot["driver"]
+            slot["uses"] += 1
+            if slot["uses"] >= self.max_uses:
+                self._quit(slot)
+                slot = None
+            else:
+                self._reset(slot["driver"])
+        except BaseException:
+            # Ook bij een afgebroken with-blok: de driver kan nog midden in een pagina zitten
+            if slot is not None:
+                self._quit(slot)
+                slot = None
+            raise
+        finally:
+            self._slots.put(slot)
+
+@st.cache_resource
+def get_selenium_pool():
+    """Eén driver pool per proces, over Streamlit reruns heen"""
+    pool = SeleniumDriverPool()
+    pool.warm_up()
+    return pool
+
+# Advanced scraping fallback methods
+def selenium_scrape_fallback(url):
+    """Selenium-gebaseerde scraper voor websites die requests blokkeren (drivers uit de pool)"""
+    try:
+        # Check if we can import selenium
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
         
-        # Get page source
-        html_content = driver.page_source
-        driver.quit()
+        check_fallback_cancelled()
+        with get_selenium_pool().driver() as driver:
+            DOMAIN_SCHEDULER.acquire_sync(url)
+            check_fallback_cancelled()
+            driver.get(url)
+            
+            # Wait for page load
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+            
+            # Get page source
+            html_content = driver.page_source
         
         # Extract content
         structured_text = extract_main_content(html_content)
@@ -1112,7 +1452,7 @@ def proxy_scrape_fallback(url):
     
     for i, proxy in enumerate(proxies):
         try:
-            response = requests.get(url, proxies=proxy, headers=headers, timeout=15)
+            response = polite_get(url, proxies=proxy, headers=headers, timeout=15)
             if response.status_code == 200:
                 content = extract_main_content(response.text)
                 return {"success": True, "content": content, "method": f"proxy_{i+1}"}
@@ -1135,6 +1475,8 @@ def scrapeowl_api_fallback(url):
             'wait_for': 2000,
         }
         
+        DOMAIN_SCHEDULER.acquire_sync(api_url)
+        check_fallback_cancelled()  # betaalde call: niet meer doen als de race al gewonnen is
         response = requests.post(api_url, data=payload, timeout=30)
         if response.status_code == 200:
             content = extract_main_content(response.text)
@@ -1150,7 +1492,7 @@ def wayback_machine_fallback(url):
     try:
         # Wayback Machine API
         wayback_url = f"http://archive.org/wayback/available?url={url}"
-        response = requests.get(wayback_url, timeout=10)
+        response = polite_get(wayback_url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -1158,7 +1500,7 @@ def wayback_machine_fallback(url):
                 archived_url = data['archived_snapshots']['closest']['url']
                 
                 # Haal gearchiveerde versie op
-                archived_response = requests.get(archived_url, timeout=15)
+                archived_response = polite_get(archived_url, timeout=15)
                 if archived_response.status_code == 200:
                     content = extract_main_content(archived_response.text)
                     return {"success": True, "content": content, "method": "wayback", "archived_url": archived_url}
@@ -1182,6 +1524,8 @@ def curl_subprocess_fallback(url):
             url
         ]
         
+        DOMAIN_SCHEDULER.acquire_sync(url)
+        check_fallback_cancelled()
         result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=20)
         
         if result.returncode == 0 and result.stdout:
@@ -1194,42 +1538,16 @@ def curl_subprocess_fallback(url):
         return {"success": False, "error": str(e), "method": "curl"}
 
 def playwright_scrape_fallback(url):
-    """Playwright browser automation (alternatief voor Selenium)"""
+    """Playwright browser automation (alternatief voor Selenium) via de warme browser pool"""
     try:
-        import subprocess
-        import tempfile
-        import os
-        
-        # Gebruik playwright via subprocess als het niet direct beschikbaar is
-        playwright_code = f'''
-import asyncio
-from playwright.async_api import async_playwright
-
-async def scrape_page():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto("{url}")
-        content = await page.content()
-        await browser.close()
-        return content
-
-print(asyncio.run(scrape_page()))
-'''
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(playwright_code)
-            temp_file = f.name
-        
-        try:
-            result = subprocess.run(['python', temp_file], capture_output=True, text=True, timeout=30)
-            if result.returncode == 0 and result.stdout:
-                content = extract_main_content(result.stdout)
-                return {"success": True, "content": content, "method": "playwright"}
-            else:
-                return {"success": False, "error": "Playwright execution failed", "method": "playwright"}
-        finally:
-            os.unlink(temp_file)
+        DOMAIN_SCHEDULER.acquire_sync(url)
+        check_fallback_cancelled()
+        html = get_playwright_pool().render(url)
+        if html:
+            content = extract_main_content(html)
+            return {"success": True, "content": content, "method": "playwright"}
+        else:
+            return {"success": False, "error": "Playwright execution failed", "method": "playwright"}
             
     except ImportError:
         return {"success": False, "error": "Playwright not installed", "method": "playwright"}
@@ -1248,6 +1566,8 @@ def httpx_scrape_fallback(url):
         }
         
         with httpx.Client(http2=True, timeout=15, headers=headers) as client:
+            DOMAIN_SCHEDULER.acquire_sync(url)
+            check_fallback_cancelled()
             response = client.get(url)
             if response.status_code == 200:
                 content = extract_main_content(response.text)
@@ -1269,7 +1589,7 @@ def google_cache_scrape_fallback(url):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(cache_url, headers=headers, timeout=15)
+        response = polite_get(cache_url, headers=headers, timeout=15)
         if response.status_code == 200:
             content = extract_main_content(response.text)
             return {"success": True, "content": content, "method": "google_cache"}
@@ -1289,7 +1609,7 @@ def archive_today_scrape_fallback(url):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(search_url, headers=headers, timeout=15, allow_redirects=True)
+        response = polite_get(search_url, headers=headers, timeout=15, allow_redirects=True)
         if response.status_code == 200:
             content = extract_main_content(response.text)
             return {"success": True, "content": content, "method": "archive_today"}
@@ -1312,7 +1632,7 @@ def scraperapi_scrape_fallback(url):
             'country_code': 'nl'
         }
         
-        response = requests.get(api_url, params=params, timeout=30)
+        response = polite_get(api_url, params=params, timeout=30)
         if response.status_code == 200:
             content = extract_main_content(response.text)
             return {"success": True, "content": content, "method": "scraperapi"}
@@ -1339,7 +1659,7 @@ def mobile_user_agent_scrape_fallback(url):
                 'Accept-Encoding': 'gzip, deflate',
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = polite_get(url, headers=headers, timeout=15)
             if response.status_code == 200:
                 content = extract_main_content(response.text)
                 return {"success": True, "content": content, "method": f"mobile_agent_{i+1}"}
@@ -1362,7 +1682,7 @@ def tor_proxy_scrape_fallback(url):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0'
         }
         
-        response = requests.get(url, proxies=tor_proxies, headers=headers, timeout=20)
+        response = polite_get(url, proxies=tor_proxies, headers=headers, timeout=20)
         if response.status_code == 200:
             content = extract_main_content(response.text)
             return {"success": True, "content": content, "method": "tor_proxy"}
@@ -1385,7 +1705,7 @@ def different_dns_scrape_fallback(url):
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = polite_get(url, headers=headers, timeout=15)
             if response.status_code == 200:
                 content = extract_main_content(response.text)
                 return {"success": True, "content": content, "method": f"dns_{dns}"}
@@ -1443,17 +1763,14 @@ def save_html_for_ai_analysis(url, html_content, method_used="unknown"):
             "filepath": None
         }
 
-def ai_extract_contact_data(html_content, url="unknown", use_openai=True, model="gpt-3.5-turbo"):
-    """Gebruik AI om contactgegevens uit HTML te extraheren"""
-    
-    # Clean de HTML voor AI processing
-    structured_text = extract_main_content(html_content)
-    
-    # Limiteer de tekst tot ~3000 tekens om binnen API limieten te blijven
-    if len(structured_text) > 3000:
-        structured_text = structured_text[:3000] + "..."
-    
-    system_prompt = """Je bent een expert in het extraheren van contactgegevens van kinderopvang websites. 
+AI_CACHE = AiResultCache(os.path.join(SCRAPE_CACHE_DIR, "ai_cache.sqlite"), AI_CACHE_TTL, AI_CACHE_MAX_MB * 1024 * 1024,
+                         AI_PROMPT_VERSION)
+
+def ai_cost_usd(model, prompt_tokens, completion_tokens):
+    input_price, output_price = AI_MODEL_PRICES.get(model, AI_MODEL_PRICES["gpt-3.5-turbo"])
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1000
+
+AI_SYSTEM_PROMPT = """Je bent een expert in het extraheren van contactgegevens van kinderopvang websites. 
 Analyseer de gegeven tekst en extraher ALLEEN de volgende informatie:
 
 BELANGRIJK: Geef ALLEEN echte, concrete gegevens terug. Geen placeholders of voorbeelden.
@@ -1479,6 +1796,16 @@ Retourneer het resultaat in dit EXACTE JSON formaat:
 
 Als je geen informatie vindt, gebruik lege arrays []. Confidence is een getal tussen 0-1."""
 
+def build_ai_prompt(html_content, url="unknown"):
+    """Opgeschoonde tekst en user prompt voor AI extractie"""
+    # Clean de HTML voor AI processing (al geëxtraheerde tekst wordt niet opnieuw geparsed);
+    # de extractie stopt zodra er genoeg tekst voor de prompt is
+    structured_text = page_text(html_content, max_chars=3001)
+    
+    # Limiteer de tekst tot ~3000 tekens om binnen API limieten te blijven
+    if len(structured_text) > 3000:
+        structured_text = structured_text[:3000] + "..."
+    
     user_prompt = f"""
 Website URL: {url}
 
@@ -1486,6 +1813,66 @@ Tekst om te analyseren:
 {structured_text}
 
 Extraher alle contactgegevens volgens de instructies."""
+    return structured_text, user_prompt
+
+def ai_cached_result(cache_key, model, structured_text):
+    """Resultaat uit AI_CACHE (met bespaarde tokens en kosten in de run samenvatting), of None"""
+    cached = AI_CACHE.get(cache_key)
+    if not cached:
+        return None
+    tokens = cached["prompt_tokens"] + cached["completion_tokens"]
+    cost = ai_cost_usd(model, cached["prompt_tokens"], cached["completion_tokens"])
+    bump_run_stat('ai_cache_hits')
+    bump_run_stat('ai_tokens_saved', tokens)
+    bump_run_stat('ai_cost_saved_usd', cost)
+    return {
+        "success": True,
+        "extracted_data": cached["result"],
+        "method": "openai_cache",
+        "text_length": len(structured_text),
+        "cached": True,
+        "tokens_saved": tokens,
+        "cost_saved_usd": cost
+    }
+
+def ai_completion_result(cache_key, model, structured_text, ai_response, prompt_tokens, completion_tokens):
+    """Tokens boeken, het JSON antwoord parsen en een geslaagd resultaat in AI_CACHE zetten"""
+    cost = ai_cost_usd(model, prompt_tokens, completion_tokens)
+    bump_run_stat('ai_calls')
+    bump_run_stat('ai_tokens_used', prompt_tokens + completion_tokens)
+    bump_run_stat('ai_cost_usd', cost)
+    usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "cost_usd": cost}
+    
+    # Parse JSON response
+    try:
+        extracted_data = json.loads(ai_response)
+    except json.JSONDecodeError as e:
+        return {
+            "success": False,
+            "error": f"JSON parse error: {str(e)}",
+            "raw_response": ai_response,
+            "extracted_data": None,
+            "usage": usage
+        }
+    AI_CACHE.store(cache_key, model, extracted_data, prompt_tokens, completion_tokens)
+    return {
+        "success": True,
+        "extracted_data": extracted_data,
+        "raw_response": ai_response,
+        "method": "openai_gpt3.5",
+        "text_length": len(structured_text),
+        "usage": usage
+    }
+
+def ai_extract_contact_data(html_content, url="unknown", use_openai=True, model="gpt-3.5-turbo"):
+    """Gebruik AI om contactgegevens uit HTML te extraheren"""
+    structured_text, user_prompt = build_ai_prompt(html_content, url)
+    
+    # Dezelfde tekst al eerder geanalyseerd (andere fallback methode, eerdere test of run): geen tokens
+    cache_key = AI_CACHE.key(structured_text, model, AI_SYSTEM_PROMPT)
+    cached = ai_cached_result(cache_key, model, structured_text) if use_openai else None
+    if cached:
+        return cached
 
     try:
         if use_openai:
@@ -1500,38 +1887,22 @@ Extraher alle contactgegevens volgens de instructies."""
                 }
             
             openai.api_key = openai_api_key
+            openai.api_base = OPENAI_API_BASE
             
             response = openai.ChatCompletion.create(
                 model=model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": AI_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.1,
-                max_tokens=1000
+                max_tokens=AI_MAX_TOKENS
             )
             
             ai_response = response.choices[0].message.content.strip()
-            
-            # Parse JSON response
-            try:
-                extracted_data = json.loads(ai_response)
-                
-                return {
-                    "success": True,
-                    "extracted_data": extracted_data,
-                    "raw_response": ai_response,
-                    "method": "openai_gpt3.5",
-                    "text_length": len(structured_text)
-                }
-                
-            except json.JSONDecodeError as e:
-                return {
-                    "success": False,
-                    "error": f"JSON parse error: {str(e)}",
-                    "raw_response": ai_response,
-                    "extracted_data": None
-                }
+            usage = response.get("usage") or {}
+            return ai_completion_result(cache_key, model, structured_text, ai_response,
+                                        usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
         
         else:
             # Fallback: gebruik regel-gebaseerde extractie
@@ -1548,84 +1919,287 @@ Extraher alle contactgegevens volgens de instructies."""
             "extracted_data": None
         }
 
-def try_all_fallback_methods(url, combine_results=True):
-    """Probeer alle beschikbare methoden en combineer de resultaten"""
-    methods = [
-        ("🤖 Selenium Browser", selenium_scrape_fallback),
-        ("🎭 Playwright Browser", playwright_scrape_fallback),
-        ("📚 Wayback Machine", wayback_machine_fallback),
-        ("📂 Archive.today", archive_today_scrape_fallback),
-        ("🔍 Google Cache", google_cache_scrape_fallback),
-        ("🔧 Curl Subprocess", curl_subprocess_fallback),
-        ("🌐 Proxy Rotation", proxy_scrape_fallback),
-        ("📱 Mobile User Agents", mobile_user_agent_scrape_fallback),
-        ("🚀 HTTP/2 (HTTPX)", httpx_scrape_fallback),
-        ("🧅 TOR Network", tor_proxy_scrape_fallback),
-        ("🌍 DNS Rotation", different_dns_scrape_fallback),
-        ("🛠️ ScrapeOwl API", scrapeowl_api_fallback),
-        ("⚡ ScraperAPI", scraperapi_scrape_fallback)
-    ]
+# Async AI extractie stage met rate limits uit de response headers (ai_client)
+async def ai_extract_contact_data_async(html_content, url="unknown", model="gpt-3.5-turbo", session=None, limiter=None):
+    """Async variant van ai_extract_contact_data via de chat completions API op OPENAI_API_BASE,
+    met rate limiting, retries met backoff en tokenboekhouding per call"""
+    structured_text, user_prompt = build_ai_prompt(html_content, url)
+    cache_key = AI_CACHE.key(structured_text, model, AI_SYSTEM_PROMPT)
+    cached = ai_cached_result(cache_key, model, structured_text)
+    if cached:
+        return cached
+    
+    openai_api_key = st.secrets.get("OPENAI_API_KEY", "")
+    if not openai_api_key:
+        return {"success": False, "error": "OpenAI API key niet gevonden in secrets", "extracted_data": None}
+    
+    limiter = limiter or AiRateLimiter(AI_CONCURRENCY)
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": AI_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": 0.1,
+        "max_tokens": AI_MAX_TOKENS
+    }
+    tokens = limiter.estimate_tokens(AI_SYSTEM_PROMPT + user_prompt, AI_MAX_TOKENS)
+    
+    async with use_scrape_session(session) as session:
+        data, error = await chat_completion(session, OPENAI_API_BASE, openai_api_key, payload, limiter, tokens,
+                                            AI_MAX_ATTEMPTS, AI_REQUEST_TIMEOUT)
+    if data is not None:
+        try:
+            usage = data.get("usage") or {}
+            ai_response = data["choices"][0]["message"]["content"].strip()
+            return ai_completion_result(cache_key, model, structured_text, ai_response,
+                                        usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+        except (AttributeError, KeyError, IndexError, TypeError) as e:
+            error = f"AI extraction failed: unexpected response ({str(e)})"
     
+    bump_run_stat('ai_failures')
+    return {"success": False, "error": error, "extracted_data": None}
+
+async def ai_extract_contents_async(contents, url="unknown", model="gpt-3.5-turbo", concurrency=AI_CONCURRENCY):
+    """AI extractie voor een lijst (methode, content) paren tegelijk, begrensd door AI_CONCURRENCY
+    en de rate limits. Identieke content wordt één keer geanalyseerd. Resultaten in invoervolgorde."""
+    limiter = AiRateLimiter(concurrency)
+    async with aiohttp.ClientSession() as session:
+        return await extract_unique(contents, lambda content: ai_extract_contact_data_async(content, url, model, session, limiter))
+
+# Alle fallback methoden, in de volgorde van de "combineer alles" modus
+FALLBACK_METHODS = [
+    ("🤖 Selenium Browser", selenium_scrape_fallback),
+    ("🎭 Playwright Browser", playwright_scrape_fallback),
+    ("📚 Wayback Machine", wayback_machine_fallback),
+    ("📂 Archive.today", archive_today_scrape_fallback),
+    ("🔍 Google Cache", google_cache_scrape_fallback),
+    ("🔧 Curl Subprocess", curl_subprocess_fallback),
+    ("🌐 Proxy Rotation", proxy_scrape_fallback),
+    ("📱 Mobile User Agents", mobile_user_agent_scrape_fallback),
+    ("🚀 HTTP/2 (HTTPX)", httpx_scrape_fallback),
+    ("🧅 TOR Network", tor_proxy_scrape_fallback),
+    ("🌍 DNS Rotation", different_dns_scrape_fallback),
+    ("🛠️ ScrapeOwl API", scrapeowl_api_fallback),
+    ("⚡ ScraperAPI", scraperapi_scrape_fallback)
+]
+
+# Race modus: snelle/goedkope methoden eerst, zware browsers en betaalde API's in latere tiers
+FALLBACK_TIERS = [
+    ["📱 Mobile User Agents", "🚀 HTTP/2 (HTTPX)", "🔧 Curl Subprocess", "🌍 DNS Rotation"],
+    ["📚 Wayback Machine", "📂 Archive.today", "🔍 Google Cache"],
+    ["🤖 Selenium Browser", "🎭 Playwright Browser"],
+    ["🌐 Proxy Rotation", "🧅 TOR Network", "🛠️ ScrapeOwl API", "⚡ ScraperAPI"]
+]
+FALLBACK_RACE_DEADLINE = float(st.secrets.get("FALLBACK_RACE_DEADLINE", 60))
+FALLBACK_TIER_HEDGE_SECONDS = float(st.secrets.get("FALLBACK_TIER_HEDGE_SECONDS", 8))
+# Kosten per request: pas starten als alle gratis methoden klaar zijn zonder bruikbaar resultaat
+PAID_FALLBACK_METHODS = {"🛠️ ScrapeOwl API", "⚡ ScraperAPI"}
+
+# Adaptieve volgorde: statistieken per domein en methode, met verval zodat de volgorde meebeweegt
+FALLBACK_STATS_HALF_LIFE_DAYS = float(st.secrets.get("FALLBACK_STATS_HALF_LIFE_DAYS", 30))
+FALLBACK_SKIP_AFTER_FAILURES = float(st.secrets.get("FALLBACK_SKIP_AFTER_FAILURES", 3))
+FALLBACK_LATENCY_SAMPLES = 500
+
+FALLBACK_STATS = FallbackStats(os.path.join(SCRAPE_CACHE_DIR, "fallback_stats.sqlite"), FALLBACK_STATS_HALF_LIFE_DAYS,
+                               FALLBACK_SKIP_AFTER_FAILURES, FALLBACK_LATENCY_SAMPLES)
+
+def run_timed_fallback(method_func, url, cancel=None):
+    """Voer een fallback uit en geef (resultaat, duur in seconden) terug.
+
+    Met cancel (threading.Event) stopt de methode bij het volgende check_fallback_cancelled() zodra
+    het event gezet is; het resultaat heeft dan "cancelled": True.
+    """
+    started = time.monotonic()
+    _FALLBACK_CANCEL.event = cancel
+    try:
+        check_fallback_cancelled()
+        result = method_func(url)
+    except FallbackCancelled:
+        bump_run_stat('fallbacks_cancelled')
+        result = {"success": False, "error": "Geannuleerd (race afgelopen)", "cancelled": True}
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+    finally:
+        _FALLBACK_CANCEL.event = None
+    return result, time.monotonic() - started
+
+def plan_fallback_tiers(url):
+    """Race tiers voor dit domein: historisch snelste methode eerst, falende methoden overgeslagen.
+    Betaalde methoden komen samen in een eigen laatste tier (tenzij een ervan de bewezen snelste is)."""
+    all_names = [name for tier in FALLBACK_TIERS for name in tier]
+    proven, skipped = FALLBACK_STATS.plan(url, all_names)
+    first = proven[:1]
+    tiers = [first] if first else []
+    for tier in FALLBACK_TIERS:
+        remaining = [name for name in tier if name not in skipped and name not in first and name not in PAID_FALLBACK_METHODS]
+        if remaining:
+            tiers.append(remaining)
+    paid = [name for name in all_names if name in PAID_FALLBACK_METHODS and name not in skipped and name not in first]
+    if paid:
+        tiers.append(paid)
+    return tiers, skipped
+
+def combine_fallback_contents(all_content, successful_methods, results):
+    """Bouw het gecombineerde resultaat van meerdere succesvolle methoden"""
+    combined_content = "\n\n--- CONTENT VAN MEERDERE METHODEN ---\n\n"
+    for content_data in all_content:
+        combined_content += f"=== {content_data['method']} ===\n"
+        combined_content += content_data['content']
+        combined_content += "\n\n"
+    
+    return {
+        "success": True,
+        "content": combined_content,
+        "method": f"Gecombineerd ({len(successful_methods)} methoden)",
+        "successful_methods": successful_methods,
+        "all_attempts": results,
+        "individual_contents": all_content
+    }
+
+def has_useful_contact_data(content):
+    """Bevat de content minstens een email of telefoonnummer?"""
+    data = extract_and_combine_contact_data([{"method": "check", "content": content}])
+    return bool(data['emails'] or data['telefoons'])
+
+def race_fallback_methods(url, quorum=1, deadline_seconds=FALLBACK_RACE_DEADLINE, hedge_seconds=FALLBACK_TIER_HEDGE_SECONDS):
+    """Start fallback methoden in parallelle tiers en stop zodra `quorum` methoden bruikbare contactdata leveren.
+
+    Een volgende tier start als de vorige helemaal gefaald is of na `hedge_seconds`; de tier met
+    betaalde methoden alleen als er niets meer loopt. Methoden die nog niet klaar zijn als het quorum
+    of de deadline bereikt wordt, krijgen via het cancel event het signaal om te stoppen.
+    """
+    methods = dict(FALLBACK_METHODS)
+    tiers, skipped = plan_fallback_tiers(url)
+    if skipped:
+        st.info(f"⏭️ Overgeslagen (faalt steeds voor dit domein): {', '.join(skipped)}")
+    executor = ThreadPoolExecutor(max_workers=max(1, sum(len(tier) for tier in tiers)))
+    cancel = threading.Event()
+    deadline = time.monotonic() + deadline_seconds
+    pending = {}
     results = []
     all_content = []
     successful_methods = []
+    useful_methods = []
+    tier_index = 0
+    next_tier_at = 0
     
-    for method_name, method_func in methods:
-        try:
-            st.info(f"🔄 Probeer methode: {method_name}")
-            result = method_func(url)
-            results.append({
-                "method": method_name,
-                "result": result
-            })
+    try:
+        while True:
+            now = time.monotonic()
+            # Betaalde tier nooit op de hedge timer
+            can_hedge = tier_index < len(tiers) and not set(tiers[tier_index]) <= PAID_FALLBACK_METHODS
+            if tier_index < len(tiers) and (not pending or (can_hedge and now >= next_tier_at)):
+                tier = tiers[tier_index]
+                st.info(f"🏁 Start tier {tier_index + 1}: {', '.join(tier)}")
+                for method_name in tier:
+                    pending[executor.submit(run_timed_fallback, methods[method_name], url, cancel)] = method_name
+                tier_index += 1
+                next_tier_at = now + hedge_seconds
+                can_hedge = tier_index < len(tiers) and not set(tiers[tier_index]) <= PAID_FALLBACK_METHODS
             
-            if result.get("success"):
-                successful_methods.append(method_name)
-                content = result.get("content", "")
-                if content:
-                    all_content.append({
-                        "method": method_name,
-                        "content": content
-                    })
-                st.success(f"✅ {method_name} succesvol!")
-            else:
-                error_msg = result.get("error", "Unknown error")
-                st.warning(f"❌ {method_name} gefaald: {error_msg}")
+            if not pending:
+                break
+            if now >= deadline:
+                st.warning(f"⏱️ Deadline van {deadline_seconds:.0f}s bereikt")
+                break
+            
+            wake_at = min(deadline, next_tier_at) if can_hedge else deadline
+            done, _ = wait(list(pending), timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                method_name = pending.pop(future)
+                result, latency = future.result()
+                results.append({"method": method_name, "result": result})
+                if result.get("cancelled"):
+                    continue
                 
-        except Exception as e:
-            st.error(f"❌ {method_name} exception: {str(e)}")
-            results.append({
-                "method": method_name, 
-                "result": {"success": False, "error": str(e)}
-            })
+                useful = False
+                if result.get("success") and result.get("content"):
+                    successful_methods.append(method_name)
+                    all_content.append({"method": method_name, "content": result["content"]})
+                    useful = has_useful_contact_data(result["content"])
+                    if useful:
+                        useful_methods.append(method_name)
+                        st.success(f"✅ {method_name} succesvol met contactgegevens!")
+                    else:
+                        st.info(f"ℹ️ {method_name} gaf content zonder contactgegevens")
+                else:
+                    st.warning(f"❌ {method_name} gefaald: {result.get('error', 'Unknown error')}")
+                FALLBACK_STATS.record(url, method_name, useful, latency)
+            
+            if len(useful_methods) >= quorum:
+                break
+    finally:
+        # Nog niet gestarte methoden annuleren; lopende methoden stoppen bij hun volgende check_fallback_cancelled()
+        cancel.set()
+        for future, method_name in pending.items():
+            future.cancel()
+            results.append({"method": method_name, "result": {"success": False, "error": "Geannuleerd (race afgelopen)"}})
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    if not all_content:
+        return {
+            "success": False,
+            "error": "All fallback methods failed",
+            "all_attempts": results
+        }
     
+    # Methoden met echte contactdata gaan voor
+    winners = [c for c in all_content if c["method"] in useful_methods] or all_content
+    if quorum > 1 and len(winners) > 1:
+        return combine_fallback_contents(winners, [c["method"] for c in winners], results)
+    return {
+        "success": True,
+        "content": winners[0]["content"],
+        "method": winners[0]["method"],
+        "all_attempts": results
+    }
+
+def try_all_fallback_methods(url, combine_results=True):
+    """Probeer alle beschikbare methoden en combineer de resultaten.
+
+    Met combine_results=False wordt de race modus gebruikt: het eerste bruikbare resultaat wint.
+    """
     if not combine_results:
-        # Oude gedrag - return eerste succesvolle
-        for result_data in results:
-            if result_data["result"].get("success"):
-                return {
-                    "success": True,
-                    "content": result_data["result"].get("content", ""),
-                    "method": result_data["method"],
-                    "all_attempts": results
-                }
+        return race_fallback_methods(url)
+    
+    results = []
+    all_content = []
+    successful_methods = []
+    
+    # Historisch snelste succesvolle methoden eerst; methoden die blijven falen overslaan
+    methods = dict(FALLBACK_METHODS)
+    proven, skipped = FALLBACK_STATS.plan(url, list(methods))
+    ordered = proven + [name for name in methods if name not in proven and name not in skipped]
+    if skipped:
+        st.info(f"⏭️ Overgeslagen (faalt steeds voor dit domein): {', '.join(skipped)}")
+    
+    for method_name in ordered:
+        st.info(f"🔄 Probeer methode: {method_name}")
+        result, latency = run_timed_fallback(methods[method_name], url)
+        results.append({
+            "method": method_name,
+            "result": result
+        })
+        
+        if result.get("success"):
+            successful_methods.append(method_name)
+            content = result.get("content", "")
+            if content:
+                all_content.append({
+                    "method": method_name,
+                    "content": content
+                })
+            st.success(f"✅ {method_name} succesvol!")
+        else:
+            error_msg = result.get("error", "Unknown error")
+            st.warning(f"❌ {method_name} gefaald: {error_msg}")
+        FALLBACK_STATS.record(url, method_name, bool(result.get("content")) and has_useful_contact_data(result["content"]), latency)
     
     if all_content:
         # Combineer alle content
-        combined_content = "\n\n--- CONTENT VAN MEERDERE METHODEN ---\n\n"
-        for content_data in all_content:
-            combined_content += f"=== {content_data['method']} ===\n"
-            combined_content += content_data['content']
-            combined_content += "\n\n"
-        
-        return {
-            "success": True,
-            "content": combined_content,
-            "method": f"Gecombineerd ({len(successful_methods)} methoden)",
-            "successful_methods": successful_methods,
-            "all_attempts": results,
-            "individual_contents": all_content
-        }
+        return combine_fallback_contents(all_content, successful_methods, results)
     
     # Alle methoden gefaald
     return {
@@ -1656,78 +2230,11 @@ def extract_and_combine_contact_data(content_list):
             'managers': []
         }
         
-        # Extract emails
-        email_patterns = [
-            r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}",
-            r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        ]
-        
-        for pattern in email_patterns:
-            emails = re.findall(pattern, content)
-            for email in emails:
-                email = email.lower().strip()
-                if not any(skip in email for skip in ['example', 'test', 'noreply', 'no-reply']):
-                    combined_data['emails'].add(email)
-                    combined_data['sources'][method]['emails'].append(email)
-        
-        # Extract phone numbers
-        try:
-            for match in phonenumbers.PhoneNumberMatcher(content, "NL"):
-                formatted = phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-                combined_data['telefoons'].add(formatted)
-                combined_data['sources'][method]['telefoons'].append(formatted)
-                
-            # Backup regex for phones
-            phone_patterns = [
-                r'(?:\+31|0031|0)[\s\-]?6[\s\-]?[\d\s\-]{8}',  # Dutch mobile
-                r'(?:\+31|0031|0)[\s\-]?[1-9][\d\s\-]{8}',     # Dutch landline
-                r'\b\d{2,3}[\s\-]?\d{6,7}\b'
-            ]
-            
-            for pattern in phone_patterns:
-                phones = re.findall(pattern, content)
-                for phone in phones:
-                    cleaned = re.sub(r'[^\d\+]', '', phone)
-                    if len(cleaned) >= 9:
-                        phone = phone.strip()
-                        combined_data['telefoons'].add(phone)
-                        combined_data['sources'][method]['telefoons'].append(phone)
-                        
-        except Exception:
-            pass
-        
-        # Extract addresses  
-        addr_patterns = [
-            r'\b[A-Z][a-z]+(?:straat|laan|weg|plein|dreef|park|boulevard)\s*\d+[a-z]?\b',
-            r'\b\d{4}\s?[A-Z]{2}\s+[A-Z][a-z]+',
-            r'\b\d{4}\s?[A-Z]{2}\b'
-        ]
-        
-        for pattern in addr_patterns:
-            addresses = re.findall(pattern, content)
-            for addr in addresses:
-                addr = addr.strip()
-                combined_data['adressen'].add(addr)
-                combined_data['sources'][method]['adressen'].append(addr)
-        
-        # Extract managers
-        manager_keywords = [
-            r'locatiemanager', r'locatie\s*manager',
-            r'manager', r'directeur', r'directrice',
-            r'leidinggevende', r'teamleider', r'teamleidster',
-            r'hoofd\s*vestiging', r'vestigingsmanager',
-            r'pedagogisch\s*medewerker', r'pm\b'
-        ]
-        
-        lines = content.split('\n')
-        for line in lines:
-            line = line.strip()
-            if 10 < len(line) < 100:
-                for keyword in manager_keywords:
-                    if re.search(keyword, line, flags=re.IGNORECASE):
-                        combined_data['managers'].add(line)
-                        combined_data['sources'][method]['managers'].append(line)
-                        break
+        found = extract_contact_data(content)
+        found['emails'] += list(deobfuscate_emails(content, content))
+        for key in ('emails', 'telefoons', 'adressen', 'managers'):
+            combined_data[key].update(found[key])
+            combined_data['sources'][method][key].extend(found[key])
     
     # Convert sets to lists
     return {
@@ -1738,6 +2245,336 @@ def extract_and_combine_contact_data(content_list):
         'sources': combined_data['sources']
     }
 
+# Keten modus: sitemap index per domein
+ROBOTS_SITEMAP_RE = re.compile(r'^\s*sitemap:\s*(\S+)', re.I | re.M)
+SITEMAP_LOC_RE = re.compile(r'<loc>\s*(?:<!\[CDATA\[)?\s*(.*?)\s*(?:\]\]>)?\s*</loc>', re.I | re.S)
+DEFAULT_SITEMAP_PATHS = ('/sitemap.xml', '/sitemap_index.xml')
+
+async def fetch_text_resource(session, url, max_bytes=CHAIN_SITEMAP_MAX_BYTES):
+    """robots.txt of sitemap (ook .xml.gz) als tekst ophalen, via de domein scheduler; None bij een fout"""
+    if is_host_unreachable(url):
+        return None
+    await DOMAIN_SCHEDULER.acquire(url)
+    body = bytearray()
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30, connect=10), ssl=False,
+                               allow_redirects=True) as response:
+            if response.status in (429, 503):
+                DOMAIN_SCHEDULER.penalize(url, parse_retry_after(response.headers.get('Retry-After')))
+            if response.status != 200:
+                return None
+            async for chunk in response.content.iter_chunked(FETCH_CHUNK_SIZE):
+                body += chunk
+                if len(body) >= max_bytes:
+                    break
+    except Exception:
+        return None
+    bump_run_stat('chain_sitemap_fetches')
+    data = bytes(body[:max_bytes])
+    if data[:2] == b'\x1f\x8b':
+        try:
+            data = zlib.decompressobj(zlib.MAX_WBITS | 16).decompress(data, max_bytes)
+        except zlib.error:
+            return None
+    return data.decode('utf-8', errors='replace')
+
+class ChainIndex:
+    """Index van locatiepagina's per domein, opgebouwd uit robots.txt en de sitemap(s).
+
+    Voor ketens met veel locaties op één domein kost een rij dan één sitemap walk (gedeeld
+    en met CHAIN_INDEX_TTL gecached) plus één fetch van de eigen locatiepagina, in plaats
+    van een volledige crawl per rij. Een domein wordt pas geïndexeerd als er in deze run
+    CHAIN_MIN_ROWS rijen naar verwijzen, of als er al een verse index op schijf staat.
+    Domeinen met te weinig locatiepagina's krijgen een lege index (geen keten), maar alleen
+    als er echt een sitemap gelezen is: bij een timeout of 5xx wordt niets opgeslagen.
+    """
+
+    def __init__(self, ttl=CHAIN_INDEX_TTL, min_rows=CHAIN_MIN_ROWS):
+        self.ttl = ttl
+        self.min_rows = min_rows
+        self._conn = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._rows = {}
+        self._in_flight = {}
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = open_cache_db("chain_index.sqlite", """CREATE TABLE IF NOT EXISTS chain_index (
+                domain TEXT PRIMARY KEY, entries TEXT, built_at REAL)""")
+        return self._conn
+
+    @staticmethod
+    def domain(site):
+        return (urlparse(site).hostname or '').lower().removeprefix('www.')
+
+    def lookup(self, domain):
+        """Verse index (lijst van {"url", "tokens"}) voor een domein, of None"""
+        try:
+            with self._lock:
+                row = self._db().execute("SELECT entries, built_at FROM chain_index WHERE domain = ?", (domain,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or time.time() - row[1] >= self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def _save(self, domain, entries):
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO chain_index VALUES (?, ?, ?)", (domain, json.dumps(entries), time.time()))
+                db.commit()
+        except sqlite3.Error:
+            pass
+
+    def count_rows(self, sites):
+        """Tel per domein de rijen van de invoer, vóórdat er iets gescraped wordt"""
+        self._rows = {}
+        for site in sites:
+            domain = self.domain(site) if site else ''
+            if domain:
+                self._rows[domain] = self._rows.get(domain, 0) + 1
+
+    async def index(self, site, session):
+        """Locatiepagina's van het domein van site; [] als het geen keten is of (nog) niet geïndexeerd wordt"""
+        domain = self.domain(site)
+        if not domain:
+            return []
+        entries = self.lookup(domain)
+        if entries is not None:
+            bump_run_stat('chain_index_cache_hits')
+            return entries
+        if self._rows.get(domain, 0) < self.min_rows:
+            return []
+        # Alle rijen van de keten wachten op dezelfde sitemap walk
+        if domain not in self._in_flight:
+            self._in_flight[domain] = asyncio.ensure_future(self._build(site, domain, session))
+        return await asyncio.shield(self._in_flight[domain])
+
+    async def _build(self, site, domain, session):
+        parsed = urlparse(site)
+        base = f"{parsed.scheme or 'https'}://{parsed.netloc}"
+        robots = await fetch_text_resource(session, f"{base}/robots.txt")
+        sitemaps = [urljoin(base, url) for url in ROBOTS_SITEMAP_RE.findall(robots or '')]
+        entries, files = {}, 0
+        for candidates in [sitemaps] if sitemaps else [[base + path] for path in DEFAULT_SITEMAP_PATHS]:
+            files = await self._walk_sitemaps(candidates, session, entries)
+            if files:
+                break
+        bump_run_stat('chain_index_builds')
+        if not files:
+            # Geen enkele sitemap gelezen (timeout, 5xx, geblokkeerd): geen oordeel, niet cachen
+            bump_run_stat('chain_index_unreadable')
+            return []
+        if len(entries) < CHAIN_MIN_LOCATION_PAGES:
+            entries = {}
+        entries = [{"url": url, "tokens": tokens} for url, tokens in entries.values()]
+        self._save(domain, entries)
+        return entries
+
+    async def _walk_sitemaps(self, pending, session, entries):
+        """Lees sitemaps (en sitemap indexen) en voeg locatiepagina's toe aan entries; geeft het aantal gelezen bestanden"""
+        pending, seen, files = list(pending), set(), 0
+        while pending and len(seen) < CHAIN_SITEMAP_MAX_FILES:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+            text = await fetch_text_resource(session, sitemap_url)
+            if not text or '<loc' not in text.lower():
+                continue
+            files += 1
+            locs = [loc.replace('&amp;', '&') for loc in SITEMAP_LOC_RE.findall(text)]
+            if '<sitemapindex' in text.lower():
+                # Sub-sitemaps met locaties in de naam eerst, het aantal bestanden is begrensd
+                pending.extend(sorted(locs, key=lambda url: not any(word in url.lower() for word in ('locati', 'vestiging'))))
+                continue
+            for loc in locs:
+                tokens = location_slug_tokens(loc)
+                if tokens:
+                    entries.setdefault(normalize_url(loc), (loc, tokens))
+        return files
+
+CHAIN_INDEX = ChainIndex()
+
+async def scrape_chain_location(site, naam, plaats, session, completion_targets=None):
+    """Scrape een locatie via de keten index; None als het domein geen keten is of de rij niet te matchen is"""
+    entries = await CHAIN_INDEX.index(site, session)
+    if not entries:
+        return None
+    page = match_location_page(entries, naam, plaats)
+    if not page:
+        bump_run_stat('chain_unmatched')
+        return None
+    data = await scrape_deep(page, max_depth=CHAIN_PAGE_DEPTH, session=session, completion_targets=completion_targets,
+                             locatienaam=naam, plaats=plaats)
+    if data.get('error') or not (data.get('emails') or data.get('telefoons')):
+        bump_run_stat('chain_page_empty')
+        return None  # Locatiepagina zonder contactgegevens: gewone crawl vanaf de site
+    bump_run_stat('chain_matches')
+    return page, data
+
+# Bulk scraping engine
+def completion_reached(data):
+    """Completion policy gehaald (of structured data met hoge betrouwbaarheid): geen fallback nodig"""
+    return data.get('confidence') == "high" or bool(data.get('complete'))
+
+def needs_requests_fallback(data):
+    """Bepaal of het async resultaat zo slecht is dat de requests-scraper geprobeerd moet worden"""
+    if completion_reached(data):
+        return False
+    return (data.get('error') or
+            (not data.get('emails') and not data.get('telefoons') and not data.get('adressen')) or
+            any('HTTP_ERROR_403' in str(debug) for debug in data.get('debug_info', [])))
+
+async def find_location_site(naam, plaats, session, global_limit):
+    """Website van één locatie; website zoeken telt mee voor de globale limiet"""
+    async with global_limit:
+        # SerpAPI eerst (async, met persistente resolver cache), daarna fallback
+        site = await zoek_website_bij_naam(naam, plaats, session)
+        if not site:
+            site = await backup_search(naam, plaats, session)
+    return site
+
+async def scrape_location(naam, plaats, session, global_limit, host_limits, per_host_limit, completion_targets=None,
+                          chain_mode=CHAIN_MODE, site=None):
+    """Scrape de contactgegevens van één locatie (bij ketens via de sitemap index).
+
+    Zonder site wordt de website eerst gezocht; in keten modus zoekt scrape_locations_bulk alle
+    websites vooraf zodat de rijen per domein al geteld zijn.
+    """
+    bump_run_stat('locations')
+    if site is None:
+        site = await find_location_site(naam, plaats, session, global_limit)
+
+    if not site:
+        return site, {'error': 'Geen website gevonden'}
+
+    # Per host begrenzen zodat ketens met veel locaties op één domein niet overbelast raken.
+    # De host-limiet wordt vóór de globale limiet genomen, zodat wachtende locaties geen globale plek bezet houden.
+    host = urlparse(site).netloc.lower()
+    if host not in host_limits:
+        host_limits[host] = asyncio.Semaphore(per_host_limit)
+
+    async with host_limits[host]:
+        async with global_limit:
+            # Keten: direct de eigen locatiepagina uit de sitemap index
+            if chain_mode:
+                chain_result = await scrape_chain_location(site, naam, plaats, session, completion_targets)
+                if chain_result:
+                    return chain_result
+
+            # First try the advanced async scraper
+            data = await scrape_deep(site, session=session, completion_targets=completion_targets,
+                                     locatienaam=naam, plaats=plaats)
+            if data.get('error') == "Website is not reachable":
+                # Onbruikbaar zoekresultaat? Alleen bij NXDOMAIN direct, anders pas na meerdere runs op rij
+                WEBSITE_RESOLVER.mark_unreachable(naam, plaats, site, definitive=await host_does_not_exist(site))
+            elif not data.get('error'):
+                WEBSITE_RESOLVER.mark_reachable(naam, plaats, site)
+
+            # If that fails due to bot blocking, fallback to requests-based scraper
+            # (niet als de host onbereikbaar is gebleken, dan faalt requests ook)
+            if needs_requests_fallback(data) and not is_host_unreachable(site):
+                fallback_data = await asyncio.to_thread(scrape_contactgegevens, site)
+
+                # If fallback found data, use it
+                if not fallback_data.get('error') and (fallback_data.get('emails') or fallback_data.get('telefoons')):
+                    data = dict(fallback_data)
+                    data['debug_info'] = ["Gebruikt fallback scraper (requests) na async failure"]
+                else:
+                    # Keep original async result but note the fallback attempt
+                    data['debug_info'] = data.get('debug_info', []) + [f"Fallback scraper ook gefaald: {fallback_data.get('error', 'geen data gevonden')}"]
+
+    return site, data
+
+async def scrape_locations_bulk(rows, concurrency=BULK_CONCURRENCY, per_host_limit=BULK_PER_HOST_LIMIT, completion_targets=None,
+                                chain_mode=CHAIN_MODE, on_site_found=None):
+    """Scrape een lijst (locatienaam, plaats) met begrensde gelijktijdigheid.
+
+    Yieldt (index, naam, plaats, site, data) zodra een locatie klaar is; de index verwijst
+    naar de positie in de invoer zodat de aanroeper de volgorde kan herstellen. In keten modus
+    worden eerst alle websites gezocht; on_site_found(gezocht, totaal) meldt de voortgang daarvan.
+    """
+    global_limit = asyncio.Semaphore(max(1, int(concurrency)))
+    host_limits = {}
+    per_host_limit = max(1, int(per_host_limit))
+
+    # Eén sessie voor de hele run: keep-alive verbindingen en DNS cache worden hergebruikt
+    async with create_scrape_session() as session:
+        sites = {}
+        if chain_mode:
+            # Keten modus: eerst alle websites zoeken en de rijen per domein tellen, anders beslist
+            # de eerste rij van een keten al over indexeren voordat de rest van de keten bekend is
+            searched = 0
+
+            async def find_one(naam, plaats):
+                nonlocal searched
+                try:
+                    return await find_location_site(naam, plaats, session, global_limit)
+                except Exception:
+                    return None
+                finally:
+                    searched += 1
+                    if on_site_found:
+                        on_site_found(searched, len(rows))
+
+            found = await asyncio.gather(*(find_one(naam, plaats) for naam, plaats in rows))
+            sites = {index: site or '' for index, site in enumerate(found)}
+            CHAIN_INDEX.count_rows(found)
+
+        async def run_one(index, naam, plaats):
+            try:
+                site, data = await scrape_location(naam, plaats, session, global_limit, host_limits, per_host_limit,
+                                                   completion_targets, chain_mode, sites.get(index))
+            except Exception as e:
+                site, data = None, {'error': f"Onverwachte fout: {str(e)}"}
+            return index, naam, plaats, site, data
+
+        tasks = [asyncio.create_task(run_one(index, naam, plaats)) for index, (naam, plaats) in enumerate(rows)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # Als de aanroeper stopt, geen verweesde taken achterlaten
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            HTTP_CACHE.flush()  # laatste gebundelde cache hits van deze run
+
+# Run samenvatting (connection reuse, cache hits, AI gebruik en andere tellers)
+def show_run_summary(summary):
+    """Tellers van een run (dict(RUN_STATS)) in een expander"""
+    if not summary:
+        return
+    with st.expander("📈 Run samenvatting"):
+        nieuw = summary.get('connections_new', 0)
+        hergebruikt = summary.get('connections_reused', 0)
+        if nieuw + hergebruikt:
+            st.metric("Verbindingen hergebruikt", f"{hergebruikt / (nieuw + hergebruikt):.0%}",
+                      help=f"{hergebruikt} hergebruikt, {nieuw} nieuwe TCP/TLS verbindingen")
+        if summary.get('locations'):
+            st.metric("Bespaarde requests per locatie", f"{summary.get('requests_saved', 0) / summary['locations']:.1f}",
+                      help=f"{summary.get('requests_saved', 0)} pagina's niet opgehaald doordat de doelvelden al gevonden waren")
+        if summary.get('ai_calls'):
+            st.metric("AI tokens gebruikt", summary.get('ai_tokens_used', 0),
+                      help=f"{summary['ai_calls']} AI calls, ca. ${summary.get('ai_cost_usd', 0):.4f}; "
+                           f"{summary.get('ai_retries', 0)} retries, {summary.get('ai_rate_limit_waits', 0)} keer gewacht op de rate limit")
+        if summary.get('ai_cache_hits'):
+            st.metric("AI tokens bespaard (cache)", summary.get('ai_tokens_saved', 0),
+                      help=f"{summary['ai_cache_hits']} AI extracties uit de cache, "
+                           f"ca. ${summary.get('ai_cost_saved_usd', 0):.4f} bespaard")
+        gedeeld = summary.get('singleflight_coalesced', 0) + summary.get('singleflight_reused', 0)
+        if gedeeld:
+            st.metric("Gedeelde pagina's (single-flight)", gedeeld,
+                      help=f"{summary.get('singleflight_coalesced', 0)} keer meegelift op een lopende fetch, "
+                           f"{summary.get('singleflight_reused', 0)} keer een al geparste pagina hergebruikt")
+        st.dataframe(pd.DataFrame(sorted(summary.items()), columns=["Teller", "Waarde"]))
+
 # Scraper UI
 if st.session_state.session:
     st.title("Kinderopvang Locatiemanager Scraper")
@@ -1793,7 +2630,7 @@ with tab1:
         fallback_method = st.selectbox(
             "Kies fallback methode bij blokkering:",
             [
-                "Automatisch (probeer alle methoden)",
+                "Automatisch (race: snelste methode wint)",
                 "🤖 Selenium Browser Automation", 
                 "🎭 Playwright Browser Automation",
                 "📚 Wayback Machine Archive",
@@ -1818,6 +2655,13 @@ with tab1:
             help="Probeert alle scraping methoden (ook als één succesvol is) en combineert alle gevonden data"
         )
         
+        # Race optie (gebruikt bij 'Automatisch' zonder combinatie)
+        race_quorum = st.number_input(
+            "🏁 Race: stop na zoveel methoden met contactgegevens",
+            min_value=1, max_value=5, value=1,
+            help="Zonder 'ALLE methoden' starten de methoden in parallelle tiers; zodra dit aantal methoden contactgegevens heeft gevonden worden de rest geannuleerd"
+        )
+        
         # Overzicht van alle beschikbare methoden
         with st.expander("📋 Overzicht van alle 13+ scraping methoden"):
             st.write("""
@@ -1847,6 +2691,14 @@ with tab1:
         
         st.info("💡 **Tip**: Gebruik 'Alle methoden combineren' voor maximale data-opbrengst!")
         
+        # Historische prestaties van de fallback methoden
+        with st.expander("📊 Fallback statistieken (succes en latency per methode)"):
+            fallback_report = FALLBACK_STATS.report()
+            if fallback_report:
+                st.dataframe(pd.DataFrame(fallback_report))
+            else:
+                st.write("Nog geen statistieken beschikbaar")
+        
         # Debug mode toggle
         debug_mode = st.checkbox("🐛 Debug modus", help="Toont gedetailleerde informatie over elke stap")
         
@@ -1891,6 +2743,8 @@ with tab1:
         if test_url and st.button("Test Scraping"):
             with st.spinner("Bezig met testen van website..."):
                 try:
+                    # Eigen tellers voor deze test (o.a. AI calls, tokens en cache hits)
+                    reset_run_stats()
                     # Test de scraping functie direct
                     if debug_mode:
                         st.info("🔍 Start standaard async scraper...")
@@ -1900,9 +2754,10 @@ with tab1:
                     
                     # Check if we need to try advanced fallback methods
                     has_useful_data = (result.get('emails') or result.get('telefoons') or result.get('adressen') or result.get('managers'))
-                    scraper_failed = (result.get('error') or 
-                                    not has_useful_data or
-                                    any('HTTP_ERROR_403' in str(debug) for debug in result.get('debug_info', [])))
+                    scraper_failed = (not completion_reached(result) and
+                                      (result.get('error') or
+                                       not has_useful_data or
+                                       any('HTTP_ERROR_403' in str(debug) for debug in result.get('debug_info', []))))
                     
                     if debug_mode:
                         st.write(f"**Scraper status:** {'✅ Heeft data' if has_useful_data else '❌ Geen data'}, {'❌ Gefaald' if scraper_failed else '✅ Succesvol'}")
@@ -1933,8 +2788,8 @@ with tab1:
                             # Try the selected fallback method
                             advanced_result = None
                             
-                            if fallback_method == "Automatisch (probeer alle methoden)":
-                                advanced_result = try_all_fallback_methods(test_url, combine_results=False)
+                            if fallback_method == "Automatisch (race: snelste methode wint)":
+                                advanced_result = race_fallback_methods(test_url, quorum=race_quorum)
                             elif fallback_method == "🤖 Selenium Browser Automation":
                                 advanced_result = selenium_scrape_fallback(test_url)
                             elif fallback_method == "🎭 Playwright Browser Automation":
@@ -1986,20 +2841,20 @@ with tab1:
                                         if file_info['success']:
                                             saved_files.append(file_info)
                                             st.success(f"✅ HTML opgeslagen: {file_info['filename']}")
-                                    
-                                    # AI extraction if enabled
-                                    if use_ai_extraction and openai_api_key and method_content:
-                                        st.info(f"🤖 AI extractie voor {method_name}...")
-                                        ai_result = ai_extract_contact_data(
-                                            method_content, 
-                                            test_url, 
-                                            use_openai=True,
-                                            model=ai_model_choice
-                                        )
+                                
+                                # AI extraction if enabled: alle methoden tegelijk, binnen de rate limits
+                                ai_inputs = [(item['method'], item['content']) for item in advanced_result['individual_contents']
+                                             if item['content']]
+                                if use_ai_extraction and openai_api_key and ai_inputs:
+                                    st.info(f"🤖 AI extractie voor {len(ai_inputs)} methoden (max {AI_CONCURRENCY} tegelijk)...")
+                                    for method_name, ai_result in asyncio.run(ai_extract_contents_async(ai_inputs, test_url, ai_model_choice)):
                                         if ai_result['success']:
                                             ai_result['method'] = method_name
                                             ai_results.append(ai_result)
-                                            st.success(f"✅ AI extractie voltooid voor {method_name}")
+                                            if ai_result.get('cached'):
+                                                st.success(f"♻️ AI resultaat uit cache voor {method_name} ({ai_result['tokens_saved']} tokens bespaard)")
+                                            else:
+                                                st.success(f"✅ AI extractie voltooid voor {method_name} ({ai_result['usage']['prompt_tokens'] + ai_result['usage']['completion_tokens']} tokens)")
                                         else:
                                             st.warning(f"⚠️ AI extractie gefaald voor {method_name}: {ai_result.get('error', 'Unknown error')}")
                             
@@ -2028,7 +2883,10 @@ with tab1:
                                     if ai_result['success']:
                                         ai_result['method'] = method_name
                                         ai_results.append(ai_result)
-                                        st.success(f"✅ AI extractie voltooid voor {method_name}")
+                                        if ai_result.get('cached'):
+                                            st.success(f"♻️ AI resultaat uit cache voor {method_name} ({ai_result['tokens_saved']} tokens bespaard)")
+                                        else:
+                                            st.success(f"✅ AI extractie voltooid voor {method_name}")
                                     else:
                                         st.warning(f"⚠️ AI extractie gefaald voor {method_name}: {ai_result.get('error', 'Unknown error')}")
                             
@@ -2207,6 +3065,11 @@ with tab1:
                     if 'ai_results' in locals() and ai_results:
                         st.markdown("---")
                         st.subheader("🤖 AI Extractie Resultaten")
+                        cached_ai_results = [r for r in ai_results if r.get('cached')]
+                        if cached_ai_results:
+                            st.info(f"♻️ {len(cached_ai_results)} van {len(ai_results)} AI resultaten uit de cache: "
+                                    f"{sum(r['tokens_saved'] for r in cached_ai_results)} tokens, "
+                                    f"ca. ${sum(r['cost_saved_usd'] for r in cached_ai_results):.4f} bespaard")
                         
                         # Combined AI results
                         all_ai_emails = set()
@@ -2439,6 +3302,8 @@ with tab1:
                     if result.get('error'):
                         st.error(f"Fout opgetreden: {result['error']}")
                     
+                    show_run_summary(dict(RUN_STATS))
+                    
                     # Mogelijkheid om test toe te voegen aan reguliere scraping
                     if st.button("Voeg toe aan scraping lijst"):
                         naam = st.text_input("Locatienaam voor deze test", key="test_naam")
@@ -2453,6 +3318,26 @@ with tab1:
 
     # Start scraping
     if not input_df.empty:
+        with st.expander("⚡ Bulk instellingen"):
+            bulk_concurrency = st.number_input("Aantal locaties tegelijk", min_value=1, max_value=50, value=BULK_CONCURRENCY,
+                                               help="Hoeveel locaties er tegelijk worden gezocht en gescraped")
+            bulk_per_host_limit = st.number_input("Maximaal tegelijk per website", min_value=1, max_value=10, value=BULK_PER_HOST_LIMIT,
+                                                  help="Begrenst gelijktijdige scrapes op hetzelfde domein (bijv. ketens met veel locaties)")
+            
+            # Completion policy: stop met crawlen zodra deze velden gevonden zijn
+            st.write("**Stop met crawlen zodra gevonden:**")
+            confidence_options = {"Niet vereist": None, "Normaal": "normal", "Hoog (structured data)": "high"}
+            completion_targets = {}
+            for col, (field, label) in zip(st.columns(4), [("emails", "E-mail"), ("telefoons", "Telefoon"),
+                                                           ("adressen", "Adres"), ("managers", "Manager")]):
+                with col:
+                    level = confidence_options[st.selectbox(label, list(confidence_options), index=1, key=f"completion_{field}")]
+                if level:
+                    completion_targets[field] = level
+            chain_mode = st.checkbox("Keten modus (sitemap index per domein)", value=CHAIN_MODE,
+                                     help="Bij veel locaties op één domein: robots.txt en sitemap één keer lezen en per rij "
+                                          "direct de eigen locatiepagina ophalen")
+
         start_button = st.button("Start scraping", disabled=st.session_state.scraping_in_progress)
         if start_button:
             st.session_state.scraping_in_progress = True
@@ -2464,36 +3349,22 @@ with tab1:
                 progress = st.progress(0)
                 
                 async def process_all_locations():
-                    for idx, row in input_df.iterrows():
-                        naam, plaats = str(row['locatienaam']), str(row['plaats'])
-                        
-                        # Try SerpAPI first, then fallback
-                        site = zoek_website_bij_naam(naam, plaats)
-                        if not site:
-                                                    site = await backup_search(naam, plaats)
+                    reset_run_stats()
+                    DOMAIN_SCHEDULER.reset()
+                    WEBSITE_RESOLVER.reset()
+                    SEEN_PAGES.clear()
+                    PAGE_FLIGHT.reset()
+                    CHAIN_INDEX.reset()
+                    rows = [(str(row['locatienaam']), str(row['plaats'])) for _, row in input_df.iterrows()]
+                    # Resultaten komen binnen in volgorde van afronding; bewaar ze op invoerpositie
+                    ordered_results = [None] * len(rows)
+                    done = 0
                     
-                    if site:
-                        # First try the advanced async scraper
-                        data = await scrape_deep(site)
-                        
-                        # If that fails due to bot blocking, fallback to requests-based scraper
-                        if (data.get('error') or 
-                            (not data.get('emails') and not data.get('telefoons') and not data.get('adressen')) or
-                            any('HTTP_ERROR_403' in str(debug) for debug in data.get('debug_info', []))):
-                            
-                            # No progress.text available in this context
-                            fallback_data = scrape_contactgegevens(site)
-                            
-                            # If fallback found data, use it
-                            if not fallback_data.get('error') and (fallback_data.get('emails') or fallback_data.get('telefoons')):
-                                data = fallback_data
-                                data['debug_info'] = [f"Gebruikt fallback scraper (requests) na async failure"]
-                            else:
-                                # Keep original async result but note the fallback attempt
-                                data['debug_info'] = data.get('debug_info', []) + [f"Fallback scraper ook gefaald: {fallback_data.get('error', 'geen data gevonden')}"]
-                    else:
-                        data = {'error': 'Geen website gevonden'}
-
+                    def site_found(searched, total):
+                        progress.progress(searched / total, text=f"Websites zoeken: {searched}/{total}")
+                    
+                    async for idx, naam, plaats, site, data in scrape_locations_bulk(rows, bulk_concurrency, bulk_per_host_limit,
+                                                                                     completion_targets, chain_mode, site_found):
                         resultaat = {
                             'locatienaam': naam,
                             'plaats': plaats,
@@ -2516,8 +3387,12 @@ with tab1:
                             except Exception as e:
                                 st.warning(f"Kon geschiedenis niet opslaan: {str(e)}")
                         
-                        st.session_state.resultaten.append(resultaat)
-                        progress.progress((idx+1)/len(input_df))
+                        ordered_results[idx] = resultaat
+                        done += 1
+                        progress.progress(done / len(rows), text=f"Locaties gescraped: {done}/{len(rows)}")
+                    
+                    st.session_state.resultaten = [r for r in ordered_results if r is not None]
+                    st.session_state.run_summary = dict(RUN_STATS)
 
                 # Run async scraping
                 asyncio.run(process_all_locations())
@@ -2544,7 +3419,10 @@ with tab1:
             # Verwijder debug_info uit dataframe voor normale weergave
             display_df = res_df.drop(columns=['debug_info'], errors='ignore')
             st.dataframe(display_df)
-        
+
+            # Run samenvatting (connection reuse en andere tellers)
+            show_run_summary(st.session_state.run_summary)
+
         # Export and visualizations
         if st.session_state.resultaten:
             res_df = pd.DataFrame(st.session_state.resultaten)
@@ -0,0 +1,13 @@
+"""Sqlite bestanden voor de persistente caches (resolver, HTTP cache, AI cache, fallback statistieken)."""
+import os
+import sqlite3
+
+
+def connect_cache_db(path, schema):
+    """Open (en maak zo nodig) een sqlite cache op path, te delen tussen threads"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.executescript(schema)
+    return conn
@@ -0,0 +1,370 @@
+"""Contactgegevens uit tekst halen: e-mailadressen, telefoonnummers, adressen en managers.
+
+Eén set voorgecompileerde patronen voor scrape_deep, scrape_contactgegevens en
+extract_and_combine_contact_data, plus een snelle route via structured data (JSON-LD,
+microdata, mailto:/tel: links). E-mail, telefoon en (straat/postcode) adressen worden in
+één finditer pass over de tekst gevonden; managerregels met één keyword alternation.
+"""
+import html
+import json
+import re
+from urllib.parse import unquote
+
+import phonenumbers
+
+# E-mail | NL telefoonnummer | straat + huisnummer | postcode (+ plaats), in één pass.
+# De lookbehinds laten een match alleen op een woordgrens beginnen; zonder die ankers
+# backtrackt het e-mailpatroon kwadratisch op lange tekens-reeksen (bijv. base64 blobs).
+EMAIL_PATTERN = r"(?<![\w.%+-])[\w.%+-]+@[\w.-]+\.[a-zA-Z]{2,}"
+CONTACT_TOKEN_RE = re.compile(
+    rf"(?P<email>{EMAIL_PATTERN})"
+    r"|(?<![\w+])(?P<phone>(?:\+31|0031|0)[\s\-]?[1-9][\s\-]?[\d\s\-]{8})"
+    r"|\b(?P<street>[A-Z][a-z]+(?:straat|laan|weg|plein|dreef|park|square|boulevard)\s*\d+[a-z]?)\b"
+    r"|\b(?P<postcode>\d{4}\s?[A-Z]{2})\b(?:\s+(?P<plaats>[A-Z][a-z]+))?"
+)
+
+EMAIL_SKIP_WORDS = ('example', '@domain', '@test', 'noreply', 'no-reply')
+NAME_SKIP_WORDS = ('lorem', 'ipsum', 'example')
+
+MANAGER_KEYWORD_RE = re.compile(
+    r"locatie\s*manager|vestigingsmanager|manager|directeur|directrice|leidinggevende"
+    r"|teamleider|teamleidster|hoofd\s*vestiging|pedagogisch\s*medewerker|\bpm\b"
+    r"|locatiecoördinator|coördinator",
+    re.IGNORECASE,
+)
+
+# First Last | F. Last | First F. Last
+MANAGER_NAME_RE = re.compile(
+    r"[A-Z][a-z]+\s+[A-Z]\.\s*[A-Z][a-z]+|[A-Z][a-z]+\s+[A-Z][a-z]+|[A-Z]\.\s*[A-Z][a-z]+"
+)
+
+_NON_PHONE_CHARS_RE = re.compile(r"[^\d+]")
+
+
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+
+
+def is_wanted_email(email):
+    return not any(skip in email for skip in EMAIL_SKIP_WORDS)
+
+
+def extract_phones(text):
+    """Telefoonnummers via phonenumbers, in internationaal formaat"""
+    phones = []
+    try:
+        for match in phonenumbers.PhoneNumberMatcher(text, "NL"):
+            phones.append(phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL))
+    except Exception:
+        pass
+    return phones
+
+
+def extract_managers(text):
+    """Regels met een managerfunctie; 'Naam (functie)' als er een naam in staat, anders de regel zelf"""
+    managers = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not 5 < len(line) < 100:
+            continue
+        keyword = MANAGER_KEYWORD_RE.search(line)
+        if not keyword:
+            continue
+        names = [
+            name for name in MANAGER_NAME_RE.findall(line)
+            if not any(skip in name.lower() for skip in NAME_SKIP_WORDS)
+        ]
+        if names:
+            managers.extend(f"{name.strip()} ({keyword.group(0).lower()})" for name in names)
+        else:
+            managers.append(line[:80] + ("..." if len(line) > 80 else ""))
+    return managers
+
+
+def extract_contact_data(text):
+    """Alle contactgegevens uit een tekst, als lijsten zonder duplicaten (in volgorde van voorkomen)"""
+    emails, phones, addresses = {}, {}, {}
+
+    for match in CONTACT_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'email':
+            email = match.group('email').lower()
+            if is_wanted_email(email):
+                emails[email] = None
+        elif kind == 'phone':
+            phone = match.group('phone').strip()
+            if len(_NON_PHONE_CHARS_RE.sub('', phone)) >= 9:
+                phones[phone] = None
+        elif kind == 'street':
+            addresses[match.group('street')] = None
+        else:
+            postcode = match.group('postcode')
+            if match.group('plaats'):
+                addresses[f"{postcode} {match.group('plaats')}"] = None
+            addresses[postcode] = None
+
+    for phone in extract_phones(text):
+        phones[phone] = None
+
+    return {
+        "emails": list(emails),
+        "telefoons": list(phones),
+        "adressen": list(addresses),
+        "managers": list(dict.fromkeys(extract_managers(text))),
+    }
+
+
+# Structured data: schema.org JSON-LD, microdata en mailto:/tel: links. JSON-LD en microdata zijn door de
+# site zelf als contactgegevens gemarkeerd (hoge betrouwbaarheid); mailto:/tel: links staan vaak alleen in
+# de footer met het algemene nummer van de organisatie en tellen daarom als gewone tekst.
+# Een locatie (LocalBusiness, ChildCare, ...) met e-mail, telefoon en adres is per vestiging gemarkeerd.
+LOCATION_TYPES = {'localbusiness', 'childcare', 'preschool', 'school', 'educationalorganization', 'elementaryschool'}
+
+
+def _iter_jsonld_nodes(data):
+    """Alle dicts in een JSON-LD document, inclusief @graph en geneste objecten (employee, contactPoint, ...)"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            yield node
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _normalize_phone(raw):
+    try:
+        number = phonenumbers.parse(raw, "NL")
+        if phonenumbers.is_possible_number(number):
+            return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+    except phonenumbers.NumberParseException:
+        pass
+    return None
+
+
+def _add_email(found, raw):
+    email = unquote(str(raw)).strip().lower().removeprefix('mailto:').split('?')[0].strip()
+    if '@' in email and is_wanted_email(email):
+        found['emails'][email] = None
+
+
+def _add_phone(found, raw):
+    phone = unquote(str(raw)).strip()
+    phone = _normalize_phone(phone[4:] if phone[:4].lower() == 'tel:' else phone)
+    if phone:
+        found['telefoons'][phone] = None
+
+
+def _add_address(found, street=None, postcode=None, plaats=None):
+    if street:
+        found['adressen'][' '.join(str(street).split())] = None
+    if postcode:
+        postcode = ' '.join(str(postcode).split()).upper()
+        if plaats:
+            found['adressen'][f"{postcode} {' '.join(str(plaats).split())}"] = None
+        found['adressen'][postcode] = None
+
+
+def _node_types(node):
+    return {str(node_type).rstrip('/').rsplit('/', 1)[-1].lower() for node_type in _as_list(node.get('@type'))}
+
+
+def _location(node):
+    """Contactgegevens en adres van een LocalBusiness/ChildCare node, of None als het geen locatie is"""
+    if not _node_types(node) & LOCATION_TYPES:
+        return None
+    location = {"emails": {}, "telefoons": {}, "adressen": {}, "managers": {}}
+    for email in _as_list(node.get('email')):
+        _add_email(location, email)
+    for phone in _as_list(node.get('telephone')):
+        _add_phone(location, phone)
+    places = []
+    for address in _as_list(node.get('address')):
+        if isinstance(address, dict):
+            _add_address(location, address.get('streetAddress'), address.get('postalCode'), address.get('addressLocality'))
+            places.append(str(address.get('addressLocality') or ''))
+        elif isinstance(address, str):
+            location['adressen'][' '.join(address.split())] = None
+    if not location['adressen']:
+        return None
+    return {
+        "emails": list(location['emails']),
+        "telefoons": list(location['telefoons']),
+        "adressen": list(location['adressen']),
+        "plaatsen": [' '.join(place.split()).lower() for place in places if place.strip()],
+    }
+
+
+def _add_node(found, node):
+    """Eén schema.org object (uit JSON-LD of een microdata itemscope)"""
+    for email in _as_list(node.get('email')):
+        _add_email(found, email)
+    for phone in _as_list(node.get('telephone')):
+        _add_phone(found, phone)
+    # PostalAddress zelf (microdata) of een address property (JSON-LD)
+    if node.get('streetAddress') or node.get('postalCode'):
+        _add_address(found, node.get('streetAddress'), node.get('postalCode'), node.get('addressLocality'))
+    for address in _as_list(node.get('address')):
+        if isinstance(address, str):
+            found['adressen'][' '.join(address.split())] = None
+    job_title = node.get('jobTitle')
+    if isinstance(job_title, str) and isinstance(node.get('name'), str) and MANAGER_KEYWORD_RE.search(job_title):
+        found['managers'][f"{node['name'].strip()} ({job_title.strip().lower()})"] = None
+
+
+def extract_structured_contacts(jsonld_texts=(), microdata_items=(), links=()):
+    """Contactgegevens uit structured data: JSON-LD scripts, microdata items (dicts per itemscope) en <a href> links.
+
+    emails/telefoons/adressen/managers komen uit JSON-LD en microdata, "links" bevat de mailto:/tel:
+    adressen en "locations" de LocalBusiness/ChildCare nodes met hun eigen adres (zie _location).
+    """
+    found = {"emails": {}, "telefoons": {}, "adressen": {}, "managers": {}}
+    linked = {"emails": {}, "telefoons": {}}
+    locations = []
+
+    nodes = []
+    for text in jsonld_texts:
+        try:
+            data = json.loads(text)
+        except (TypeError, ValueError):
+            continue
+        nodes.extend(_iter_jsonld_nodes(data))
+    nodes.extend(microdata_items)
+    for node in nodes:
+        _add_node(found, node)
+        location = _location(node)
+        if location:
+            locations.append(location)
+
+    for href, _ in links:
+        scheme = href[:7].lower()
+        if scheme == 'mailto:':
+            _add_email(linked, href)
+        elif scheme[:4] == 'tel:':
+            _add_phone(linked, href)
+
+    structured = {key: list(values) for key, values in found.items()}
+    structured["links"] = {key: list(values) for key, values in linked.items()}
+    structured["locations"] = locations
+    return structured
+
+
+def structured_data_complete(locations, plaats=None):
+    """Genoeg structured data om verder crawlen en fallbacks over te slaan: een gemarkeerde locatie met
+    e-mail én telefoon, in de plaats van de rij (zonder plaats: een locatie met een adres)"""
+    plaats = ' '.join((plaats or '').split()).lower()
+    for location in locations:
+        if not (location['emails'] and location['telefoons']):
+            continue
+        if not plaats or plaats in location['plaatsen'] or any(
+                re.search(rf"\b{re.escape(plaats)}\b", address.lower()) for address in location['adressen']):
+            return True
+    return False
+
+
+# Deobfuscatie van beschermde e-mailadressen: Cloudflare cfemail, [at]/[dot] spellingen,
+# HTML entities en string-concatenatie in JavaScript.
+CFEMAIL_RE = re.compile(r"""(?:data-cfemail=["']?|/cdn-cgi/l/email-protection#)([0-9a-fA-F]{6,})""")
+_AT_MARKER = r"\[\s*(?:at|@|apenstaartje)\s*\]|\(\s*(?:at|@|apenstaartje)\s*\)|\{\s*(?:at|@)\s*\}|<\s*at\s*>|\sAT\s"
+_AT = rf"\s*(?:{_AT_MARKER})\s*"
+_DOT = r"\s*(?:\[\s*(?:dot|punt|\.)\s*\]|\(\s*(?:dot|punt|\.)\s*\)|\{\s*(?:dot|punt)\s*\}|\s(?:DOT|dot|punt)\s)\s*|\."
+AT_DOT_EMAIL_RE = re.compile(rf"(?<![\w.%+-])([\w.%+-]+){_AT}([\w-]+(?:(?:{_DOT})[\w-]+)+)")
+DOT_RE = re.compile(_DOT)
+AT_MARKER_RE = re.compile(_AT_MARKER)
+# Helemaal uitgeschreven, ook in kleine letters: "info at kdv dot nl". Zonder haakjes alleen met een
+# uitgeschreven punt, anders wordt gewone tekst ("bereikbaar at kdv.nl") een adres.
+SPOKEN_EMAIL_RE = re.compile(r"(?<![\w.%+-])([\w.%+-]+)\s+(?i:at)\s+([\w-]+(?:\s+(?i:dot|punt)\s+[\w-]+)+)\b")
+SPOKEN_DOT_RE = re.compile(r"\s+(?i:dot|punt)\s+")
+# 'info' + '@' + 'kdv.nl' -> 'info@kdv.nl', en \x40 / \u0040 escapes in JS strings
+_JS_STRING = r"""(?:"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')"""
+JS_STRING_CHAIN_RE = re.compile(rf"{_JS_STRING}(?:\s*\+\s*{_JS_STRING})*")
+JS_CONCAT_RE = re.compile(r"""["']\s*\+\s*["']""")
+JS_STRING_RE = re.compile(_JS_STRING)
+JS_CHAIN_MAX_LITERALS = 50
+JS_ESCAPES = {'\\x40': '@', '\\u0040': '@', '\\x2e': '.', '\\x2E': '.', '\\u002e': '.', '\\u002E': '.'}
+
+
+def decode_cfemail(encoded):
+    """Cloudflare email protection: eerste byte is de XOR sleutel voor de rest"""
+    try:
+        data = bytes.fromhex(encoded)
+    except ValueError:
+        return None
+    email = bytes(byte ^ data[0] for byte in data[1:]).decode('utf-8', 'ignore').lower()
+    return email if EMAIL_RE.fullmatch(email) else None
+
+
+def _raw_emails(raw):
+    return {email.lower() for email in EMAIL_RE.findall(raw)}
+
+
+def _js_string_emails(raw_html):
+    """Adressen uit aaneengeschakelde JS string literals ('info' + '@' + 'kdv.nl').
+
+    Een adres telt alleen als het precies uit hele literals bestaat (het eerste literal mag met
+    'mailto:' beginnen): 'Bel ons' + 'info@kdv.nl' levert dus niet 'onsinfo@kdv.nl' op.
+    """
+    emails = set()
+    for chain in JS_STRING_CHAIN_RE.finditer(raw_html):
+        literals = JS_STRING_RE.findall(chain.group())
+        if (len(literals) < 2 and '\\' not in chain.group()) or len(literals) > JS_CHAIN_MAX_LITERALS:
+            continue
+        joined, starts, ends = '', set(), set()
+        for literal in literals:
+            content = literal[1:-1]
+            for escape, char in JS_ESCAPES.items():
+                content = content.replace(escape, char)
+            if content.lower().startswith('mailto:'):
+                starts.add(len(joined) + len('mailto:'))
+            starts.add(len(joined))
+            joined += content
+            ends.add(len(joined))
+        ends = sorted(ends, reverse=True)
+        for start in starts:
+            for end in ends:
+                if end > start and EMAIL_RE.fullmatch(joined[start:end]):
+                    emails.add(joined[start:end].lower())
+                    break
+    return emails
+
+
+def deobfuscate_emails(raw_html, text):
+    """E-mailadressen die alleen na deobfuscatie zichtbaar zijn, als {email: techniek}.
+
+    raw_html is de ongeparste pagina (cfemail attributen en scripts), text de geëxtraheerde tekst.
+    Adressen die al gewoon in de tekst staan worden niet teruggegeven.
+    """
+    found = {}
+    for encoded in CFEMAIL_RE.findall(raw_html):
+        email = decode_cfemail(encoded)
+        if email:
+            found.setdefault(email, 'cfemail')
+
+    for match in AT_DOT_EMAIL_RE.finditer(text) if AT_MARKER_RE.search(text) else ():
+        email = f"{match.group(1)}@{DOT_RE.sub('.', match.group(2))}".lower()
+        if EMAIL_RE.fullmatch(email):
+            found.setdefault(email, 'at_dot')
+    for match in SPOKEN_EMAIL_RE.finditer(text):
+        email = f"{match.group(1)}@{SPOKEN_DOT_RE.sub('.', match.group(2))}".lower()
+        if EMAIL_RE.fullmatch(email):
+            found.setdefault(email, 'at_dot')
+
+    plain = None
+    if '&#' in raw_html:
+        plain = _raw_emails(raw_html)
+        for email in _raw_emails(html.unescape(raw_html)) - plain:
+            found.setdefault(email, 'entities')
+
+    if JS_CONCAT_RE.search(raw_html) or '\\x40' in raw_html or '\\u0040' in raw_html:
+        plain = _raw_emails(raw_html) if plain is None else plain
+        for email in _js_string_emails(raw_html) - plain:
+            found.setdefault(email, 'javascript')
+
+    known = {email.lower() for email in EMAIL_RE.findall(text)}
+    return {email: technique for email, technique in found.items() if email not in known and is_wanted_email(email)}
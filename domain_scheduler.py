@@ -0,0 +1,120 @@
+"""Politeness per domein: token bucket, Retry-After blokkades, backoff met jitter en een retry budget.
+
+Zonder Streamlit afhankelijkheden, zodat de scheduler los te testen is; app.py maakt DOMAIN_SCHEDULER
+aan met de waarden uit st.secrets.
+"""
+import asyncio
+import ipaddress
+import random
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from run_stats import bump_run_stat
+
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+def domain_key(url):
+    """Domein waarop gelimiteerd wordt: subdomeinen van één keten delen dezelfde bucket"""
+    host = (urlparse(url).hostname or '').lower()
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    parts = host.split('.')
+    return '.'.join(parts[-2:]) if len(parts) > 2 else host
+
+
+def parse_retry_after(value):
+    """Retry-After header: aantal seconden of een HTTP-datum"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class DomainScheduler:
+    """Token bucket per domein, Retry-After/backoff blokkades en een retry budget per run.
+
+    Zowel async (fetch_page) als sync (requests-fallbacks in threads) aanroepers gebruiken
+    dezelfde buckets, zodat ketens met honderden locaties op één domein niet overbelast raken.
+    """
+
+    def __init__(self, rate=2.0, burst=4, retry_budget=300):
+        self.rate = max(0.01, rate)
+        self.burst = max(1, burst)
+        self.initial_retry_budget = retry_budget
+        self.reset()
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.retry_budget = self.initial_retry_budget
+
+    def _bucket(self, url, now):
+        key = domain_key(url)
+        if key not in self._buckets:
+            self._buckets[key] = {'tokens': float(self.burst), 'updated': now, 'blocked_until': 0.0}
+        return self._buckets[key]
+
+    def _reserve(self, url):
+        """Neem een token en geef terug hoelang er gewacht moet worden voor het verzoek mag"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(url, now)
+            bucket['tokens'] = min(self.burst, bucket['tokens'] + (now - bucket['updated']) * self.rate)
+            bucket['updated'] = now
+            bucket['tokens'] -= 1
+            # Negatieve tokens = wachtrij; een Retry-After blokkade gaat daar nog overheen
+            wait = max(0.0, -bucket['tokens'] / self.rate, bucket['blocked_until'] - now)
+        if wait > 0:
+            bump_run_stat('politeness_waits')
+        return wait
+
+    async def acquire(self, url):
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, url):
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, url, retry_after=None, attempt=1):
+        """Blokkeer het domein na een 429/503: Retry-After indien aanwezig, anders exponentiële backoff"""
+        delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+        delay = min(delay, BACKOFF_MAX_SECONDS)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(url, now)
+            bucket['blocked_until'] = max(bucket['blocked_until'], now + delay)
+        bump_run_stat('rate_limited_responses')
+        return delay
+
+    @staticmethod
+    def backoff_delay(attempt):
+        """Exponentiële backoff met full jitter"""
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def take_retry(self):
+        """Gebruik één retry uit het budget van deze run; False als het op is"""
+        with self._lock:
+            if self.retry_budget <= 0:
+                bump_run_stat('retry_budget_exhausted')
+                return False
+            self.retry_budget -= 1
+        bump_run_stat('retries')
+        return True
@@ -0,0 +1,127 @@
+"""Adaptieve volgorde van de fallback methoden: succes- en latency statistieken per domein (sqlite).
+
+Zonder Streamlit afhankelijkheden, zodat het overslaan en herstellen los te testen is; app.py maakt
+FALLBACK_STATS aan met de waarden uit st.secrets.
+"""
+import sqlite3
+import threading
+import time
+
+from cache_db import connect_cache_db
+from domain_scheduler import domain_key
+
+
+class FallbackStats:
+    """Persistente succes- en latency statistieken per domein en fallback methode.
+
+    Tellers vervallen met een halfwaardetijd, zodat een site die verandert vanzelf weer
+    andere methoden krijgt. plan() zet de historisch snelste succesvolle methoden vooraan en
+    slaat methoden over die voor dit domein blijven falen. Dat laatste gebruikt het aantal
+    opeenvolgende mislukkingen zonder verval (een succes zet het op nul); na één halfwaardetijd
+    zonder poging krijgt de methode weer een kans.
+    """
+
+    def __init__(self, path, half_life_days=30, skip_after_failures=3, latency_samples=500):
+        self.path = path
+        self.half_life_seconds = half_life_days * 24 * 3600
+        self.skip_after_failures = skip_after_failures
+        self.latency_samples = latency_samples
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect_cache_db(self.path, """
+                CREATE TABLE IF NOT EXISTS method_stats (
+                    domain TEXT, method TEXT, successes REAL, failures REAL, latency REAL, updated_at REAL,
+                    consecutive_failures INTEGER DEFAULT 0, PRIMARY KEY (domain, method));
+                CREATE TABLE IF NOT EXISTS method_latency (
+                    method TEXT, success INTEGER, latency REAL, recorded_at REAL);""")
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(method_stats)")]
+            if "consecutive_failures" not in columns:  # caches van vóór deze kolom
+                self._conn.execute("ALTER TABLE method_stats ADD COLUMN consecutive_failures INTEGER DEFAULT 0")
+                self._conn.commit()
+        return self._conn
+
+    def _decay(self, value, updated_at, now):
+        return value * 0.5 ** ((now - updated_at) / self.half_life_seconds)
+
+    def record(self, url, method, success, latency):
+        domain = domain_key(url)
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute("""SELECT successes, failures, latency, updated_at, consecutive_failures
+                                    FROM method_stats WHERE domain = ? AND method = ?""", (domain, method)).fetchone()
+                successes, failures, avg_latency, consecutive = 0.0, 0.0, None, 0
+                if row:
+                    successes = self._decay(row[0], row[3], now)
+                    failures = self._decay(row[1], row[3], now)
+                    avg_latency = row[2]
+                    consecutive = row[4] or 0
+                if success:
+                    successes += 1
+                    consecutive = 0
+                    # Latency als voortschrijdend gemiddelde van de succesvolle pogingen
+                    avg_latency = latency if avg_latency is None else 0.7 * avg_latency + 0.3 * latency
+                else:
+                    failures += 1
+                    consecutive += 1
+                db.execute("INSERT OR REPLACE INTO method_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           (domain, method, successes, failures, avg_latency, now, consecutive))
+                db.execute("INSERT INTO method_latency VALUES (?, ?, ?, ?)", (method, int(bool(success)), latency, now))
+                db.execute("""DELETE FROM method_latency WHERE method = ? AND rowid NOT IN (
+                              SELECT rowid FROM method_latency WHERE method = ? ORDER BY recorded_at DESC LIMIT ?)""",
+                           (method, method, self.latency_samples))
+                db.commit()
+        except sqlite3.Error:
+            pass
+
+    def plan(self, url, method_names):
+        """Geef (bewezen methoden, snelste eerst; over te slaan methoden) voor dit domein"""
+        domain = domain_key(url)
+        now = time.time()
+        try:
+            with self._lock:
+                rows = self._db().execute("""SELECT method, successes, latency, updated_at, consecutive_failures
+                                             FROM method_stats WHERE domain = ?""", (domain,)).fetchall()
+        except sqlite3.Error:
+            return [], []
+        proven = []
+        skipped = []
+        for method, successes, latency, updated_at, consecutive in rows:
+            if method not in method_names:
+                continue
+            # Niet vervallen: drie keer achter elkaar mislukt is drie, ook als de pogingen dagen uit elkaar liggen
+            if (consecutive or 0) >= self.skip_after_failures and now - updated_at < self.half_life_seconds:
+                skipped.append(method)
+            elif self._decay(successes, updated_at, now) >= 0.5 and latency is not None:
+                proven.append((latency, method))
+        return [method for _, method in sorted(proven)], skipped
+
+    def report(self):
+        """Succespercentage en p50/p95 latency per methode, over alle domeinen"""
+        try:
+            with self._lock:
+                rows = self._db().execute("SELECT method, success, latency FROM method_latency").fetchall()
+        except sqlite3.Error:
+            return []
+        per_method = {}
+        for method, success, latency in rows:
+            per_method.setdefault(method, []).append((success, latency))
+
+        def percentile(values, q):
+            return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else None
+
+        report = []
+        for method, samples in sorted(per_method.items()):
+            latencies = sorted(latency for _, latency in samples)
+            report.append({
+                'Methode': method,
+                'Pogingen': len(samples),
+                'Succes %': round(100 * sum(success for success, _ in samples) / len(samples), 1),
+                'p50 (s)': round(percentile(latencies, 0.5), 2),
+                'p95 (s)': round(percentile(latencies, 0.95), 2)
+            })
+        return report
@@ -0,0 +1,123 @@
+"""HTML streamend decoderen met een byte budget: StreamingHtmlDecoder en de content type checks.
+
+Zonder Streamlit afhankelijkheden, zodat de decoder los te testen is; app.py maakt per response een
+StreamingHtmlDecoder aan met FETCH_MAX_BYTES uit st.secrets.
+"""
+import codecs
+import re
+from urllib.parse import urlparse
+
+from run_stats import bump_run_stat
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', '')
+BINARY_URL_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.zip', '.doc', '.docx',
+                         '.xls', '.xlsx', '.mp4', '.mp3', '.ics')
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?\s*([\w-]+)', re.I)
+# </body> telt alleen buiten <script> en <style> (in JS staat vaak een '</body>' string)
+_BODY_SCAN_RE = re.compile(r'<(script|style)\b[^>]*>|</body\s*>', re.I)
+_RAW_TEXT_END_RES = {'script': re.compile(r'</script\s*>', re.I), 'style': re.compile(r'</style\s*>', re.I)}
+_SCAN_TAIL_MAX = 1024
+
+
+def is_html_content_type(content_type):
+    """Alleen HTML (en tekst) lezen; PDF's, afbeeldingen en andere binaries overslaan"""
+    return (content_type or '').split(';')[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+def is_binary_url(url):
+    return urlparse(url).path.lower().endswith(BINARY_URL_EXTENSIONS)
+
+
+class StreamingHtmlDecoder:
+    """Decodeert HTML chunk voor chunk met een incrementele decoder.
+
+    De charset komt uit de Content-Type header of anders uit een <meta> tag in het begin van
+    het document. feed() geeft False terug zodra er genoeg is: het byte budget is op (truncated,
+    niet cachen) of de </body> is binnen (alles daarna is voor de extractie niet interessant).
+    Een </body> binnen een <script> of <style> telt niet.
+    """
+
+    SNIFF_BYTES = 2048
+
+    def __init__(self, charset=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.charset = charset
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.truncated = False
+        self.body_complete = False
+        self._head = b''
+        self._decoder = None
+        self._parts = []
+        self._tail = ''  # onafgemaakte tag aan het eind van de vorige chunk
+        self._raw_tag = None  # 'script' of 'style' als de scan daarbinnen zit
+
+    def _start_decoder(self):
+        charset = self.charset
+        if not charset:
+            match = _META_CHARSET_RE.search(self._head)
+            charset = match.group(1).decode('ascii', 'ignore') if match else 'utf-8'
+        try:
+            self._decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        head, self._head = self._head, b''
+        self._decode(head)
+
+    def _decode(self, data, final=False):
+        text = self._decoder.decode(data, final)
+        if not text:
+            return
+        self._parts.append(text)
+        if not self.body_complete:
+            self._scan(self._tail + text)
+
+    def _scan(self, window):
+        """Zoek de </body>, en sla de inhoud van script en style daarbij over"""
+        pos = 0
+        while True:
+            if self._raw_tag:
+                match = _RAW_TEXT_END_RES[self._raw_tag].search(window, pos)
+                if not match:
+                    break
+                self._raw_tag = None
+            else:
+                match = _BODY_SCAN_RE.search(window, pos)
+                if not match:
+                    break
+                if not match.group(1):
+                    self.body_complete = True
+                    return
+                self._raw_tag = match.group(1).lower()
+            pos = match.end()
+        rest = window[pos:]
+        start = rest.rfind('<')
+        self._tail = rest[start:] if start != -1 and len(rest) - start <= _SCAN_TAIL_MAX else ''
+
+    def feed(self, chunk):
+        if self.received + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.received]
+            self.truncated = True
+        self.received += len(chunk)
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) < self.SNIFF_BYTES and not self.truncated:
+                return True
+            self._start_decoder()
+        else:
+            self._decode(chunk)
+        return not (self.truncated or self.body_complete)
+
+    def finish(self):
+        if self._decoder is None:
+            self._start_decoder()
+        self._decode(b'', final=True)
+        html = ''.join(self._parts)
+        if self.truncated:
+            # Half binnengekomen tag (bijv. een base64 data: URI) weglaten, anders wordt het tekst
+            html = html[:html.rfind('>') + 1]
+            bump_run_stat('fetch_truncated')
+        elif self.body_complete:
+            bump_run_stat('fetch_early_stops')
+        bump_run_stat('fetch_bytes_read', self.received)
+        return html
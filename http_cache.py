@@ -0,0 +1,148 @@
+"""Persistente HTTP cache op schijf (sqlite) met conditionele revalidatie.
+
+Zonder Streamlit afhankelijkheden, zodat de cache los te testen is; app.py maakt HTTP_CACHE aan
+met de waarden uit st.secrets. De methoden doen blocking sqlite I/O: vanuit de event loop via
+asyncio.to_thread aanroepen.
+"""
+import sqlite3
+import threading
+import time
+import zlib
+
+from cache_db import connect_cache_db
+from link_scoring import normalize_url
+from run_stats import bump_run_stat
+
+
+class HttpCache:
+    """HTTP cache op schijf (sqlite), gesleuteld op genormaliseerde URL.
+
+    Bodies worden gecomprimeerd opgeslagen met ETag en Last-Modified. Binnen de
+    freshness TTL wordt direct uit de cache geserveerd; daarna revalideert fetch_page
+    met If-None-Match / If-Modified-Since zodat een ongewijzigde pagina een 304 kost.
+    De totale grootte wordt bijgehouden als lopend totaal en bij elke store() die over
+    max_bytes gaat begrensd door LRU-eviction. Het gebruik van een entry (last_access,
+    voor de LRU) wordt per cache hit alleen in het geheugen bijgehouden en gebundeld weggeschreven:
+    bij ACCESS_FLUSH_EVERY hits, na ACCESS_FLUSH_SECONDS, bij de volgende store() en vóór eviction.
+    """
+
+    ACCESS_FLUSH_EVERY = 100
+    ACCESS_FLUSH_SECONDS = 30
+
+    def __init__(self, path, fresh_seconds=24 * 3600, max_bytes=500 * 1024 * 1024):
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._total_bytes = None  # lopend totaal van size, bij de eerste store() uit de database gelezen
+        self._pending_access = {}  # url_key -> last_access, nog niet weggeschreven
+        self._last_flush = time.monotonic()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect_cache_db(self.path, """CREATE TABLE IF NOT EXISTS http_cache (
+                url_key TEXT PRIMARY KEY, body BLOB, etag TEXT, last_modified TEXT,
+                fetched_at REAL, last_access REAL, size INTEGER)""")
+        return self._conn
+
+    def get(self, url):
+        """Geef de cache entry (dict) voor een URL, of None"""
+        try:
+            with self._lock:
+                row = self._db().execute(
+                    "SELECT body, etag, last_modified, fetched_at FROM http_cache WHERE url_key = ?",
+                    (normalize_url(url),)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row:
+            return None
+        return {"body": row[0], "etag": row[1], "last_modified": row[2], "fetched_at": row[3]}
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.fresh_seconds
+
+    @staticmethod
+    def text(entry):
+        return zlib.decompress(entry["body"]).decode('utf-8', errors='replace')
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry and entry.get("etag"):
+            headers['If-None-Match'] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers['If-Modified-Since'] = entry["last_modified"]
+        return headers
+
+    def store(self, url, text, etag=None, last_modified=None):
+        body = zlib.compress(text.encode('utf-8'))
+        url_key = normalize_url(url)
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                if self._total_bytes is None:
+                    self._total_bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+                old = db.execute("SELECT size FROM http_cache WHERE url_key = ?", (url_key,)).fetchone()
+                db.execute("INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           (url_key, body, etag, last_modified, now, now, len(body)))
+                self._write_access(db)  # in dezelfde commit
+                db.commit()
+                self._total_bytes += len(body) - (old[0] if old else 0)
+                if self._total_bytes > self.max_bytes:
+                    self._evict(db)
+        except sqlite3.Error:
+            self._total_bytes = None  # bij de volgende store() opnieuw tellen
+
+    def touch(self, url):
+        """Markeer een entry als opnieuw gevalideerd (na een 304)"""
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("UPDATE http_cache SET fetched_at = ?, last_access = ? WHERE url_key = ?",
+                           (now, now, normalize_url(url)))
+                db.commit()
+        except sqlite3.Error:
+            pass
+
+    def mark_used(self, url):
+        """Onthoud een cache hit voor de LRU; geen sqlite write per hit"""
+        with self._lock:
+            self._pending_access[normalize_url(url)] = time.time()
+            if (len(self._pending_access) < self.ACCESS_FLUSH_EVERY and
+                    time.monotonic() - self._last_flush < self.ACCESS_FLUSH_SECONDS):
+                return
+        self.flush()
+
+    def flush(self):
+        """Schrijf de bijgehouden last_access tijden in één transactie weg"""
+        try:
+            with self._lock:
+                db = self._db()
+                if self._write_access(db):
+                    db.commit()
+        except sqlite3.Error:
+            pass
+
+    def _write_access(self, db):
+        """executemany van de bijgehouden last_access tijden, zonder commit (lock wordt al gehouden)"""
+        pending, self._pending_access = self._pending_access, {}
+        self._last_flush = time.monotonic()
+        if pending:
+            db.executemany("UPDATE http_cache SET last_access = MAX(last_access, ?) WHERE url_key = ?",
+                           [(last_access, url_key) for url_key, last_access in pending.items()])
+            bump_run_stat('http_cache_access_flushes')
+        return bool(pending)
+
+    def _evict(self, db):
+        """Verwijder de minst recent gebruikte entries tot de cache onder de limiet zit"""
+        self._write_access(db)  # LRU volgorde met de laatste hits
+        for url_key, size in db.execute("SELECT url_key, size FROM http_cache ORDER BY last_access").fetchall():
+            if self._total_bytes <= self.max_bytes:
+                break
+            db.execute("DELETE FROM http_cache WHERE url_key = ?", (url_key,))
+            self._total_bytes -= size
+            bump_run_stat('http_cache_evictions')
+        db.commit()
@@ -0,0 +1,153 @@
+"""URL normalisatie en link scoring voor de crawl frontier.
+
+Zonder Streamlit afhankelijkheden, zodat de volgorde waarin scrape_deep links volgt los te testen is.
+"""
+import re
+import unicodedata
+from urllib.parse import urlparse
+
+TRACKING_QUERY_PARAMS = {'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'source', '_ga', 'sessionid', 'sid', 'phpsessid'}
+CONTACT_LINK_WORDS = {'contact': 3, 'team': 2, 'medewerker': 2, 'locatie': 2, 'over': 1}
+# Gewichten voor link scoring: woorden in de linktekst tellen volledig, tokens uit het pad half
+CONTACT_PATH_TOKENS = {'contact': 3, 'team': 2, 'medewerkers': 2, 'medewerker': 2, 'locatie': 2, 'locaties': 2,
+                       'vestiging': 2, 'vestigingen': 2, 'over': 1, 'organisatie': 1, 'wie': 1}
+NEGATIVE_LINK_TOKENS = {'vacature', 'vacatures', 'werken', 'nieuws', 'blog', 'privacy', 'cookie', 'cookies', 'login',
+                        'inloggen', 'inschrijven', 'agenda', 'tarieven', 'voorwaarden', 'disclaimer', 'sitemap'}
+# Woorden uit locatienamen die niets zeggen over welke locatie het is
+GENERIC_NAME_TOKENS = {'kinderopvang', 'kinderdagverblijf', 'kdv', 'bso', 'psz', 'peuterspeelzaal', 'gastouderbureau',
+                       'opvang', 'buitenschoolse', 'de', 'het', 'een', 'van', 'en', 'in', 'aan', 'op', 'bij'}
+LINK_AFFINITY_WEIGHT = 3
+LINK_AFFINITY_MAX = 6
+LINK_SAME_SECTION_BONUS = 2
+LINK_SEEN_PENALTY = 3
+
+
+def normalize_url(url):
+    """Normaliseer een URL voor duplicaatdetectie (fragment, trailing slash, tracking parameters)"""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower() or 'http'
+    host = (parsed.hostname or '').lower()
+    if parsed.port and not ((scheme == 'http' and parsed.port == 80) or (scheme == 'https' and parsed.port == 443)):
+        host = f"{host}:{parsed.port}"
+    path = re.sub(r'/{2,}', '/', parsed.path or '/')
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = '&'.join(sorted(
+        part for part in parsed.query.split('&')
+        if part and not part.lower().startswith('utm_') and part.split('=')[0].lower() not in TRACKING_QUERY_PARAMS
+    ))
+    return f"{scheme}://{host}{path}" + (f"?{query}" if query else '')
+
+
+def link_tokens(value):
+    """Kleine letters, zonder accenten, gesplitst op alles wat geen letter of cijfer is"""
+    value = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode('ascii')
+    return [token for token in re.split(r'[^a-z0-9]+', value.lower()) if token]
+
+
+def affinity_tokens(locatienaam=None, plaats=None):
+    """Onderscheidende tokens van de gezochte locatie (naam en plaats) voor link affinity"""
+    tokens = set(link_tokens(locatienaam or '')) | set(link_tokens(plaats or ''))
+    return {token for token in tokens if len(token) >= 3 and token not in GENERIC_NAME_TOKENS}
+
+
+def score_contact_link(text, url, affinity=frozenset(), section_path='', seen_pages=frozenset()):
+    """Score een kandidaat-link: hoe waarschijnlijker de contact/team pagina van déze locatie, hoe hoger.
+
+    Combineert woorden in de linktekst, tokens uit het pad, affinity met locatienaam/plaats, een bonus
+    voor links binnen de sectie van de startpagina en een straf voor pagina's die al gezien zijn
+    (seen_pages bevat genormaliseerde URLs).
+    """
+    text_tokens = link_tokens(text)
+    path = urlparse(url).path.lower()
+    path_tokens = link_tokens(path)
+
+    score = sum(weight for word, weight in CONTACT_LINK_WORDS.items() if word in text.lower())
+    score += sum(CONTACT_PATH_TOKENS.get(token, 0) for token in set(path_tokens)) * 0.5
+    score -= sum(1 for token in set(text_tokens) | set(path_tokens) if token in NEGATIVE_LINK_TOKENS) * 2
+    if affinity:
+        matches = affinity.intersection(text_tokens) | affinity.intersection(path_tokens)
+        score += min(len(matches) * LINK_AFFINITY_WEIGHT, LINK_AFFINITY_MAX)
+    if section_path and section_path != '/' and path.startswith(section_path.rstrip('/').lower() + '/'):
+        score += LINK_SAME_SECTION_BONUS
+    if normalize_url(url) in seen_pages:
+        score -= LINK_SEEN_PENALTY
+    return score
+
+
+def same_site(url, base_url):
+    """Zelfde website, met of zonder www."""
+    host = (urlparse(url).hostname or '').removeprefix('www.')
+    return bool(host) and host == (urlparse(base_url).hostname or '').removeprefix('www.')
+
+
+# Keten modus: padsegmenten waaronder ketens hun locatiepagina's zetten: /locaties/<plaats>/<naam>
+LOCATION_PATH_SEGMENTS = {'locaties', 'locatie', 'onze-locaties', 'vestigingen', 'vestiging', 'kinderdagverblijven',
+                          'kinderdagverblijf', 'kinderopvang', 'bso', 'buitenschoolse-opvang', 'peuteropvang', 'opvang'}
+# Segmenten die een subpagina van een locatie aangeven (/locaties/de-zon/contact), geen locatienaam
+LOCATION_SUBPAGE_TOKENS = set(CONTACT_PATH_TOKENS) | {'ons', 'fotos', 'openingstijden', 'praktisch', 'info', 'informatie',
+                                                      'rondleiding'}
+
+
+def location_slug_segments(url):
+    """Padsegmenten ná het locatiesegment (/locaties/amsterdam/de-zon -> amsterdam, de-zon), of None"""
+    segments = [segment.lower() for segment in urlparse(url).path.split('/') if segment]
+    for i, segment in enumerate(segments[:-1]):
+        if segment in LOCATION_PATH_SEGMENTS:
+            return segments[i + 1:]
+    return None
+
+
+def location_slug_tokens(url):
+    """Tokens van het pad ná het locatiesegment (/locaties/amsterdam/de-zon -> amsterdam, de, zon), of None"""
+    segments = location_slug_segments(url)
+    if not segments:
+        return None
+    tokens = link_tokens(' '.join(segments))
+    if tokens and not NEGATIVE_LINK_TOKENS.intersection(tokens):
+        return tokens
+    return None
+
+
+def has_city_segment(url):
+    """Staat er een plaats vóór de locatienaam (/locaties/<plaats>/<naam>)? Een subpagina telt niet als naam."""
+    segments = location_slug_segments(url) or []
+    return len(segments) >= 2 and not set(link_tokens(' '.join(segments[1:]))) <= LOCATION_SUBPAGE_TOKENS
+
+
+def match_location_page(entries, locatienaam, plaats):
+    """Locatiepagina uit de keten index ({"url", "tokens"}) voor een rij, of None als het niet eenduidig is.
+
+    Naam-tokens wegen zwaarder dan de plaats, en er is altijd minstens één naam-hit nodig. Zet de
+    keten de plaats in het pad, dan moet de gekozen pagina de plaats van de rij bevatten: een
+    locatie met dezelfde naam in een andere plaats is niet deze locatie.
+    """
+    plaats_tokens = affinity_tokens(None, plaats)
+    name_tokens = affinity_tokens(locatienaam) - plaats_tokens
+    if not name_tokens:
+        # Alleen algemene woorden ("Kinderopvang"): die moeten dan wel in de URL staan
+        name_tokens = {token for token in link_tokens(locatienaam or '') if len(token) >= 3} - plaats_tokens
+    if not name_tokens:
+        return None
+    needed = max(1, (len(name_tokens) + 1) // 2)
+    need_plaats = bool(plaats_tokens) and any(has_city_segment(entry["url"]) for entry in entries)
+    scored = []
+    for entry in entries:
+        tokens = set(entry["tokens"])
+        name_hits = len(name_tokens & tokens)
+        plaats_hits = len(plaats_tokens & tokens)
+        if name_hits < needed or (need_plaats and not plaats_hits):
+            continue
+        scored.append((2 * name_hits + plaats_hits, len(entry["url"]), entry["url"]))
+    if not scored:
+        return None
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    best_score, _, best_url = scored[0]
+    # Twee verschillende locaties met dezelfde score: niet gokken (subpagina's van de beste tellen niet)
+    best_path = urlparse(best_url).path.rstrip('/') + '/'
+    for score, _, url in scored[1:]:
+        if score < best_score:
+            break
+        if not urlparse(url).path.startswith(best_path):
+            return None
+    return best_url
@@ -0,0 +1,97 @@
+"""Single-flight per URL: één fetch + parse per pagina per run, gedeeld tussen alle locaties.
+
+Zonder Streamlit afhankelijkheden, zodat het delen los te testen is; app.py maakt PAGE_FLIGHT aan
+en zet die aan het begin van elke run terug met reset().
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from link_scoring import normalize_url
+from run_stats import bump_run_stat
+
+
+class PageFlight:
+    """Deelt het ophalen en parsen van een pagina tussen alle locaties in een run, per genormaliseerde URL.
+
+    Gelijktijdige aanvragers wachten op dezelfde lopende fetch (coalesced); latere aanvragers krijgen
+    het al geparste resultaat (reused). Werkt zowel vanuit de event loop (scrape_deep) als vanuit
+    worker threads (scrape_contactgegevens), vandaar concurrent.futures.Future met een lock. De sleutel
+    bevat want_links, zodat een parse zonder links niet gedeeld wordt met een aanvrager die ze nodig heeft.
+    Alleen geslaagde resultaten worden gedeeld: faalt de eigenaar (exception, cancel, of failed(value)),
+    dan wordt de entry verwijderd en probeert de volgende aanvrager het zelf.
+    """
+
+    MAX_ENTRIES = 5000
+    _RETRY = object()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._entries = {}
+
+    def _claim(self, kind, url, want_links):
+        """Geef (future, eigenaar) voor een URL; de eigenaar moet de future afronden"""
+        key = (kind, normalize_url(url), want_links)
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                bump_run_stat('singleflight_reused' if future.done() else 'singleflight_coalesced')
+                return key, future, False
+            future = self._entries[key] = Future()
+            if len(self._entries) > self.MAX_ENTRIES:
+                # Oudste afgeronde entry weg (dicts houden de invoegvolgorde aan)
+                oldest = next((k for k, f in self._entries.items() if f.done()), None)
+                if oldest is not None:
+                    del self._entries[oldest]
+            return key, future, True
+
+    def _abandon(self, key, future):
+        with self._lock:
+            if self._entries.get(key) is future:
+                del self._entries[key]
+        future.set_result(self._RETRY)
+
+    def _finish(self, key, future, value, failed):
+        if failed is not None and failed(value):
+            bump_run_stat('singleflight_failures_not_shared')
+            self._abandon(key, future)
+        else:
+            future.set_result(value)
+
+    async def run_async(self, kind, url, loader, want_links=True, failed=None):
+        """await loader() één keer per URL en deel het resultaat, tenzij failed(resultaat)"""
+        while True:
+            key, future, owner = self._claim(kind, url, want_links)
+            if not owner:
+                value = await asyncio.shield(asyncio.wrap_future(future))
+                if value is not self._RETRY:
+                    return value
+                continue
+            try:
+                value = await loader()
+            except BaseException:
+                self._abandon(key, future)
+                raise
+            self._finish(key, future, value, failed)
+            return value
+
+    def run_sync(self, kind, url, loader, want_links=True, failed=None):
+        """Zelfde als run_async, voor sync code in worker threads"""
+        while True:
+            key, future, owner = self._claim(kind, url, want_links)
+            if not owner:
+                value = future.result()
+                if value is not self._RETRY:
+                    return value
+                continue
+            try:
+                value = loader()
+            except BaseException:
+                self._abandon(key, future)
+                raise
+            self._finish(key, future, value, failed)
+            return value
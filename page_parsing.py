@@ -0,0 +1,292 @@
+"""HTML parsen en naar tekst omzetten: ParsedPage, extract_main_content en html_to_structured_text.
+
+Dit is CPU-werk zonder Streamlit afhankelijkheden, zodat parse_page in een apart workerproces (parse_worker) kan
+draaien terwijl de event loop van de crawler doorgaat met netwerk I/O.
+"""
+import re
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+from contact_extraction import deobfuscate_emails, extract_contact_data, extract_structured_contacts
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+CONTACT_SELECTORS = [
+    'div[class*="contact"]', 'div[class*="Contact"]',
+    'div[class*="team"]', 'div[class*="Team"]',
+    'div[class*="staff"]', 'div[class*="Staff"]',
+    'div[class*="medewerker"]', 'div[class*="Medewerker"]',
+    'div[class*="locatie"]', 'div[class*="Locatie"]',
+    'section[class*="contact"]', 'section[class*="team"]',
+    'footer', '.footer'
+]
+JSONLD_TYPE_RE = re.compile(r'ld\+json', re.I)
+# Waar de waarde van een microdata property staat, per tag (anders de tekst van het element)
+MICRODATA_VALUE_ATTRS = {'meta': ('content',), 'a': ('href',), 'link': ('href',), 'time': ('datetime',),
+                         'data': ('value',), 'img': ('src',)}
+_HTML_TAG_RE = re.compile(r'<(?:[a-zA-Z][\w-]*|!doctype|!--)', re.I)
+
+
+def parse_html(html):
+    """Parse HTML met de snelste beschikbare backend (lxml, anders html.parser)"""
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+class ParsedPage:
+    """Eén parse per pagina, gedeeld door tekstextractie, link discovery, contact selectors en AI voorbereiding.
+
+    script/style worden direct verwijderd (alleen JSON-LD wordt eerst bewaard). main_text snoeit de boom
+    destructief, dus links, microdata, contact_text en basic_text worden daarvoor uit de volledige boom gelezen.
+    """
+
+    def __init__(self, html):
+        self.html = html
+        self.soup = parse_html(html)
+        self.jsonld = [
+            script.string or script.get_text()
+            for script in self.soup.find_all('script', attrs={'type': JSONLD_TYPE_RE})
+        ]
+        for element in self.soup(['script', 'style']):
+            element.decompose()
+        self._links = None
+        self._microdata = None
+        self._basic_text = None
+        self._contact_text = None
+        self._main_text = None
+
+    @property
+    def links(self):
+        """(href, linktekst) van alle <a href> op de pagina"""
+        if self._links is None:
+            self._links = [(a['href'], a.get_text(strip=True)) for a in self.soup.find_all('a', href=True)]
+        return self._links
+
+    @property
+    def microdata(self):
+        """schema.org microdata als één dict {itemprop: waarde} per itemscope, met itemtype als @type.
+
+        Een geneste itemscope (bijv. address -> PostalAddress) is zelf een item én de waarde van zijn itemprop
+        in het omliggende item, zoals in JSON-LD.
+        """
+        if self._microdata is None:
+            items = {}
+
+            def item(scope):
+                if id(scope) not in items:
+                    items[id(scope)] = {'@type': scope.get('itemtype')} if scope is not None and scope.get('itemtype') else {}
+                return items[id(scope)]
+
+            for element in self.soup.find_all(attrs={'itemprop': True}):
+                scope = element.find_parent(attrs={'itemscope': True})
+                if element.has_attr('itemscope'):
+                    value = item(element)  # wordt gevuld door de props binnen deze scope
+                else:
+                    value = next((element[attr] for attr in MICRODATA_VALUE_ATTRS.get(element.name, ()) if element.has_attr(attr)),
+                                 None) or element.get_text(separator=" ", strip=True)
+                for prop in element['itemprop'].split():
+                    item(scope).setdefault(prop, value)
+            self._microdata = list(items.values())
+        return self._microdata
+
+    @property
+    def basic_text(self):
+        if self._basic_text is None:
+            self._basic_text = self.soup.get_text(separator=" ", strip=True)
+        return self._basic_text
+
+    @property
+    def contact_text(self):
+        """Tekst uit contact/team/footer blokken"""
+        if self._contact_text is None:
+            self._contact_text = "".join(
+                " " + elem.get_text(separator=" ", strip=True)
+                for selector in CONTACT_SELECTORS
+                for elem in self.soup.select(selector)
+            )
+        return self._contact_text
+
+    @property
+    def main_text(self):
+        if self._main_text is None:
+            # Eerst de views die de ongesnoeide boom nodig hebben
+            self.links, self.microdata, self.basic_text, self.contact_text
+            self._main_text = extract_main_content(self.soup)
+        return self._main_text
+
+
+def page_text(content, max_chars=None):
+    """Schone tekst voor AI/regex verwerking uit een ParsedPage, HTML of al geëxtraheerde tekst"""
+    if isinstance(content, ParsedPage):
+        text = content.main_text
+    elif content and _HTML_TAG_RE.search(content):
+        text = extract_main_content(content, max_chars)
+    else:
+        text = content or ""
+    return text[:max_chars] if max_chars is not None else text
+
+
+# Snoeiregels voor extract_main_content, vooraf opgebouwd
+UNWANTED_TAGS = frozenset(['script', 'style', 'nav', 'header', 'footer', 'aside', 'ads', 'advertisement'])
+UNWANTED_ID_RE = re.compile('nav|navigation|menu|sidebar|footer|header|advertisement|ads|social|share|breadcrumb'
+                            '|cookie|popup|modal|overlay')
+# Prioriteit van de hoofdinhoud: main, article, [role="main"], dan deze classes. '.container .content' en
+# '.wrapper .content' vallen onder '.content' en hoeven niet apart gezocht te worden.
+MAIN_CONTENT_CLASSES = ['main-content', 'content', 'post-content', 'entry-content', 'page-content', 'article-content']
+BODY_NOISE_CLASSES = frozenset(['sidebar', 'widget', 'menu', 'navigation'])
+
+
+def _main_content_rank(element, classes):
+    """Prioriteit van een kandidaat voor de hoofdinhoud (lager is beter), None als het geen kandidaat is"""
+    if element.name == 'main':
+        return 0
+    if element.name == 'article':
+        return 1
+    if element.get('role') == 'main':
+        return 2
+    for rank, cls in enumerate(MAIN_CONTENT_CLASSES, 3):
+        if cls in classes:
+            return rank
+    return None
+
+
+def extract_main_content(html, max_chars=None):
+    """Extraheert hoofdinhoud van HTML (of een al geparste soup, die in place wordt gesnoeid) en converteert naar schone tekst.
+
+    Eén iteratieve doorloop van de boom: ongewenste tags en id's worden met hun subtree verwijderd,
+    en tegelijk worden de hoofdinhoud kandidaten, de body en de body-ruis (sidebar, widget, ...) verzameld.
+    """
+    soup = html if isinstance(html, BeautifulSoup) else parse_html(html)
+
+    candidates = {}
+    body = None
+    body_noise = []
+    # (element, binnen body, binnen body-ruis), in documentvolgorde
+    stack = [(soup, False, False)]
+    while stack:
+        element, in_body, in_noise = stack.pop()
+        if element is not soup:
+            element_id = element.get('id')
+            if element.name in UNWANTED_TAGS or element_id and UNWANTED_ID_RE.search(str(element_id).lower()):
+                element.decompose()
+                continue
+            classes = element.get('class') or ()
+            rank = _main_content_rank(element, classes)
+            if rank is not None and rank not in candidates:
+                candidates[rank] = element
+            if element.name == 'body' and body is None:
+                body, in_body = element, True
+            elif in_body and not in_noise and BODY_NOISE_CLASSES.intersection(classes):
+                body_noise.append(element)
+                in_noise = True
+        stack.extend((child, in_body, in_noise) for child in reversed(element.contents) if isinstance(child, Tag))
+
+    if candidates:
+        main_content = candidates[min(candidates)]
+    elif body is not None:
+        # If no specific main content found, use body but filter more aggressively
+        main_content = body
+        for element in body_noise:
+            element.decompose()
+    else:
+        main_content = soup  # Last resort
+
+    # Convert to structured text
+    return html_to_structured_text(main_content, max_chars)
+
+
+# Structuur voor html_to_structured_text
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+BLOCK_TAGS = frozenset(['p', 'div', 'section', 'article', 'main', 'ul', 'ol', 'dl', 'dt', 'dd', 'blockquote',
+                        'address', 'form', 'fieldset', 'figure', 'figcaption', 'pre', 'hr', 'table'])
+SKIPPED_TEXT_TAGS = frozenset(['script', 'style', 'noscript', 'template'])
+
+
+def iter_structured_text(element):
+    """Loopt de boom één keer iteratief af en levert tekststukken in documentvolgorde.
+
+    Elke tekstnode wordt precies één keer uitgegeven; koppen worden '# kop', lijstitems '• item'
+    en tabelrijen 'cel | cel'. Als generator kan de aanroeper stoppen zodra er genoeg tekst is.
+    """
+    # Items op de stack zijn nodes of al klaargezette tekst (afsluitende newlines)
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str) and not isinstance(node, NavigableString):
+            yield node
+        elif isinstance(node, NavigableString):
+            if not isinstance(node, PreformattedString):  # comments, doctype, CDATA
+                text = ' '.join(node.split())
+                if text:
+                    yield text + ' '
+        elif node.name in SKIPPED_TEXT_TAGS:
+            continue
+        elif node.name == 'br':
+            yield '\n'
+        elif node.name == 'tr':
+            # Tabelrij als 'cel | cel'; cellen (inclusief geneste inhoud) in één keer
+            cells = [cell.get_text(separator=' ', strip=True) for cell in node.find_all(['td', 'th'], recursive=False)]
+            if any(cells):
+                yield '\n' + ' | '.join(cells) + '\n'
+        else:
+            if node.name in HEADING_TAGS:
+                yield '\n\n' + '#' * int(node.name[1]) + ' '
+                stack.append('\n')
+            elif node.name == 'li':
+                yield '\n• '
+            elif node.name in BLOCK_TAGS:
+                yield '\n'
+                stack.append('\n')
+            stack.extend(reversed(node.contents))
+
+
+def html_to_structured_text(element, max_chars=None):
+    """Converteert HTML element naar gestructureerde tekst, optioneel gestopt na max_chars tekens"""
+    if element is None:
+        return ""
+
+    text_parts = []
+    length = 0
+    for part in iter_structured_text(element):
+        text_parts.append(part)
+        length += len(part)
+        if max_chars is not None and length >= max_chars:
+            break
+
+    # Join and clean up
+    result = ''.join(text_parts)
+
+    # Clean up multiple newlines and spaces
+    result = re.sub(r' +', ' ', result)  # Multiple spaces to single
+    result = re.sub(r' ?\n ?', '\n', result)  # No spaces around line breaks
+    result = re.sub(r'\n{2,}(?!#)', '\n', result)  # Blank lines only before headings
+    result = result.strip()
+
+    return result[:max_chars] if max_chars is not None else result
+
+
+def parse_page(html, want_links=True):
+    """Worker voor de parse stage: één parse, en alles wat scrape_deep en scrape_contactgegevens nodig hebben
+    (regex contactgegevens uit de tekst én de betrouwbaardere structured data).
+
+    Geeft alleen picklebare waarden terug (tekst, links, contactgegevens), zodat dit in een apart proces kan draaien.
+    """
+    page = ParsedPage(html)
+    main_text = page.main_text
+    full_text = main_text + " " + page.contact_text + " " + page.basic_text
+    contact_data = extract_contact_data(full_text)
+    # Beschermde adressen (cfemail, [at]/[dot], entities, JS) die de gewone patronen missen
+    deobfuscated = deobfuscate_emails(html, full_text)
+    contact_data["emails"].extend(email for email in deobfuscated if email not in contact_data["emails"])
+    return {
+        "main_text": main_text,
+        "links": page.links if want_links else [],
+        "contact_data": contact_data,
+        "structured_data": extract_structured_contacts(page.jsonld, page.microdata, page.links),
+        "deobfuscated": deobfuscated,
+    }
@@ -0,0 +1,173 @@
+"""Parse workers als losse processen die alleen page_parsing importeren.
+
+multiprocessing met 'spawn' of 'forkserver' voert in elke worker het __main__ script opnieuw uit. Onder
+`streamlit run` is dat app.py: Supabase client, UI calls, st.secrets en de sqlite caches, per worker.
+Deze workers starten daarom als `python parse_worker.py` en krijgen hun werk als pickles over
+stdin/stdout. Een gecrashte worker wordt bij de volgende opdracht opnieuw gestart; een worker die
+langer dan de timeout over één pagina doet wordt gestopt.
+"""
+import atexit
+import os
+import pickle
+import queue
+import struct
+import subprocess
+import sys
+import threading
+from concurrent.futures import Future
+
+_HEADER = struct.Struct('>I')
+
+
+class ParseWorkerCrashed(RuntimeError):
+    """De worker is tijdens een opdracht gestopt (bijv. geheugen); de opdracht kan inline opnieuw"""
+
+
+class ParseWorkerTimeout(ParseWorkerCrashed):
+    """De worker gaf binnen de timeout geen antwoord en is gestopt"""
+
+
+def _read_frame(stream):
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise EOFError("worker stream closed")
+    size = _HEADER.unpack(header)[0]
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError("worker stream closed")
+    return pickle.loads(data)
+
+
+def _write_frame(stream, value):
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(_HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def main():
+    """Worker loop: lees (html, want_links), schrijf (ok, resultaat of exception)"""
+    from page_parsing import parse_page
+
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    sys.stdout = sys.stderr  # prints uit bibliotheken mogen het protocol niet verstoren
+    while True:
+        try:
+            args = _read_frame(stdin)
+        except EOFError:
+            return
+        try:
+            reply = (True, parse_page(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            _write_frame(stdout, reply)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            _write_frame(stdout, (False, RuntimeError(repr(reply[1]))))
+
+
+class ParseWorkerPool:
+    """Pool van `size` workerprocessen met een submit() die een concurrent.futures.Future teruggeeft.
+
+    Elke worker heeft een eigen thread die opdrachten uit één queue haalt, zodat een trage pagina
+    de andere workers niet ophoudt. Met timeout (seconden) stopt een timer een worker die blijft
+    hangen; de opdracht krijgt dan ParseWorkerTimeout en de volgende opdracht een nieuwe worker.
+    command vervangt het workerproces (voor tests). shutdown() wordt ook via atexit aangeroepen.
+    """
+
+    def __init__(self, size, timeout=None, command=None):
+        self.timeout = timeout
+        self._command = command or [sys.executable, os.path.abspath(__file__)]
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._processes = set()
+        self._closed = False
+        self._threads = [threading.Thread(target=self._run, name=f"parse-worker-{i}", daemon=True) for i in range(size)]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.shutdown)
+
+    def submit(self, html, want_links=True):
+        if self._closed:
+            raise RuntimeError("parse pool is shut down")
+        future = Future()
+        self._jobs.put((future, (html, want_links)))
+        return future
+
+    def _start(self):
+        process = subprocess.Popen(self._command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        with self._lock:
+            self._processes.add(process)
+        return process
+
+    def _stop(self, process):
+        with self._lock:
+            self._processes.discard(process)
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    def _run(self):
+        process = None
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            future, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            hung, timer = threading.Event(), None
+            try:
+                if process is None or process.poll() is not None:
+                    if process is not None:
+                        self._stop(process)
+                    process = self._start()
+                if self.timeout:
+                    # Stoppen sluit de pipe, waardoor de blokkerende read hieronder met EOFError terugkomt
+                    timer = threading.Timer(self.timeout, self._kill_hung, (process, hung))
+                    timer.daemon = True
+                    timer.start()
+                _write_frame(process.stdin, args)
+                ok, value = _read_frame(process.stdout)
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                self._stop(process)
+                process = None
+                if hung.is_set():
+                    future.set_exception(ParseWorkerTimeout(f"geen antwoord binnen {self.timeout}s"))
+                else:
+                    future.set_exception(ParseWorkerCrashed(str(e) or type(e).__name__))
+                continue
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        if process is not None:
+            self._stop(process)
+
+    @staticmethod
+    def _kill_hung(process, hung):
+        hung.set()
+        if process.poll() is None:
+            process.kill()
+
+    def shutdown(self):
+        """Stop de threads en workers; lopende opdrachten krijgen ParseWorkerCrashed"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            self._stop(process)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""Tellers voor de run samenvatting (connection reuse, cache hits, ...).
+
+Een eigen module in plaats van globals in app.py: Streamlit voert app.py bij elke rerun opnieuw uit,
+maar objecten uit st.cache_resource (browser en driver pools) leven door en zouden anders tellen in
+de RUN_STATS van de rerun waarin ze gemaakt zijn. Deze module wordt één keer geïmporteerd.
+"""
+import threading
+
+RUN_STATS = {}
+_run_stats_lock = threading.Lock()
+
+
+def bump_run_stat(key, amount=1):
+    """Verhoog een teller in de run samenvatting (thread-safe, ook vanuit worker threads)"""
+    with _run_stats_lock:
+        RUN_STATS[key] = RUN_STATS.get(key, 0) + amount
+
+
+def reset_run_stats():
+    with _run_stats_lock:
+        RUN_STATS.clear()
@@ -0,0 +1,129 @@
+"""Benchmark van de contactextractie op de vaste HTML fixtures in scripts/fixtures.
+
+Vergelijkt de oude losse patronen uit scrape_deep (drie e-mailpatronen, vier telefoonpatronen en
+per regel tot 14 keyword searches) met contact_extraction.extract_contact_data, op dezelfde tekst
+als scrape_deep opbouwt (hoofdinhoud + contactblokken + platte tekst). Daarnaast één lang woord
+zonder spaties, waarop het oude e-mailpatroon kwadratisch backtrackt. Meet CPU tijd (best of --rounds)
+en rapporteert per pad ook de doorvoer in pagina's per seconde (p/s), per fixture en over alle fixtures.
+
+    python scripts/bench_contact_extraction.py [--rounds 5] [--long-word 20000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import phonenumbers
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_extraction import extract_contact_data  # noqa: E402
+from page_parsing import ParsedPage  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+OLD_EMAIL_PATTERNS = [r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}", r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+                      r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"]
+OLD_PHONE_PATTERNS = [r'(?:\+31|0031|0)[\s\-]?6[\s\-]?[\d\s\-]{8}', r'(?:\+31|0031|0)[\s\-]?[1-9][\d\s\-]{8}',
+                      r'\b\d{2,3}[\s\-]?\d{6,7}\b', r'\b\d{10,11}\b']
+OLD_ADDRESS_PATTERNS = [r'\b[A-Z][a-z]+(?:straat|laan|weg|plein|dreef|park|square|boulevard)\s*\d+[a-z]?\b',
+                        r'\b\d{4}\s?[A-Z]{2}\s+[A-Z][a-z]+', r'\b\d{4}\s?[A-Z]{2}\b']
+OLD_MANAGER_KEYWORDS = [r'locatiemanager', r'locatie\s*manager', r'manager', r'directeur', r'directrice', r'leidinggevende',
+                        r'teamleider', r'teamleidster', r'hoofd\s*vestiging', r'vestigingsmanager', r'pedagogisch\s*medewerker',
+                        r'pm\b', r'locatiecoördinator', r'coördinator']
+OLD_NAME_PATTERNS = [r'([A-Z][a-z]+\s+[A-Z][a-z]+)', r'([A-Z]\.\s*[A-Z][a-z]+)', r'([A-Z][a-z]+\s+[A-Z]\.\s*[A-Z][a-z]+)']
+
+
+def old_extract(full_text):
+    """De extractie zoals scrape_deep die vóór contact_extraction deed"""
+    result = {"emails": set(), "telefoons": set(), "adressen": set(), "managers": set()}
+    for pattern in OLD_EMAIL_PATTERNS:
+        for email in re.findall(pattern, full_text):
+            if not any(skip in email.lower() for skip in ['@example', '@domain', '@test', 'noreply', 'no-reply']):
+                result["emails"].add(email.lower().strip())
+    phone_text = re.sub(r'[^\d\s\+\-\(\)]+', ' ', full_text)
+    for match in phonenumbers.PhoneNumberMatcher(phone_text, "NL"):
+        result["telefoons"].add(phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL))
+    for pattern in OLD_PHONE_PATTERNS:
+        for phone in re.findall(pattern, full_text):
+            if len(re.sub(r'[^\d\+]', '', phone)) >= 9:
+                result["telefoons"].add(phone.strip())
+    for pattern in OLD_ADDRESS_PATTERNS:
+        result["adressen"].update(address.strip() for address in re.findall(pattern, full_text))
+    for line in full_text.split('\n'):
+        line = line.strip()
+        if not 5 < len(line) < 100:
+            continue
+        for keyword in OLD_MANAGER_KEYWORDS:
+            if re.search(keyword, line, flags=re.IGNORECASE):
+                for name_pattern in OLD_NAME_PATTERNS:
+                    for name in re.findall(name_pattern, line):
+                        result["managers"].add(f"{name.strip()} ({keyword})")
+                if not result["managers"]:
+                    result["managers"].add(line[:80])
+                break
+    return result
+
+
+def load_texts():
+    """Per fixture de tekst zoals scrape_deep die aan de extractie geeft"""
+    texts = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+                page = ParsedPage(f.read())
+            texts[name] = page.main_text + " " + page.contact_text + " " + page.basic_text
+    return texts
+
+
+def best_time(fn, text, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.process_time()
+        fn(text)
+        best = min(best, time.process_time() - started)
+    return best
+
+
+def pages_per_second(pages, seconds):
+    return f"{pages / max(seconds, 1e-9):.0f} p/s"
+
+
+def print_row(name, text, rounds):
+    old_seconds = best_time(old_extract, text, rounds)
+    new_seconds = best_time(extract_contact_data, text, rounds)
+    print(f"{name:<26}{len(text) // 1024:>6}{old_seconds * 1000:>11.1f} ms{pages_per_second(1, old_seconds):>13}"
+          f"{new_seconds * 1000:>11.1f} ms{pages_per_second(1, new_seconds):>13}{old_seconds / max(new_seconds, 1e-9):>13.1f}x")
+    return old_seconds, new_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--long-word", type=int, default=20000, help="lengte van het woord zonder spaties (0 = overslaan)")
+    args = parser.parse_args()
+
+    texts = load_texts()
+    print(f"{'tekst':<26}{'KB':>6}{'oud':>14}{'':>13}{'nieuw':>14}{'':>13}{'versnelling':>14}")
+    totals = [0.0, 0.0]
+    for name, text in texts.items():
+        old_seconds, new_seconds = print_row(name, text, args.rounds)
+        totals[0] += old_seconds
+        totals[1] += new_seconds
+    # Doorvoer over alle fixtures: elke fixture is één pagina
+    print(f"{'totaal':<32}{totals[0] * 1000:>11.1f} ms{pages_per_second(len(texts), totals[0]):>13}"
+          f"{totals[1] * 1000:>11.1f} ms{pages_per_second(len(texts), totals[1]):>13}"
+          f"{totals[0] / max(totals[1], 1e-9):>13.1f}x")
+    if args.long_word:
+        print_row(f"woord van {args.long_word} tekens", "x" * args.long_word + " info@kdv.nl", args.rounds)
+
+    # De nieuwe extractie moet minstens dezelfde e-mailadressen vinden
+    for name, text in texts.items():
+        missing = {email.lower() for email in old_extract(text)["emails"]} - set(extract_contact_data(text)["emails"])
+        if missing:
+            print(f"LET OP: {name} mist {', '.join(sorted(missing))}")
+
+
+if __name__ == "__main__":
+    main()
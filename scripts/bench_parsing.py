@@ -0,0 +1,91 @@
+"""Benchmark van de parse stage op de vaste HTML fixtures in scripts/fixtures.
+
+Vergelijkt de oude aanpak (extract_main_content parset zelf, daarna een tweede parse voor links,
+platte tekst en contactblokken) met ParsedPage (één parse, gedeeld door alle views), per HTML parser.
+Meet CPU tijd (best of --rounds) zodat andere processen op de machine weinig uitmaken.
+
+    python scripts/bench_parsing.py [--rounds 7]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_parsing  # noqa: E402
+from page_parsing import CONTACT_SELECTORS, ParsedPage, extract_main_content, parse_html  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixtures():
+    pages = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+                pages[name] = f.read()
+    return pages
+
+
+def parse_twice(html):
+    """Oude aanpak: hoofdinhoud en de overige views elk uit een eigen parse"""
+    main_text = extract_main_content(html)
+    soup = parse_html(html)
+    for element in soup(["script", "style"]):
+        element.extract()
+    basic_text = soup.get_text(separator=" ", strip=True)
+    contact_text = "".join(" " + elem.get_text(separator=" ", strip=True)
+                           for selector in CONTACT_SELECTORS for elem in soup.select(selector))
+    links = [(a["href"], a.get_text(strip=True)) for a in soup.find_all("a", href=True)]
+    return main_text, basic_text, contact_text, links
+
+
+def parse_once(html):
+    page = ParsedPage(html)
+    return page.main_text, page.basic_text, page.contact_text, page.links
+
+
+def best_time(fn, html, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.process_time()
+        fn(html)
+        best = min(best, time.process_time() - started)
+    return best
+
+
+def use_parser(name):
+    page_parsing.HTML_PARSER = name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    pages = load_fixtures()
+    parsers = ["html.parser"] + (["lxml"] if page_parsing.HTML_PARSER == "lxml" else [])
+    variants = [("2x html.parser (oud)", "html.parser", parse_twice)] + [
+        (f"1x {name} (ParsedPage)", name, parse_once) for name in parsers]
+
+    print(f"{'fixture':<22}{'KB':>6}" + "".join(f"{label:>30}" for label, _, _ in variants))
+    totals = [0.0] * len(variants)
+    for fixture, html in pages.items():
+        row = f"{fixture:<22}{len(html) // 1024:>6}"
+        for i, (_, parser_name, fn) in enumerate(variants):
+            use_parser(parser_name)
+            seconds = best_time(fn, html, args.rounds)
+            totals[i] += seconds
+            row += f"{seconds * 1000:>27.1f} ms"
+        print(row)
+    print(f"{'totaal':<28}" + "".join(f"{seconds * 1000:>27.1f} ms" for seconds in totals))
+
+    # Zelfde uitkomst, anders zegt de tijdwinst niets
+    use_parser("html.parser")
+    different = [fixture for fixture, html in pages.items() if parse_twice(html) != parse_once(html)]
+    print(f"LET OP: uitkomst verschilt voor {', '.join(different)}" if different else "Uitkomst gelijk voor alle fixtures")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import sqlite3
+import time
+
+from ai_cache import AiResultCache
+
+RESULT = {"emails": ["info@kdv.nl"], "telefoons": [], "confidence": 0.9}
+
+
+def keys(path):
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute("SELECT cache_key FROM ai_cache")}
+
+
+def test_key_is_the_content_not_the_whitespace_or_url():
+    cache = AiResultCache("unused.sqlite")
+    key = cache.key("Mail ons:\n  info@kdv.nl", "gpt-4", "prompt")
+    assert key == cache.key("Mail ons: info@kdv.nl ", "gpt-4", "prompt")
+    assert key != cache.key("Mail ons: team@kdv.nl", "gpt-4", "prompt")
+    assert key != cache.key("Mail ons: info@kdv.nl", "gpt-3.5-turbo", "prompt")
+    assert key != cache.key("Mail ons: info@kdv.nl", "gpt-4", "andere prompt")
+    assert key != AiResultCache("unused.sqlite", prompt_version=2).key("Mail ons: info@kdv.nl", "gpt-4", "prompt")
+
+
+def test_hit_and_miss(tmp_path):
+    cache = AiResultCache(str(tmp_path / "ai.sqlite"))
+    key = cache.key("Mail ons: info@kdv.nl", "gpt-4", "prompt")
+    assert cache.get(key) is None
+    cache.store(key, "gpt-4", RESULT, 120, 40)
+    assert cache.get(key) == {"result": RESULT, "prompt_tokens": 120, "completion_tokens": 40}
+    assert cache.get(cache.key("Mail ons: team@kdv.nl", "gpt-4", "prompt")) is None
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = AiResultCache(str(tmp_path / "ai.sqlite"), ttl=3600)
+    cache.store("a", "gpt-4", RESULT, 1, 1)
+    cache.ttl = 0
+    assert cache.get("a") is None
+
+
+def test_eviction_drops_expired_then_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(AiResultCache, "EVICT_EVERY", 1)
+    path = str(tmp_path / "ai.sqlite")
+    entry_bytes = len('{"n": 0, "pad": "' + "x" * 100 + '"}')
+    cache = AiResultCache(path, ttl=3600, max_bytes=int(2.5 * entry_bytes))
+    for name in ["a", "b"]:
+        cache.store(name, "gpt-4", {"n": 0, "pad": "x" * 100}, 1, 1)
+        time.sleep(0.01)
+    assert cache.get("a")  # a is nu recenter gebruikt dan b
+    time.sleep(0.01)
+    cache.store("c", "gpt-4", {"n": 0, "pad": "x" * 100}, 1, 1)
+    assert keys(path) == {"a", "c"}
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE ai_cache SET created_at = ? WHERE cache_key = 'c'", (time.time() - 7200,))
+    cache.store("d", "gpt-4", {"n": 0, "pad": "x" * 100}, 1, 1)
+    assert keys(path) == {"a", "d"}
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import ai_client
+from ai_client import AiRateLimiter, chat_completion, extract_unique, parse_rate_limit_reset
+from run_stats import RUN_STATS, reset_run_stats
+
+
+class FakeCompletionsApi:
+    """Chat completions endpoint dat per prompt een lijst statussen afspeelt en de gelijktijdigheid meet"""
+
+    def __init__(self, script, delay=0.05):
+        self.script = script  # prompt -> [(status, headers), ...]; daarna 200
+        self.delay = delay
+        self.calls = {}
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, request):
+        prompt = (await request.json())["messages"][-1]["content"]
+        self.calls[prompt] = self.calls.get(prompt, 0) + 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        steps = self.script.get(prompt, [])
+        if self.calls[prompt] <= len(steps):
+            status, headers = steps[self.calls[prompt] - 1]
+            return web.Response(status=status, text="busy", headers=headers)
+        body = {"choices": [{"message": {"content": json.dumps({"emails": [prompt]})}}], "usage": {"total_tokens": 10}}
+        return web.json_response(body, headers={"x-ratelimit-remaining-requests": "100",
+                                                "x-ratelimit-remaining-tokens": "100000",
+                                                "x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "6m0s"})
+
+
+def run_against(api, coroutine_fn):
+    async def main():
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", api.handle)
+        async with TestServer(app) as server, aiohttp.ClientSession() as session:
+            return await coroutine_fn(str(server.make_url("/v1")), session)
+    return asyncio.run(main())
+
+
+def payload(prompt):
+    return {"model": "test", "messages": [{"role": "user", "content": prompt}]}
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(ai_client.DomainScheduler, "backoff_delay", staticmethod(lambda attempt: 0.01))
+    reset_run_stats()
+    yield
+    reset_run_stats()
+
+
+def test_parse_rate_limit_reset():
+    assert parse_rate_limit_reset("6m0s") == 360
+    assert parse_rate_limit_reset("20ms") == pytest.approx(0.02)
+    assert parse_rate_limit_reset("1.5") == 1.5
+    assert parse_rate_limit_reset("") is None and parse_rate_limit_reset("soon") is None
+
+
+def test_retries_429_with_retry_after_and_503():
+    api = FakeCompletionsApi({"a": [(429, {"Retry-After": "1"}), (503, {})]})
+
+    async def call(base, session):
+        return await chat_completion(session, base, "key", payload("a"), AiRateLimiter(2), 10, max_attempts=4)
+
+    started = time.monotonic()
+    data, error = run_against(api, call)
+    assert error is None and json.loads(data["choices"][0]["message"]["content"]) == {"emails": ["a"]}
+    assert api.calls == {"a": 3}
+    assert RUN_STATS["ai_retries"] == 2
+    assert time.monotonic() - started >= 1.0  # Retry-After is gerespecteerd
+
+
+def test_gives_up_after_max_attempts_and_on_client_errors():
+    api = FakeCompletionsApi({"a": [(503, {})] * 5, "b": [(401, {})]})
+
+    async def call(base, session):
+        limiter = AiRateLimiter(2)
+        return (await chat_completion(session, base, "key", payload("a"), limiter, 10, max_attempts=3),
+                await chat_completion(session, base, "key", payload("b"), limiter, 10, max_attempts=3))
+
+    (data_a, error_a), (data_b, error_b) = run_against(api, call)
+    assert data_a is None and "HTTP 503" in error_a and api.calls["a"] == 3
+    assert data_b is None and "HTTP 401" in error_b and api.calls["b"] == 1
+
+
+def test_concurrency_cap_and_deduplication():
+    api = FakeCompletionsApi({})
+    contents = [(f"methode {i}", f"pagina {i % 4}") for i in range(12)]
+
+    async def call(base, session):
+        limiter = AiRateLimiter(concurrency=2)
+
+        async def extract(content):
+            data, error = await chat_completion(session, base, "key", payload(content), limiter, 10)
+            return {"success": error is None, "content": content}
+
+        return await extract_unique(contents, extract)
+
+    results = run_against(api, call)
+    assert [method for method, _ in results] == [method for method, _ in contents]
+    assert all(result["content"] == content for (_, content), (_, result) in zip(contents, results))
+    assert api.calls == {f"pagina {i}": 1 for i in range(4)}
+    assert api.max_active == 2
+
+
+def test_update_subtracts_in_flight_reservations():
+    async def main():
+        limiter = AiRateLimiter(concurrency=4)
+        async with limiter.slot(500) as first, limiter.slot(300):
+            # De headers van de eerste response kennen de tweede call (nog onderweg) niet
+            limiter.update({"x-ratelimit-remaining-requests": "10", "x-ratelimit-remaining-tokens": "2000",
+                            "x-ratelimit-reset-tokens": "1m"}, first)
+            assert limiter.budgets["requests"]["remaining"] == 9
+            assert limiter.budgets["tokens"]["remaining"] == 1700
+        assert limiter.in_flight == {"requests": 0, "tokens": 0}
+        assert limiter._wait_time(1800) > 0 and limiter._wait_time(1000) <= 0
+
+    asyncio.run(main())
+
+
+def test_waits_for_token_budget_reset():
+    api = FakeCompletionsApi({}, delay=0)
+
+    async def call(base, session):
+        limiter = AiRateLimiter(1)
+        limiter.update({"x-ratelimit-remaining-tokens": "5", "x-ratelimit-reset-tokens": "300ms"})
+        return await chat_completion(session, base, "key", payload("a"), limiter, 10)
+
+    data, error = run_against(api, call)
+    assert error is None and RUN_STATS["ai_rate_limit_waits"] >= 1
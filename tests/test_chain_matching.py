@@ -0,0 +1,60 @@
+from link_scoring import has_city_segment, location_slug_tokens, match_location_page
+
+
+def entries(*urls):
+    return [{"url": url, "tokens": location_slug_tokens(url)} for url in urls]
+
+
+CHAIN = entries(
+    "https://keten.nl/locaties/amsterdam/de-zon",
+    "https://keten.nl/locaties/amsterdam/de-zon/contact",
+    "https://keten.nl/locaties/amsterdam/het-bos",
+    "https://keten.nl/locaties/den-haag/het-bos",
+    "https://keten.nl/locaties/utrecht/de-maan",
+)
+
+
+def test_location_slug_tokens():
+    assert location_slug_tokens("https://keten.nl/locaties/den-haag/De-Zon/") == ["den", "haag", "de", "zon"]
+    assert location_slug_tokens("https://keten.nl/locaties/vacatures") is None
+    assert location_slug_tokens("https://keten.nl/over-ons/team") is None
+    assert location_slug_tokens("https://keten.nl/locaties") is None
+
+
+def test_has_city_segment():
+    assert has_city_segment("https://keten.nl/locaties/amsterdam/de-zon")
+    assert not has_city_segment("https://keten.nl/locaties/de-zon/contact")
+    assert not has_city_segment("https://keten.nl/locaties/de-zon")
+
+
+def test_match_by_name_and_plaats():
+    assert match_location_page(CHAIN, "KDV De Zon", "Amsterdam") == "https://keten.nl/locaties/amsterdam/de-zon"
+    assert match_location_page(CHAIN, "Het Bos", "Den Haag") == "https://keten.nl/locaties/den-haag/het-bos"
+
+
+def test_same_name_in_other_city_is_not_matched():
+    assert match_location_page(CHAIN, "De Zon", "Den Haag") is None
+    assert match_location_page(CHAIN, "De Zon", "Rotterdam") is None
+
+
+def test_city_alone_is_not_a_match():
+    assert match_location_page(CHAIN, "Kinderopvang", "Utrecht") is None
+    assert match_location_page(CHAIN, "", "Utrecht") is None
+
+
+def test_generic_name_still_needs_a_name_hit():
+    chain = entries("https://keten.nl/locaties/utrecht/kinderopvang-centrum", "https://keten.nl/locaties/utrecht/de-maan")
+    assert match_location_page(chain, "Kinderopvang", "Utrecht") == "https://keten.nl/locaties/utrecht/kinderopvang-centrum"
+
+
+def test_tie_between_locations_is_not_guessed():
+    chain = entries("https://keten.nl/locaties/zon-noord", "https://keten.nl/locaties/zon-zuid")
+    assert match_location_page(chain, "De Zon", "Utrecht") is None
+    # Een subpagina van de beste locatie is geen tweede kandidaat
+    chain = entries("https://keten.nl/locaties/zon", "https://keten.nl/locaties/zon/contact")
+    assert match_location_page(chain, "De Zon", "Utrecht") == "https://keten.nl/locaties/zon"
+
+
+def test_chain_without_city_segments_matches_on_name():
+    chain = entries("https://keten.nl/locaties/de-zon", "https://keten.nl/locaties/de-maan/contact")
+    assert match_location_page(chain, "De Zon", "Den Haag") == "https://keten.nl/locaties/de-zon"
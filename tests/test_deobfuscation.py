@@ -0,0 +1,69 @@
+import pytest
+
+from contact_extraction import decode_cfemail, deobfuscate_emails
+
+
+def cfemail(email, key=0x5a):
+    return f"{key:02x}" + "".join(f"{ord(char) ^ key:02x}" for char in email)
+
+
+def test_decode_cfemail():
+    assert decode_cfemail(cfemail("info@kdv.nl")) == "info@kdv.nl"
+    assert decode_cfemail(cfemail("Jan.Jansen@KDV.nl", key=0x13)) == "jan.jansen@kdv.nl"
+    assert decode_cfemail("zz12") is None
+    assert decode_cfemail(cfemail("geen adres")) is None
+
+
+def test_cfemail_attribute_and_link():
+    raw = (f'<a class="__cf_email__" data-cfemail="{cfemail("info@kdv.nl")}">[email&#160;protected]</a>'
+           f'<a href="/cdn-cgi/l/email-protection#{cfemail("team@kdv.nl")}">mail</a>')
+    assert deobfuscate_emails(raw, "[email protected] mail") == {"info@kdv.nl": "cfemail", "team@kdv.nl": "cfemail"}
+
+
+@pytest.mark.parametrize("text", [
+    "Mail: info[at]kdv[dot]nl",
+    "Mail: info [at] kdv [punt] nl",
+    "Mail: info(at)kdv.nl",
+    "Mail: info (@) kdv (dot) nl",
+    "Mail: info{at}kdv{dot}nl",
+    "Mail: info AT kdv DOT nl",
+    "Mail: info at kdv dot nl",
+    "Mail: Info At Kdv Dot NL.",
+    "Mail: info at kdv punt nl",
+])
+def test_at_dot_variants(text):
+    assert deobfuscate_emails("", text) == {"info@kdv.nl": "at_dot"}
+
+
+@pytest.mark.parametrize("text", [
+    "Wij zijn bereikbaar at kdv.nl",  # geen uitgeschreven punt: gewone tekst
+    "Look at this dot",
+    "Mail info@kdv.nl of info at kdv dot nl",  # staat al gewoon in de tekst
+])
+def test_at_dot_negative(text):
+    assert deobfuscate_emails("", text) == {}
+
+
+def test_entity_encoded_address():
+    raw = "<p>&#105;&#110;&#102;&#111;&#64;&#107;&#100;&#118;&#46;&#110;&#108;</p><p>&#x6a;an&#x40;kdv.nl</p>"
+    assert deobfuscate_emails(raw, "") == {"info@kdv.nl": "entities", "jan@kdv.nl": "entities"}
+
+
+def test_js_concat_and_escapes():
+    raw = """<script>
+        var a = 'info' + '@' + 'kdv.nl';
+        var b = "mailto:" + "jan" + "\\x40kdv" + "\\x2enl";
+        var c = 'Mail ons: ' + 'team' + '@' + 'kdv.nl';
+        var d = "piet\\u0040kdv.nl";
+    </script>"""
+    assert deobfuscate_emails(raw, "") == {"info@kdv.nl": "javascript", "jan@kdv.nl": "javascript",
+                                           "team@kdv.nl": "javascript", "piet@kdv.nl": "javascript"}
+
+
+def test_js_concat_does_not_join_unrelated_literals():
+    raw = """<script>
+        var label = 'Bel ons' + 'info@kdv.nl';
+        var x = "foo" + "bar"; var y = "@" + "kdv";
+        el.title = 'Neem contact op' + '@kdv.nl';
+    </script>"""
+    assert deobfuscate_emails(raw, "") == {}
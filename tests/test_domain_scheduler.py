@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import domain_scheduler
+from domain_scheduler import DomainScheduler, domain_key, parse_retry_after
+from run_stats import RUN_STATS, reset_run_stats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(domain_scheduler.time, "monotonic", clock)
+    return clock
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("0.5") == 0.5
+    assert parse_retry_after("-3") == 0.0
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=90)
+    assert 85 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 90
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_parse_retry_after_invalid():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("morgen") is None
+
+
+def test_domain_key_groups_subdomains():
+    assert domain_key("https://www.keten.nl/a") == domain_key("https://locaties.keten.nl/b") == "keten.nl"
+    assert domain_key("http://127.0.0.1:8000/") == "127.0.0.1"
+
+
+def test_bucket_allows_burst_then_queues(clock):
+    scheduler = DomainScheduler(rate=2.0, burst=3)
+    assert [scheduler._reserve("https://keten.nl/") for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Bucket leeg: elk volgend verzoek wacht 1/rate langer
+    assert scheduler._reserve("https://www.keten.nl/") == pytest.approx(0.5)
+    assert scheduler._reserve("https://keten.nl/x") == pytest.approx(1.0)
+    # Ander domein heeft een eigen bucket
+    assert scheduler._reserve("https://andere.nl/") == 0.0
+
+
+def test_bucket_refills_at_rate(clock):
+    scheduler = DomainScheduler(rate=2.0, burst=2)
+    scheduler._reserve("https://keten.nl/")
+    scheduler._reserve("https://keten.nl/")
+    assert scheduler._reserve("https://keten.nl/") == pytest.approx(0.5)
+    clock.now += 2.0  # 4 tokens bijgevuld, begrensd op burst (2) min de uitstaande -1
+    assert scheduler._reserve("https://keten.nl/") == 0.0
+    assert scheduler._reserve("https://keten.nl/") == pytest.approx(0.0)
+    assert scheduler._reserve("https://keten.nl/") == pytest.approx(0.5)
+
+
+def test_penalize_blocks_domain_for_retry_after(clock):
+    scheduler = DomainScheduler(rate=10.0, burst=5)
+    assert scheduler.penalize("https://keten.nl/", retry_after=30) == 30
+    assert scheduler._reserve("https://www.keten.nl/contact") == pytest.approx(30.0)
+    clock.now += 31
+    assert scheduler._reserve("https://keten.nl/") == 0.0
+
+
+def test_penalize_caps_delay_and_falls_back_to_backoff(clock, monkeypatch):
+    scheduler = DomainScheduler()
+    assert scheduler.penalize("https://keten.nl/", retry_after=3600) == domain_scheduler.BACKOFF_MAX_SECONDS
+    monkeypatch.setattr(domain_scheduler.random, "uniform", lambda low, high: high)
+    assert scheduler.penalize("https://andere.nl/", attempt=2) == 4.0
+    assert DomainScheduler.backoff_delay(10) == domain_scheduler.BACKOFF_MAX_SECONDS
+
+
+def test_retry_budget_is_shared_and_resets():
+    reset_run_stats()
+    scheduler = DomainScheduler(retry_budget=2)
+    assert scheduler.take_retry() and scheduler.take_retry()
+    assert not scheduler.take_retry()
+    assert RUN_STATS["retries"] == 2 and RUN_STATS["retry_budget_exhausted"] == 1
+    scheduler.reset()
+    assert scheduler.take_retry()
+    reset_run_stats()
+
+
+def test_acquire_sleeps_for_reserved_wait(clock, monkeypatch):
+    slept = []
+    monkeypatch.setattr(domain_scheduler.time, "sleep", slept.append)
+    scheduler = DomainScheduler(rate=1.0, burst=1)
+    scheduler.acquire_sync("https://keten.nl/")
+    scheduler.acquire_sync("https://keten.nl/")
+    assert slept == [pytest.approx(1.0)]
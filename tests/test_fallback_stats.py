@@ -0,0 +1,55 @@
+import sqlite3
+import time
+
+from fallback_stats import FallbackStats
+
+METHODS = ["Selenium", "Curl", "Wayback"]
+
+
+def stats(tmp_path, **kwargs):
+    return FallbackStats(str(tmp_path / "fallback.sqlite"), **kwargs)
+
+
+def test_fastest_successful_method_comes_first(tmp_path):
+    fallback = stats(tmp_path)
+    fallback.record("https://kdv.nl/", "Selenium", True, 8.0)
+    fallback.record("https://kdv.nl/contact", "Curl", True, 1.5)
+    fallback.record("https://kdv.nl/", "Wayback", False, 3.0)
+    assert fallback.plan("https://www.kdv.nl/", METHODS) == (["Curl", "Selenium"], [])
+    assert fallback.plan("https://andere.nl/", METHODS) == ([], [])
+
+
+def test_method_is_skipped_after_consecutive_failures(tmp_path):
+    fallback = stats(tmp_path, skip_after_failures=3)
+    for _ in range(2):
+        fallback.record("https://kdv.nl/", "Selenium", False, 20.0)
+    assert fallback.plan("https://kdv.nl/", METHODS) == ([], [])
+    fallback.record("https://kdv.nl/", "Selenium", False, 20.0)
+    assert fallback.plan("https://kdv.nl/", METHODS) == ([], ["Selenium"])
+
+
+def test_success_resets_the_failure_streak(tmp_path):
+    fallback = stats(tmp_path, skip_after_failures=3)
+    for success in [False, False, True, False, False]:
+        fallback.record("https://kdv.nl/", "Curl", success, 2.0)
+    assert fallback.plan("https://kdv.nl/", METHODS)[1] == []
+
+
+def test_skipped_method_gets_a_new_chance_after_one_half_life(tmp_path):
+    fallback = stats(tmp_path, half_life_days=1, skip_after_failures=3)
+    for _ in range(3):
+        fallback.record("https://kdv.nl/", "Selenium", False, 20.0)
+    assert fallback.plan("https://kdv.nl/", METHODS)[1] == ["Selenium"]
+    with sqlite3.connect(fallback.path) as conn:
+        conn.execute("UPDATE method_stats SET updated_at = ?", (time.time() - 2 * 24 * 3600,))
+    assert fallback.plan("https://kdv.nl/", METHODS)[1] == []
+    # De volgende mislukking telt door op de reeks: meteen weer overslaan
+    fallback.record("https://kdv.nl/", "Selenium", False, 20.0)
+    assert fallback.plan("https://kdv.nl/", METHODS)[1] == ["Selenium"]
+
+
+def test_report_percentiles_and_sample_cap(tmp_path):
+    fallback = stats(tmp_path, latency_samples=4)
+    for latency, success in [(9.0, False), (1.0, True), (2.0, True), (3.0, False), (4.0, True)]:
+        fallback.record("https://kdv.nl/", "Curl", success, latency)
+    assert fallback.report() == [{'Methode': "Curl", 'Pogingen': 4, 'Succes %': 75.0, 'p50 (s)': 3.0, 'p95 (s)': 4.0}]
@@ -0,0 +1,54 @@
+import pytest
+
+from html_stream import StreamingHtmlDecoder, is_binary_url, is_html_content_type
+from run_stats import RUN_STATS, reset_run_stats
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_run_stats()
+    yield
+    reset_run_stats()
+
+
+def feed_all(decoder, data, chunk_size):
+    for i in range(0, len(data), chunk_size):
+        if not decoder.feed(data[i:i + chunk_size]):
+            break
+    return decoder.finish()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+def test_multibyte_characters_split_across_chunks(chunk_size):
+    html = "<html><body><p>Crèche Één — 日本語 ✓</p></body></html>"
+    assert feed_all(StreamingHtmlDecoder("utf-8"), html.encode("utf-8"), chunk_size) == html
+
+
+def test_charset_from_meta_tag_when_header_has_none():
+    html = '<html><head><meta charset="windows-1252"></head><body><p>Crèche</p></body></html>'
+    assert feed_all(StreamingHtmlDecoder(None), html.encode("cp1252"), 5) == html
+
+
+def test_byte_budget_cuts_off_and_drops_the_half_tag():
+    data = b"<html><body><p>" + b"x" * 50 + b'</p><img src="data:image/png;base64,' + b"A" * 200
+    decoder = StreamingHtmlDecoder("utf-8", max_bytes=100)
+    html = feed_all(decoder, data, 16)
+    assert decoder.truncated and decoder.received == 100
+    assert html.endswith("</p>") and "<img" not in html
+    assert RUN_STATS["fetch_truncated"] == 1 and RUN_STATS["fetch_bytes_read"] == 100
+
+
+def test_stops_at_body_end_but_not_inside_script():
+    data = (b"<html><body><script>document.write('</body>')</script><p>na script</p></bo"
+            b"dy></html>" + b"<!--" + b"x" * 10000)
+    decoder = StreamingHtmlDecoder("utf-8")
+    html = feed_all(decoder, data, 8)
+    assert decoder.body_complete and not decoder.truncated
+    assert "na script" in html and decoder.received <= StreamingHtmlDecoder.SNIFF_BYTES + 8  # niet de hele staart
+    assert RUN_STATS["fetch_early_stops"] == 1
+
+
+def test_content_type_and_binary_url_checks():
+    assert is_html_content_type("text/html; charset=utf-8") and is_html_content_type(None)
+    assert not is_html_content_type("application/pdf")
+    assert is_binary_url("https://kdv.nl/folder.PDF") and not is_binary_url("https://kdv.nl/contact")
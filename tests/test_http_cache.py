@@ -0,0 +1,104 @@
+import base64
+import os
+import sqlite3
+import time
+import zlib
+
+import pytest
+
+from http_cache import HttpCache
+from run_stats import RUN_STATS, reset_run_stats
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_run_stats()
+    yield
+    reset_run_stats()
+
+
+def page(i, size=2000):
+    """Slecht comprimeerbare body; opgeslagen ongeveer PAGE_BYTES groot"""
+    return base64.b64encode(os.urandom(size)).decode() + f"<p>pagina {i}</p>"
+
+
+PAGE_BYTES = len(zlib.compress(page(0).encode()))
+
+
+def keys(path):
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute("SELECT url_key FROM http_cache")}
+
+
+def test_store_get_and_revalidation_headers(tmp_path):
+    cache = HttpCache(str(tmp_path / "http.sqlite"), fresh_seconds=60)
+    assert cache.get("https://kdv.nl/contact") is None
+    cache.store("https://kdv.nl/contact/?utm_source=x", "<p>hallo</p>", etag='"abc"', last_modified="Tue, 01 Oct 2024 10:00:00 GMT")
+    entry = cache.get("https://KDV.nl/contact#team")
+    assert cache.text(entry) == "<p>hallo</p>" and cache.is_fresh(entry)
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"abc"', "If-Modified-Since": "Tue, 01 Oct 2024 10:00:00 GMT"}
+    assert cache.conditional_headers(None) == {}
+    cache.fresh_seconds = 0
+    assert not cache.is_fresh(cache.get("https://kdv.nl/contact"))
+    cache.touch("https://kdv.nl/contact")
+    cache.fresh_seconds = 60
+    assert cache.is_fresh(cache.get("https://kdv.nl/contact"))
+
+
+def test_size_cap_holds_after_every_store(tmp_path):
+    path = str(tmp_path / "http.sqlite")
+    cache = HttpCache(path, max_bytes=int(4.5 * PAGE_BYTES))
+    for i in range(12):
+        cache.store(f"https://kdv.nl/{i}", page(i))
+        with sqlite3.connect(path) as conn:
+            total = conn.execute("SELECT SUM(size) FROM http_cache").fetchone()[0]
+        assert total <= cache.max_bytes
+        assert cache._total_bytes == total
+    assert len(keys(path)) == 4 and RUN_STATS["http_cache_evictions"] == 8
+
+
+def test_replacing_an_entry_does_not_count_twice(tmp_path):
+    cache = HttpCache(str(tmp_path / "http.sqlite"), max_bytes=2 * PAGE_BYTES)
+    for _ in range(10):
+        cache.store("https://kdv.nl/", page(0))
+    assert cache._total_bytes < 2 * PAGE_BYTES
+    assert "http_cache_evictions" not in RUN_STATS
+
+
+def test_running_total_starts_from_existing_database(tmp_path):
+    path = str(tmp_path / "http.sqlite")
+    first = HttpCache(path, max_bytes=100 * PAGE_BYTES)
+    for i in range(4):
+        first.store(f"https://kdv.nl/{i}", page(i))
+        time.sleep(0.01)
+    second = HttpCache(path, max_bytes=int(3.5 * PAGE_BYTES))
+    second.store("https://kdv.nl/nieuw", page(9))
+    assert keys(path) == {"https://kdv.nl/2", "https://kdv.nl/3", "https://kdv.nl/nieuw"}
+
+
+def test_eviction_is_least_recently_used_with_pending_hits(tmp_path):
+    path = str(tmp_path / "http.sqlite")
+    cache = HttpCache(path, max_bytes=int(3.5 * PAGE_BYTES))
+    for i in range(3):
+        cache.store(f"https://kdv.nl/{i}", page(i))
+        time.sleep(0.01)
+    cache.mark_used("https://kdv.nl/0")  # alleen in het geheugen, wordt vóór eviction weggeschreven
+    cache.store("https://kdv.nl/3", page(3))
+    assert keys(path) == {"https://kdv.nl/0", "https://kdv.nl/2", "https://kdv.nl/3"}
+
+
+def test_hits_are_flushed_in_batches(tmp_path, monkeypatch):
+    path = str(tmp_path / "http.sqlite")
+    cache = HttpCache(path)
+    monkeypatch.setattr(HttpCache, "ACCESS_FLUSH_EVERY", 3)
+    for i in range(3):
+        cache.store(f"https://kdv.nl/{i}", "x")
+    before = {key: access for key, access in sqlite3.connect(path).execute("SELECT url_key, last_access FROM http_cache")}
+    time.sleep(0.01)
+    cache.mark_used("https://kdv.nl/0")
+    cache.mark_used("https://kdv.nl/1")
+    assert "http_cache_access_flushes" not in RUN_STATS
+    cache.mark_used("https://kdv.nl/2")
+    assert RUN_STATS["http_cache_access_flushes"] == 1
+    after = {key: access for key, access in sqlite3.connect(path).execute("SELECT url_key, last_access FROM http_cache")}
+    assert all(after[key] > before[key] for key in before)
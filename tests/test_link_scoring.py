@@ -0,0 +1,46 @@
+from link_scoring import affinity_tokens, normalize_url, same_site, score_contact_link
+
+
+def test_normalize_url_drops_fragment_tracking_and_trailing_slash():
+    assert normalize_url("HTTPS://WWW.Kdv.nl:443//contact/?utm_source=x&b=2&a=1&fbclid=abc#top") == \
+        "https://www.kdv.nl/contact?a=1&b=2"
+    assert normalize_url("http://kdv.nl") == "http://kdv.nl/"
+    assert normalize_url("http://kdv.nl:8080/team/") == "http://kdv.nl:8080/team"
+
+
+def test_same_site_ignores_www():
+    assert same_site("https://www.kdv.nl/contact", "http://kdv.nl/")
+    assert not same_site("https://andere.nl/contact", "https://kdv.nl/")
+    assert not same_site("mailto:info@kdv.nl", "https://kdv.nl/")
+
+
+def test_affinity_tokens_skip_generic_words_and_accents():
+    assert affinity_tokens("Kinderdagverblijf De Zonnebloem", "Den Haag") == {"zonnebloem", "den", "haag"}
+    assert affinity_tokens("BSO Café Één", None) == {"cafe"}
+
+
+def test_link_ranking_order():
+    affinity = affinity_tokens("KDV De Zonnebloem", "Utrecht")
+    links = [
+        ("Vacatures", "https://kdv.nl/werken-bij/vacatures"),
+        ("Nieuws", "https://kdv.nl/nieuws"),
+        ("Over ons", "https://kdv.nl/over-ons"),
+        ("Contact", "https://kdv.nl/contact"),
+        ("De Zonnebloem", "https://kdv.nl/locaties/utrecht/zonnebloem"),
+        ("Contact", "https://kdv.nl/locaties/utrecht/zonnebloem/contact"),
+    ]
+    ranked = sorted(links, key=lambda link: -score_contact_link(link[0], link[1], affinity, "/locaties/utrecht/zonnebloem"))
+    assert [url for _, url in ranked] == [
+        "https://kdv.nl/locaties/utrecht/zonnebloem/contact",
+        "https://kdv.nl/locaties/utrecht/zonnebloem",
+        "https://kdv.nl/contact",
+        "https://kdv.nl/over-ons",
+        "https://kdv.nl/nieuws",
+        "https://kdv.nl/werken-bij/vacatures",
+    ]
+
+
+def test_seen_pages_are_penalized():
+    fresh = score_contact_link("Contact", "https://kdv.nl/contact/")
+    seen = score_contact_link("Contact", "https://kdv.nl/contact/", seen_pages={normalize_url("https://kdv.nl/contact")})
+    assert seen < fresh
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from page_flight import PageFlight
+from run_stats import RUN_STATS, reset_run_stats
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_run_stats()
+    yield
+    reset_run_stats()
+
+
+def test_concurrent_and_later_requests_share_one_load():
+    flight = PageFlight()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "pagina"
+
+    async def main():
+        together = await asyncio.gather(*(flight.run_async('async', "https://kdv.nl/contact", loader) for _ in range(3)))
+        later = await flight.run_async('async', "https://KDV.nl/contact/?utm_source=x", loader)
+        return together, later
+
+    together, later = asyncio.run(main())
+    assert together == ["pagina"] * 3 and later == "pagina" and len(calls) == 1
+    assert RUN_STATS["singleflight_coalesced"] == 2 and RUN_STATS["singleflight_reused"] == 1
+
+
+def test_sync_waiters_share_the_owner_result():
+    flight = PageFlight()
+    calls = []
+    results = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "pagina"
+
+    threads = [threading.Thread(target=lambda: results.append(flight.run_sync('requests', "https://kdv.nl/", loader)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["pagina"] * 4 and len(calls) == 1
+
+
+def test_failed_result_is_not_shared():
+    flight = PageFlight()
+    results = iter(["FETCH_ERROR: timeout", "pagina"])
+
+    def failed(value):
+        return value.startswith("FETCH_ERROR")
+
+    first = flight.run_sync('requests', "https://kdv.nl/", lambda: next(results), failed=failed)
+    second = flight.run_sync('requests', "https://kdv.nl/", lambda: next(results), failed=failed)
+    assert (first, second) == ("FETCH_ERROR: timeout", "pagina")
+    assert RUN_STATS["singleflight_failures_not_shared"] == 1
+
+
+def test_exception_in_owner_lets_the_waiter_retry():
+    flight = PageFlight()
+    attempts = []
+
+    async def loader():
+        attempts.append(1)
+        await asyncio.sleep(0.02)
+        if len(attempts) == 1:
+            raise RuntimeError("verbinding verbroken")
+        return "pagina"
+
+    async def main():
+        return await asyncio.gather(flight.run_async('async', "https://kdv.nl/", loader),
+                                    flight.run_async('async', "https://kdv.nl/", loader), return_exceptions=True)
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, RuntimeError) and second == "pagina" and len(attempts) == 2
+
+
+def test_want_links_and_kind_are_part_of_the_key():
+    flight = PageFlight()
+    calls = []
+
+    def loader(value):
+        calls.append(value)
+        return value
+
+    assert flight.run_sync('requests', "https://kdv.nl/", lambda: loader("zonder links"), want_links=False) == "zonder links"
+    assert flight.run_sync('requests', "https://kdv.nl/", lambda: loader("met links"), want_links=True) == "met links"
+    assert flight.run_sync('async', "https://kdv.nl/", lambda: loader("async"), want_links=True) == "async"
+    assert flight.run_sync('requests', "https://kdv.nl/", lambda: loader("opnieuw"), want_links=False) == "zonder links"
+    flight.reset()
+    assert flight.run_sync('requests', "https://kdv.nl/", lambda: loader("na reset"), want_links=False) == "na reset"
+    assert calls == ["zonder links", "met links", "async", "na reset"]
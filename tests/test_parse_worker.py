@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import types
+
+import pytest
+
+import parse_worker
+from parse_worker import ParseWorkerCrashed, ParseWorkerPool, ParseWorkerTimeout
+
+PAGE = "<html><body><p>Mail info@kdv.nl of bel 020-1234567</p><a href='/contact'>Contact</a></body></html>"
+
+
+@pytest.fixture
+def pool():
+    pool = ParseWorkerPool(2)
+    yield pool
+    pool.shutdown()
+
+
+def test_parses_in_worker_processes(pool):
+    results = [future.result(timeout=30) for future in [pool.submit(PAGE) for _ in range(4)]]
+    assert all(result["contact_data"]["emails"] == ["info@kdv.nl"] for result in results)
+    assert results[0]["links"] == [("/contact", "Contact")]
+    assert pool.submit(PAGE, want_links=False).result(timeout=30)["links"] == []
+
+
+def test_workers_do_not_rerun_the_main_script(tmp_path, monkeypatch):
+    # Zoals onder `streamlit run`: __main__ is een module met __file__ = het app script
+    marker = tmp_path / "executed"
+    script = tmp_path / "fake_app.py"
+    script.write_text(f"open({str(marker)!r}, 'w').write('x')\n")
+    main = types.ModuleType("__main__")
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", main)
+
+    pool = ParseWorkerPool(1)
+    try:
+        pool.submit(PAGE).result(timeout=30)
+    finally:
+        pool.shutdown()
+    assert not marker.exists()
+
+
+def test_crashed_worker_is_restarted(pool):
+    pool.submit(PAGE).result(timeout=30)
+    for process in list(pool._processes):
+        process.kill()
+        process.wait()
+    try:
+        pool.submit(PAGE).result(timeout=30)
+    except ParseWorkerCrashed:
+        pass  # opdracht liep op de gestopte worker; de volgende krijgt een nieuwe
+    assert pool.submit(PAGE).result(timeout=30)["contact_data"]["emails"] == ["info@kdv.nl"]
+
+
+def test_shutdown_stops_workers():
+    pool = ParseWorkerPool(2)
+    pool.submit(PAGE).result(timeout=30)
+    processes = list(pool._processes)
+    pool.shutdown()
+    assert processes and all(process.poll() is not None for process in processes)
+    with pytest.raises(RuntimeError):
+        pool.submit(PAGE)
+
+
+def test_hanging_worker_is_stopped_and_replaced(tmp_path):
+    # De eerste worker blijft hangen; daarna gedraagt elke nieuwe worker zich normaal
+    marker = tmp_path / "hung"
+    script = tmp_path / "sleepy_worker.py"
+    script.write_text(
+        "import os, sys, time\n"
+        f"if not os.path.exists({str(marker)!r}):\n"
+        f"    open({str(marker)!r}, 'w').close()\n"
+        "    time.sleep(60)\n"
+        f"sys.path.insert(0, {os.path.dirname(parse_worker.__file__)!r})\n"
+        "import parse_worker\n"
+        "parse_worker.main()\n")
+    pool = ParseWorkerPool(1, timeout=1, command=[sys.executable, str(script)])
+    try:
+        started = time.monotonic()
+        with pytest.raises(ParseWorkerTimeout):
+            pool.submit(PAGE).result(timeout=30)
+        assert time.monotonic() - started < 10
+        assert not pool._processes  # de hangende worker is gestopt
+        assert pool.submit(PAGE).result(timeout=30)["contact_data"]["emails"] == ["info@kdv.nl"]
+    finally:
+        pool.shutdown()
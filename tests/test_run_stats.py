@@ -0,0 +1,39 @@
+import run_stats
+
+
+def rerun_namespace():
+    """Wat een Streamlit rerun van app.py doet: de imports opnieuw uitvoeren in een verse namespace"""
+    namespace = {}
+    exec("from run_stats import RUN_STATS, bump_run_stat, reset_run_stats", namespace)
+    return namespace
+
+
+class CachedPool:
+    """Stand-in voor een pool uit st.cache_resource die tellers bijhoudt (zoals SeleniumDriverPool)"""
+
+    def __init__(self, bump):
+        self.bump = bump
+
+    def driver(self):
+        self.bump('selenium_driver_reuses')
+
+
+def test_cached_pool_counts_in_later_reruns():
+    first_run = rerun_namespace()
+    pool = CachedPool(first_run['bump_run_stat'])
+
+    later_run = rerun_namespace()
+    later_run['reset_run_stats']()
+    pool.driver()
+    pool.driver()
+    assert later_run['RUN_STATS'] == {'selenium_driver_reuses': 2}
+    run_stats.reset_run_stats()
+
+
+def test_bump_accumulates_amounts():
+    run_stats.reset_run_stats()
+    run_stats.bump_run_stat('fetch_bytes_read', 100)
+    run_stats.bump_run_stat('fetch_bytes_read', 50)
+    assert run_stats.RUN_STATS == {'fetch_bytes_read': 150}
+    run_stats.reset_run_stats()
+    assert run_stats.RUN_STATS == {}
@@ -0,0 +1,54 @@
+import json
+
+from contact_extraction import extract_structured_contacts, structured_data_complete
+from page_parsing import parse_page
+
+CHILDCARE = {
+    "@context": "https://schema.org",
+    "@type": "ChildCare",
+    "name": "KDV De Zon",
+    "email": "dezon@keten.nl",
+    "telephone": "020-1234567",
+    "address": {"@type": "PostalAddress", "streetAddress": "Zonstraat 1", "postalCode": "1011 AB",
+                "addressLocality": "Amsterdam"},
+}
+FOOTER_LINKS = [("mailto:info@keten.nl", "Mail ons"), ("tel:0301234567", "Bel ons")]
+
+
+def test_footer_links_are_not_location_evidence():
+    structured = extract_structured_contacts(links=FOOTER_LINKS)
+    assert structured["links"] == {"emails": ["info@keten.nl"], "telefoons": ["+31 30 123 4567"]}
+    assert structured["emails"] == [] and structured["locations"] == []
+    assert not structured_data_complete(structured["locations"], "Amsterdam")
+    assert not structured_data_complete(structured["locations"])
+
+
+def test_childcare_jsonld_matching_the_row_is_complete():
+    structured = extract_structured_contacts([json.dumps(CHILDCARE)], links=FOOTER_LINKS)
+    [location] = structured["locations"]
+    assert location["emails"] == ["dezon@keten.nl"] and location["plaatsen"] == ["amsterdam"]
+    assert structured_data_complete(structured["locations"], "amsterdam ")
+    assert structured_data_complete(structured["locations"])
+    assert not structured_data_complete(structured["locations"], "Utrecht")
+
+
+def test_organization_without_address_is_not_a_location():
+    organization = {"@type": "Organization", "email": "info@keten.nl", "telephone": "0301234567"}
+    structured = extract_structured_contacts([json.dumps(organization)])
+    assert structured["emails"] == ["info@keten.nl"]
+    assert not structured_data_complete(structured["locations"])
+
+
+def test_microdata_location_with_nested_address():
+    html = """<html><body><div itemscope itemtype="https://schema.org/ChildCare">
+        <span itemprop="name">BSO De Maan</span>
+        <a itemprop="email" href="mailto:maan@keten.nl">maan@keten.nl</a>
+        <span itemprop="telephone">010-7654321</span>
+        <div itemprop="address" itemscope itemtype="https://schema.org/PostalAddress">
+            <span itemprop="streetAddress">Maanweg 2</span>
+            <span itemprop="postalCode">3011 CD</span> <span itemprop="addressLocality">Rotterdam</span>
+        </div></div></body></html>"""
+    structured = parse_page(html)["structured_data"]
+    assert "Maanweg 2" in structured["adressen"]
+    assert structured_data_complete(structured["locations"], "Rotterdam")
+    assert not structured_data_complete(structured["locations"], "Amsterdam")
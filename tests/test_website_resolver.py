@@ -0,0 +1,145 @@
+import asyncio
+import json
+import sqlite3
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from run_stats import RUN_STATS, reset_run_stats
+from website_resolver import WebsiteResolver, normalize_location_key
+
+
+class FakeSerpApi:
+    """SerpAPI stand-in: per zoekvraag een lijst organische resultaten, en een teller per zoekvraag"""
+
+    def __init__(self, results, status=200):
+        self.results = results  # q -> [link, ...]
+        self.status = status
+        self.calls = {}
+
+    async def handle(self, request):
+        query = request.query["q"]
+        self.calls[query] = self.calls.get(query, 0) + 1
+        if self.status != 200:
+            return web.Response(status=self.status)
+        await asyncio.sleep(0.02)
+        return web.json_response({"organic_results": [{"link": link} for link in self.results.get(query, [])]})
+
+
+def run(api, fn):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/search", api.handle)
+        async with TestServer(app) as server, aiohttp.ClientSession() as session:
+            return await fn(str(server.make_url("/search")), session)
+    return asyncio.run(main())
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_run_stats()
+    yield
+    reset_run_stats()
+
+
+QUERY = "De Zon Utrecht kinderopvang"
+
+
+def test_normalize_location_key():
+    assert normalize_location_key("  KDV  Één-Twee ", "Den Haag") == "kdv een twee|den haag"
+
+
+def test_hit_is_cached_and_concurrent_lookups_share_one_call(tmp_path):
+    api = FakeSerpApi({QUERY: ["https://dezon.nl/"]})
+
+    async def fn(url, session):
+        resolver = WebsiteResolver(str(tmp_path / "resolver.sqlite"), "key", url)
+        first = await asyncio.gather(*(resolver.resolve("De Zon", "Utrecht", session) for _ in range(3)))
+        return first, await resolver.resolve("de zon", "UTRECHT", session)
+
+    first, cached = run(api, fn)
+    assert first == ["https://dezon.nl/"] * 3 and cached == "https://dezon.nl/"
+    assert api.calls == {QUERY: 1}
+    assert RUN_STATS["resolver_coalesced"] == 2 and RUN_STATS["resolver_cache_hits"] == 1
+
+
+def test_miss_is_cached_until_its_ttl(tmp_path):
+    api = FakeSerpApi({})
+
+    async def fn(url, session):
+        resolver = WebsiteResolver(str(tmp_path / "resolver.sqlite"), "key", url, miss_ttl=3600)
+        results = [await resolver.resolve("De Zon", "Utrecht", session), await resolver.resolve("De Zon", "Utrecht", session)]
+        resolver.miss_ttl = 0
+        results.append(await resolver.resolve("De Zon", "Utrecht", session))
+        return results
+
+    assert run(api, fn) == [None, None, None]
+    assert api.calls == {QUERY: 2}
+    assert RUN_STATS["resolver_cached_misses"] == 1
+
+
+def test_api_errors_are_not_cached(tmp_path):
+    api = FakeSerpApi({QUERY: ["https://dezon.nl/"]}, status=500)
+
+    async def fn(url, session):
+        resolver = WebsiteResolver(str(tmp_path / "resolver.sqlite"), "key", url)
+        first = await resolver.resolve("De Zon", "Utrecht", session)
+        api.status = 200
+        return first, await resolver.resolve("De Zon", "Utrecht", session)
+
+    assert run(api, fn) == (None, "https://dezon.nl/")
+    assert api.calls == {QUERY: 2}
+
+
+def test_transient_failure_does_not_blacklist_until_repeated_across_runs(tmp_path):
+    api = FakeSerpApi({QUERY: ["https://dezon.nl/", "https://andere.nl/"]})
+
+    async def fn(url, session):
+        resolver = WebsiteResolver(str(tmp_path / "resolver.sqlite"), "key", url, bad_after=2)
+        site = await resolver.resolve("De Zon", "Utrecht", session)
+        # Eerste run: een timeout of DNS hapering, twee keer in dezelfde run telt één keer
+        assert not resolver.mark_unreachable("De Zon", "Utrecht", site)
+        assert not resolver.mark_unreachable("De Zon", "Utrecht", site)
+        assert await resolver.resolve("De Zon", "Utrecht", session) == "https://dezon.nl/"
+        # Volgende run weer onbereikbaar: nu pas 'bad', en de resolver zoekt een ander resultaat
+        resolver.reset()
+        assert resolver.mark_unreachable("De Zon", "Utrecht", site)
+        return await resolver.resolve("De Zon", "Utrecht", session)
+
+    assert run(api, fn) == "https://andere.nl/"
+    assert api.calls == {QUERY: 2}
+
+
+def test_reachable_run_resets_the_failure_count(tmp_path):
+    resolver = WebsiteResolver(str(tmp_path / "resolver.sqlite"), bad_after=2)
+    assert not resolver.mark_unreachable("De Zon", "Utrecht", "https://dezon.nl/")
+    resolver.reset()
+    resolver.mark_reachable("De Zon", "Utrecht", "https://dezon.nl/")
+    resolver.reset()
+    assert not resolver.mark_unreachable("De Zon", "Utrecht", "https://dezon.nl/")
+
+
+def test_definitive_failure_marks_bad_at_once_and_bad_mark_expires(tmp_path):
+    api = FakeSerpApi({QUERY: ["https://dezon.nl/", "https://andere.nl/"]})
+    path = str(tmp_path / "resolver.sqlite")
+
+    async def fn(url, session):
+        resolver = WebsiteResolver(path, "key", url, bad_ttl=3600)
+        site = await resolver.resolve("De Zon", "Utrecht", session)
+        assert resolver.mark_unreachable("De Zon", "Utrecht", site, definitive=True)
+        replacement = await resolver.resolve("De Zon", "Utrecht", session)
+        # Markering ouder dan bad_ttl: de oorspronkelijke site mag weer
+        resolver.mark_unreachable("De Zon", "Utrecht", replacement, definitive=True)
+        conn = sqlite3.connect(path)
+        key = normalize_location_key("De Zon", "Utrecht")
+        conn.execute("UPDATE resolved_sites SET bad_urls = ? WHERE location_key = ?",
+                     (json.dumps({"https://dezon.nl/": time.time() - 7200, "https://andere.nl/": time.time()}), key))
+        conn.commit()
+        conn.close()
+        return replacement, await resolver.resolve("De Zon", "Utrecht", session)
+
+    assert run(api, fn) == ("https://andere.nl/", "https://dezon.nl/")
+    assert RUN_STATS["resolver_marked_bad"] == 2
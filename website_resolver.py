@@ -0,0 +1,210 @@
+"""Website van een locatie zoeken via SerpAPI, async en met een persistente store.
+
+Zonder Streamlit afhankelijkheden, zodat de resolver tegen een lokale SerpAPI stand-in te testen
+is; app.py maakt WEBSITE_RESOLVER aan met de waarden uit st.secrets.
+"""
+import asyncio
+import json
+import re
+import socket
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import nullcontext
+from urllib.parse import urlparse
+
+import aiohttp
+
+from cache_db import connect_cache_db
+from link_scoring import normalize_url
+from run_stats import bump_run_stat
+
+SERPAPI_URL = "https://serpapi.com/search"
+
+
+def normalize_location_key(locatienaam, plaats):
+    """Sleutel voor de resolver cache: kleine letters, zonder accenten, leestekens en dubbele spaties"""
+    def clean(value):
+        value = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode('ascii')
+        return ' '.join(re.sub(r'[^a-z0-9]+', ' ', value.lower()).split())
+    return f"{clean(locatienaam)}|{clean(plaats)}"
+
+
+async def host_does_not_exist(url):
+    """Definitief onbereikbaar: de DNS server zegt dat de naam niet bestaat (NXDOMAIN).
+    Een timeout of tijdelijke DNS fout (EAI_AGAIN) telt niet."""
+    host = urlparse(url).hostname
+    if not host:
+        return True
+    try:
+        await asyncio.get_running_loop().getaddrinfo(host, None)
+    except socket.gaierror as e:
+        return e.errno in (socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', socket.EAI_NONAME))
+    except OSError:
+        return False
+    return False
+
+
+class WebsiteResolver:
+    """Zoekt de website van een locatie via SerpAPI, async en met een persistente store.
+
+    De store kent drie soorten entries: 'hit' (gevonden URL), 'miss' (geen resultaat, korter
+    gecached) en 'bad' (gevonden URL bleek onbruikbaar; bij een nieuwe zoekactie wordt die
+    URL overgeslagen, tot bad_ttl verstreken is). Een URL is pas onbruikbaar na een definitieve
+    fout (NXDOMAIN) of na bad_after runs waarin hij niet bereikbaar was; één DNS hapering of
+    timeout gooit een goede website niet weg. Gelijktijdige lookups van dezelfde locatie delen
+    één SerpAPI call.
+    """
+
+    def __init__(self, path, api_key=None, api_url=SERPAPI_URL, concurrency=5, quota=1000, hit_ttl=90 * 24 * 3600,
+                 miss_ttl=7 * 24 * 3600, bad_ttl=90 * 24 * 3600, bad_after=2, session_factory=aiohttp.ClientSession):
+        self.path = path
+        self.api_key = api_key
+        self.api_url = api_url
+        self.concurrency = max(1, concurrency)
+        self.initial_quota = quota
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.bad_ttl = bad_ttl
+        self.bad_after = max(1, bad_after)
+        self.session_factory = session_factory
+        self._conn = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Begin van een nieuwe run: quota vol, en elke URL mag weer één keer als onbereikbaar tellen"""
+        self.quota = self.initial_quota
+        self._semaphore = None
+        self._in_flight = {}
+        self._failed_this_run = set()
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect_cache_db(self.path, """
+                CREATE TABLE IF NOT EXISTS resolved_sites (
+                    location_key TEXT PRIMARY KEY, url TEXT, status TEXT, bad_urls TEXT, resolved_at REAL);
+                CREATE TABLE IF NOT EXISTS failed_sites (
+                    location_key TEXT, url TEXT, failures INTEGER, failed_at REAL, PRIMARY KEY (location_key, url));""")
+        return self._conn
+
+    def lookup(self, locatienaam, plaats):
+        """Geef de store entry voor een locatie, of None; bad_urls is {url: gemarkeerd op} zonder verlopen markeringen"""
+        try:
+            with self._lock:
+                row = self._db().execute(
+                    "SELECT url, status, bad_urls, resolved_at FROM resolved_sites WHERE location_key = ?",
+                    (normalize_location_key(locatienaam, plaats),)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row:
+            return None
+        bad_urls = json.loads(row[2] or "{}")
+        if isinstance(bad_urls, list):  # store van vóór de TTL: markering telt vanaf resolved_at
+            bad_urls = {url: row[3] for url in bad_urls}
+        now = time.time()
+        bad_urls = {url: marked_at for url, marked_at in bad_urls.items() if now - marked_at < self.bad_ttl}
+        return {"url": row[0], "status": row[1], "bad_urls": bad_urls, "resolved_at": row[3]}
+
+    def _save(self, locatienaam, plaats, url, status, bad_urls):
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO resolved_sites VALUES (?, ?, ?, ?, ?)",
+                           (normalize_location_key(locatienaam, plaats), url, status, json.dumps(bad_urls), time.time()))
+                db.commit()
+        except sqlite3.Error:
+            pass
+
+    def mark_unreachable(self, locatienaam, plaats, url, definitive=False):
+        """De gevonden URL was niet bereikbaar. Telt één keer per run; pas na bad_after runs op rij (of direct
+        bij een definitieve fout) wordt de URL 'bad' en zoekt de volgende resolutie zonder deze URL."""
+        key = normalize_location_key(locatienaam, plaats)
+        normalized = normalize_url(url)
+        if not definitive:
+            if (key, normalized) in self._failed_this_run:
+                return False
+            self._failed_this_run.add((key, normalized))
+            try:
+                with self._lock:
+                    db = self._db()
+                    row = db.execute("SELECT failures, failed_at FROM failed_sites WHERE location_key = ? AND url = ?",
+                                     (key, normalized)).fetchone()
+                    failures = row[0] + 1 if row and time.time() - row[1] < self.bad_ttl else 1
+                    db.execute("INSERT OR REPLACE INTO failed_sites VALUES (?, ?, ?, ?)", (key, normalized, failures, time.time()))
+                    db.commit()
+            except sqlite3.Error:
+                return False
+            if failures < self.bad_after:
+                bump_run_stat('resolver_transient_failures')
+                return False
+        self.mark_reachable(locatienaam, plaats, url)
+        entry = self.lookup(locatienaam, plaats) or {"bad_urls": {}}
+        bad_urls = dict(entry["bad_urls"], **{normalized: time.time()})
+        self._save(locatienaam, plaats, url, 'bad', bad_urls)
+        bump_run_stat('resolver_marked_bad')
+        return True
+
+    def mark_reachable(self, locatienaam, plaats, url):
+        """De URL werkte (weer): eerdere onbereikbare runs tellen niet meer mee"""
+        try:
+            with self._lock:
+                db = self._db()
+                deleted = db.execute("DELETE FROM failed_sites WHERE location_key = ? AND url = ?",
+                                     (normalize_location_key(locatienaam, plaats), normalize_url(url))).rowcount
+                if deleted:
+                    db.commit()
+        except sqlite3.Error:
+            pass
+
+    async def resolve(self, locatienaam, plaats, session=None):
+        entry = self.lookup(locatienaam, plaats)
+        if entry:
+            age = time.time() - entry["resolved_at"]
+            if entry["status"] == 'hit' and age < self.hit_ttl:
+                bump_run_stat('resolver_cache_hits')
+                return entry["url"]
+            if entry["status"] == 'miss' and age < self.miss_ttl:
+                bump_run_stat('resolver_cached_misses')
+                return None
+        bad_urls = entry["bad_urls"] if entry else {}
+
+        # Dezelfde locatie meerdere keren in de upload: deel de lopende zoekactie
+        key = normalize_location_key(locatienaam, plaats)
+        if key in self._in_flight:
+            bump_run_stat('resolver_coalesced')
+            return await asyncio.shield(self._in_flight[key])
+        task = asyncio.ensure_future(self._search(locatienaam, plaats, bad_urls, session))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _search(self, locatienaam, plaats, bad_urls, session):
+        if self.quota <= 0:
+            bump_run_stat('serpapi_quota_exhausted')
+            return None
+        self.quota -= 1
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        query = f"{locatienaam} {plaats} kinderopvang"
+        params = {"q": query, "api_key": self.api_key or "", "engine": "google"}
+        try:
+            async with self._semaphore:
+                async with nullcontext(session) if session is not None else self.session_factory() as session:
+                    bump_run_stat('serpapi_calls')
+                    async with session.get(self.api_url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                        if resp.status != 200:
+                            return None  # API fout: niet cachen, volgende run opnieuw proberen
+                        data = await resp.json(content_type=None)
+        except Exception:
+            return None
+
+        for item in data.get("organic_results", []):
+            link = item.get("link")
+            if link and normalize_url(link) not in bad_urls:
+                self._save(locatienaam, plaats, link, 'hit', bad_urls)
+                return link
+        self._save(locatienaam, plaats, None, 'miss', bad_urls)
+        return None